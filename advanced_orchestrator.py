@@ -2,12 +2,15 @@ from typing import Dict, Any, List, Optional, Annotated
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
+from datetime import datetime
+from pathlib import Path
 import logging
 
 from agents import DebateAgent, MetaAgent, DebateMessage, MultiAgentDebateSystem
 from config import SystemConfig, ModelConfig
 from intelligent_data_loader import IntelligentFinancialDataLoader
+from streaming import MarkdownStreamWriter, StreamListener
+from checkpointing import create_checkpointer, open_async_checkpointer, new_thread_id
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +28,14 @@ class AdvancedDebateState(TypedDict):
 class AdvancedDebateOrchestrator:
     """Advanced orchestrator for multi-agent debates with reasoning models"""
 
-    def __init__(self, config: SystemConfig):
+    def __init__(self, config: SystemConfig, stream_listeners: Optional[List[StreamListener]] = None, data_loader: Optional[IntelligentFinancialDataLoader] = None):
         self.config = config
-        self.data_loader = IntelligentFinancialDataLoader()
+        # Receive (stream_name, section, chunk) for every streamed chunk of the transcript and report
+        self.stream_listeners = list(stream_listeners or [])
+        self.transcript_stream: Optional[MarkdownStreamWriter] = None
+        self.report_stream: Optional[MarkdownStreamWriter] = None
+        # A shared loader lets concurrent debates reuse connectors, the Chroma client and caches
+        self.data_loader = data_loader or IntelligentFinancialDataLoader()
 
         # Create agent-specific model config (Grok with very high reasoning)
         agent_model_config = ModelConfig(
@@ -42,25 +50,27 @@ class AdvancedDebateOrchestrator:
         # Initialize advanced multi-agent system with agent-specific config
         self.debate_system = MultiAgentDebateSystem(
             self.data_loader,
-            agent_model_config
+            agent_model_config,
+            pipelined=config.debate.pipeline_queries
         )
 
         self.meta_agent = MetaAgent(config.synthesis_agent, self.data_loader)
 
-        # Create the advanced debate graph
-        self.checkpointer = MemorySaver()
+        # Create the advanced debate graph; every completed node is checkpointed so a
+        # crashed run can be resumed by thread_id
+        self.checkpointer = create_checkpointer(config.debate.checkpoint_path)
         self.graph = self._build_advanced_graph()
 
         logger.info("Dialectical Agent System initialized with 2 ethos personas")
 
-    def _build_advanced_graph(self) -> StateGraph:
+    def _build_advanced_graph(self, use_async: bool = False, checkpointer=None) -> StateGraph:
         graph = StateGraph(AdvancedDebateState)
 
         # Add nodes for advanced multi-agent flow
         graph.add_node("initialize_debate", self._initialize_debate_node)
-        graph.add_node("conduct_round", self._conduct_round_node)
+        graph.add_node("conduct_round", self._aconduct_round_node if use_async else self._conduct_round_node)
         graph.add_node("evaluate_progress", self._evaluate_progress_node)
-        graph.add_node("meta_analyze", self._meta_analyze_node)
+        graph.add_node("meta_analyze", self._ameta_analyze_node if use_async else self._meta_analyze_node)
 
         # Add edges
         graph.add_edge(START, "initialize_debate")
@@ -79,7 +89,7 @@ class AdvancedDebateOrchestrator:
         graph.add_edge("evaluate_progress", "conduct_round")
         graph.add_edge("meta_analyze", END)
 
-        return graph.compile(checkpointer=self.checkpointer)
+        return graph.compile(checkpointer=checkpointer or self.checkpointer)
 
     def _initialize_debate_node(self, state: AdvancedDebateState) -> AdvancedDebateState:
         logger.info("Initializing advanced multi-agent debate")
@@ -100,6 +110,25 @@ class AdvancedDebateOrchestrator:
     def _conduct_round_node(self, state: AdvancedDebateState) -> AdvancedDebateState:
         logger.info(f"Conducting debate round {state['current_round']}")
 
+        # Run a complete round with all agents
+        round_messages = self.debate_system.run_debate_round(
+            topic=self._round_topic(state),
+            max_rounds=1,  # One round at a time
+            stream=self.transcript_stream
+        )
+        return self._after_round(state, round_messages)
+
+    async def _aconduct_round_node(self, state: AdvancedDebateState) -> AdvancedDebateState:
+        logger.info(f"Conducting debate round {state['current_round']}")
+
+        round_messages = await self.debate_system.arun_debate_round(
+            topic=self._round_topic(state),
+            max_rounds=1,
+            stream=self.transcript_stream
+        )
+        return self._after_round(state, round_messages)
+
+    def _round_topic(self, state: AdvancedDebateState) -> str:
         # Advanced topic with explicit IT/Tech sector guidance and recency emphasis
         advanced_topic = f"""{state['topic']} - Focus strictly on Indian IT/Technology sector companies, market dynamics, and financial performance.
 
@@ -111,13 +140,9 @@ class AdvancedDebateOrchestrator:
         - CURRENT CONTEXT: Frame analysis within the current market environment and recent industry shifts
 
         Discuss themes like: digital transformation, AI/ML adoption, cloud migration, talent acquisition costs, client spending patterns, regulatory impacts on tech companies, and competitive positioning - but always with emphasis on RECENT developments and LATEST available data."""
+        return advanced_topic
 
-        # Run a complete round with all agents
-        round_messages = self.debate_system.run_debate_round(
-            topic=advanced_topic,
-            max_rounds=1  # One round at a time
-        )
-
+    def _after_round(self, state: AdvancedDebateState, round_messages: List[DebateMessage]) -> AdvancedDebateState:
         # Update state with new messages
         updated_messages = state["debate_messages"] + round_messages
         updated_stats = self.debate_system.get_agent_stats()
@@ -164,7 +189,10 @@ class AdvancedDebateOrchestrator:
     def _meta_analyze_node(self, state: AdvancedDebateState) -> AdvancedDebateState:
         logger.info("Generating advanced meta-analysis")
 
-        meta_analysis = self.meta_agent.synthesize(state["debate_messages"])
+        meta_analysis = self.meta_agent.synthesize(
+            state["debate_messages"],
+            on_chunk=self.report_stream.write if self.report_stream else None
+        )
 
         return {
             **state,
@@ -172,48 +200,188 @@ class AdvancedDebateOrchestrator:
             "is_complete": True
         }
 
-    def run_advanced_debate(self, thread_id: str = "advanced_debate_thread") -> Dict[str, Any]:
-        try:
-            # Initial state
-            initial_state: AdvancedDebateState = {
-                "debate_messages": [],
-                "current_round": 0,
-                "max_rounds": 2,
-                "topic": self.config.debate.topic,
-                "is_complete": False,
-                "meta_analysis": None,
-                "active_agents": [],
-                "agent_stats": {},
-                "reasoning_depth": 3
-            }
+    async def _ameta_analyze_node(self, state: AdvancedDebateState) -> AdvancedDebateState:
+        logger.info("Generating advanced meta-analysis")
 
+        meta_analysis = await self.meta_agent.asynthesize(
+            state["debate_messages"],
+            on_chunk=self.report_stream.write if self.report_stream else None
+        )
+
+        return {
+            **state,
+            "meta_analysis": meta_analysis,
+            "is_complete": True
+        }
+
+    def _open_streams(self):
+        """Create live transcript/report files that fill in while agents are still generating"""
+        if not self.config.debate.stream_output:
+            return
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = Path(self.config.debate.output_directory)
+
+        self.transcript_stream = MarkdownStreamWriter(
+            output_dir / f"live_debate_transcript_{timestamp}.md",
+            name="transcript",
+            header_lines=[
+                "# Dialectical Debate Transcript (live)",
+                "",
+                f"**Topic:** {self.config.debate.topic}",
+                f"**Started:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                "",
+                "---",
+                ""
+            ],
+            listeners=self.stream_listeners
+        )
+        self.report_stream = MarkdownStreamWriter(
+            output_dir / f"live_synthesis_report_{timestamp}.md",
+            name="report",
+            listeners=self.stream_listeners
+        )
+        logger.info(f"Streaming transcript to {self.transcript_stream.path} and report to {self.report_stream.path}")
+
+    def _close_streams(self):
+        for stream in (self.transcript_stream, self.report_stream):
+            if stream is not None:
+                stream.close()
+        self.transcript_stream = None
+        self.report_stream = None
+
+    def _initial_state(self) -> AdvancedDebateState:
+        return {
+            "debate_messages": [],
+            "current_round": 0,
+            "max_rounds": 2,
+            "topic": self.config.debate.topic,
+            "is_complete": False,
+            "meta_analysis": None,
+            "active_agents": [],
+            "agent_stats": {},
+            "reasoning_depth": 3
+        }
+
+    def _completed_result(self, final_state: AdvancedDebateState, thread_id: str) -> Dict[str, Any]:
+        logger.info("Advanced multi-agent debate completed successfully")
+
+        return {
+            "status": "completed",
+            "thread_id": thread_id,
+            "debate_messages": final_state["debate_messages"],
+            "synthesis_report": final_state["meta_analysis"],
+            "total_messages": len(final_state["debate_messages"]),
+            "total_rounds": final_state["current_round"] - 1,
+            "agent_stats": final_state["agent_stats"],
+            "topic": final_state["topic"]
+        }
+
+    def _error_result(self, error: Exception, thread_id: str) -> Dict[str, Any]:
+        logger.error(f"Error running advanced debate: {error}")
+        if self.config.debate.checkpoint_path:
+            logger.error(f"Resume from the last completed step with thread_id '{thread_id}'")
+        return {
+            "status": "error",
+            "thread_id": thread_id,
+            "error": str(error),
+            "debate_messages": [],
+            "synthesis_report": None
+        }
+
+    def run_advanced_debate(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        thread_id = thread_id or new_thread_id()
+        self._open_streams()
+        try:
             # Run the advanced debate
             config = {"configurable": {"thread_id": thread_id}}
-            final_state = self.graph.invoke(initial_state, config)
-
-            logger.info("Advanced multi-agent debate completed successfully")
-
-            return {
-                "status": "completed",
-                "debate_messages": final_state["debate_messages"],
-                "synthesis_report": final_state["meta_analysis"],
-                "total_messages": len(final_state["debate_messages"]),
-                "total_rounds": final_state["current_round"] - 1,
-                "agent_stats": final_state["agent_stats"],
-                "topic": final_state["topic"]
-            }
+            final_state = self.graph.invoke(self._initial_state(), config)
+            return self._completed_result(final_state, thread_id)
 
         except Exception as e:
-            logger.error(f"Error running advanced debate: {e}")
-            return {
-                "status": "error",
-                "error": str(e),
-                "debate_messages": [],
-                "synthesis_report": None
-            }
+            return self._error_result(e, thread_id)
+        finally:
+            self._close_streams()
+            self.debate_system.close()
+
+    def resume_advanced_debate(self, thread_id: str) -> Dict[str, Any]:
+        """
+        Continue a checkpointed debate from its last completed node. Agent turns and
+        data queries that already finished are not re-run.
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        try:
+            snapshot = self._load_checkpoint(self.graph.get_state(config), thread_id)
+            if not snapshot.next:
+                return self._completed_result(snapshot.values, thread_id)
+        except Exception as e:
+            return self._error_result(e, thread_id)
+
+        self._open_streams()
+        try:
+            # None input continues the thread from its saved checkpoint
+            final_state = self.graph.invoke(None, config)
+            return self._completed_result(final_state, thread_id)
+
+        except Exception as e:
+            return self._error_result(e, thread_id)
+        finally:
+            self._close_streams()
+            self.debate_system.close()
+
+    def _load_checkpoint(self, snapshot, thread_id: str):
+        """Validate a saved state snapshot and put the agents back where it left them"""
+        if not snapshot.values:
+            raise ValueError(f"No checkpoint found for thread '{thread_id}'")
+
+        self.debate_system.restore_history(snapshot.values.get("debate_messages", []))
+        if snapshot.next:
+            logger.info(f"Resuming thread '{thread_id}' at {list(snapshot.next)}")
+        else:
+            logger.info(f"Thread '{thread_id}' already completed; returning saved result")
+        return snapshot
+
+    async def arun_advanced_debate(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async run_advanced_debate() on graph.ainvoke. Agents, data queries and connectors
+        run as coroutines, so one event loop can drive many debates concurrently (one
+        orchestrator per debate, each with its own thread_id).
+        """
+        thread_id = thread_id or new_thread_id()
+        self._open_streams()
+        try:
+            config = {"configurable": {"thread_id": thread_id}}
+            async with open_async_checkpointer(self.config.debate.checkpoint_path, self.checkpointer) as checkpointer:
+                graph = self._build_advanced_graph(use_async=True, checkpointer=checkpointer)
+                final_state = await graph.ainvoke(self._initial_state(), config)
+            return self._completed_result(final_state, thread_id)
+
+        except Exception as e:
+            return self._error_result(e, thread_id)
+        finally:
+            self._close_streams()
+
+    async def aresume_advanced_debate(self, thread_id: str) -> Dict[str, Any]:
+        """Async resume_advanced_debate()"""
+        config = {"configurable": {"thread_id": thread_id}}
+        try:
+            async with open_async_checkpointer(self.config.debate.checkpoint_path, self.checkpointer) as checkpointer:
+                graph = self._build_advanced_graph(use_async=True, checkpointer=checkpointer)
+                snapshot = self._load_checkpoint(await graph.aget_state(config), thread_id)
+                if not snapshot.next:
+                    return self._completed_result(snapshot.values, thread_id)
+
+                self._open_streams()
+                try:
+                    final_state = await graph.ainvoke(None, config)
+                finally:
+                    self._close_streams()
+            return self._completed_result(final_state, thread_id)
+
+        except Exception as e:
+            return self._error_result(e, thread_id)
 
     # Legacy method for backwards compatibility
-    def run_debate(self, thread_id: str = "debate_thread") -> Dict[str, Any]:
+    def run_debate(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
         return self.run_advanced_debate(thread_id)
 
     def get_debate_summary(self, result: Dict[str, Any]) -> str:
@@ -1,18 +1,34 @@
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 from typing_extensions import Literal
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnablePassthrough
 from pydantic import BaseModel, Field
 import logging
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 from config import AgentConfig, get_llm_from_config
 from intelligent_data_loader import IntelligentFinancialDataLoader
 from date_utils import get_current_financial_context, get_previous_quarters
+from rate_limiter import get_rate_limiter
+from streaming import MarkdownStreamWriter, arun_chain, run_chain
 
 logger = logging.getLogger(__name__)
 
+
+class PrefetchFuture(Future):
+    """Future for prefetch_intelligence(); cancel() also stops a prefetch that is already running before its next query"""
+    def __init__(self):
+        super().__init__()
+        self.stop = threading.Event()
+
+    def cancel(self) -> bool:
+        self.stop.set()
+        return super().cancel()
+
 class DebateMessage(BaseModel):
     agent_name: str
     perspective: str
@@ -28,6 +44,14 @@ class DebateAgent:
         self.conversation_history: List[DebateMessage] = []
         self.turn_count = 0
         self.max_turns_per_agent = 2  # New constraint: only 2 turns per agent
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetches: List[PrefetchFuture] = []
+
+        # Shared across agents so concurrent query fan-outs draw from one budget
+        exec_config = config.query_execution
+        self.query_rate_limiter = get_rate_limiter(
+            "data_queries", exec_config.rate_limit_per_second, exec_config.rate_limit_burst
+        )
 
         # Create the prompt template
         self.prompt = ChatPromptTemplate.from_messages([
@@ -39,18 +63,42 @@ class DebateAgent:
         # Create the chain
         self.chain = self.prompt | self.llm
 
-    def _formulate_and_execute_queries(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1) -> str:
+    def _formulate_and_execute_queries(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1, prefetched: Optional[Future] = None) -> str:
         """
         MISSION CRITICAL: Dynamically query data connectors for current market intelligence.
         NO FALLBACKS - Must succeed with all 3 queries or fail clearly.
+        prefetched: Future from prefetch_intelligence(); its opponent-independent query
+        results are merged first and only the remaining queries are generated here.
         """
         # Get dynamic financial context
         fin_context = get_current_financial_context()
 
+        prefetched_queries, prefetched_results = prefetched.result() if prefetched else ([], [])
+
         # Dynamic query formulation - NO FALLBACKS, will raise if fails
-        base_queries = self._generate_dynamic_queries(debate_context, opponent_messages, turn_number)
+        dynamic_queries = self._generate_dynamic_queries(
+            debate_context, opponent_messages, turn_number, num_queries=3 - len(prefetched_queries)
+        )
+
+        # Execute all 3 dynamic queries - Continue on errors but track them
+        query_results = prefetched_results + self._run_queries(dynamic_queries, start_index=len(prefetched_queries) + 1)
+        return self._format_intelligence(fin_context, turn_number, prefetched_queries + dynamic_queries, query_results)
+
+    async def _aformulate_and_execute_queries(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1, prefetched: Optional[Awaitable] = None) -> str:
+        """Async _formulate_and_execute_queries; prefetched is a task from aprefetch_intelligence()"""
+        fin_context = get_current_financial_context()
 
-        # Execute queries and gather fresh intelligence
+        prefetched_queries, prefetched_results = await prefetched if prefetched else ([], [])
+
+        dynamic_queries = await self._agenerate_dynamic_queries(
+            debate_context, opponent_messages, turn_number, num_queries=3 - len(prefetched_queries)
+        )
+
+        query_results = prefetched_results + await self._arun_queries(dynamic_queries, start_index=len(prefetched_queries) + 1)
+        return self._format_intelligence(fin_context, turn_number, prefetched_queries + dynamic_queries, query_results)
+
+    def _format_intelligence(self, fin_context: Dict[str, Any], turn_number: int, base_queries: List[str], query_results: List[Tuple[List[str], bool]]) -> str:
+        """Assemble the fresh market intelligence block from per-query sections"""
         fresh_intelligence_parts = [
             "FRESH MARKET INTELLIGENCE - DYNAMIC DATA GATHERING:",
             "=" * 70,
@@ -65,57 +113,179 @@ class DebateAgent:
         ]
 
         successful_queries = 0
+        for query_parts, succeeded in query_results:
+            fresh_intelligence_parts.extend(query_parts)
+            successful_queries += int(succeeded)
+
+        fresh_intelligence = "\n".join(fresh_intelligence_parts)
 
-        # Execute all 3 dynamic queries with throttling - Continue on errors but track them
-        for i, query in enumerate(base_queries, 1):
-            logger.info(f"{self.config.name} executing dynamic query {i}/3: {query[:50]}...")
+        # Log success rate but continue regardless
+        logger.info(f"{self.config.name} completed {successful_queries}/3 queries successfully")
+        return fresh_intelligence
 
-            # Add throttling delay to prevent API overload
-            import time
-            time.sleep(2)  # 2-second delay to prevent rate limiting
 
-            try:
-                # Get multi-source intelligence
-                query_result = self.data_loader.get_intelligent_context(query)
-
-                if query_result and len(query_result.strip()) >= 50:
-                    fresh_intelligence_parts.extend([
-                        f"\n🔍 DYNAMIC QUERY {i}: {query}",
-                        "-" * 50,
-                        query_result[:1000] + "..." if len(query_result) > 1000 else query_result,
-                        "",
-                        "=" * 70,
-                        ""
-                    ])
-                    successful_queries += 1
-                else:
-                    logger.warning(f"Query {i} returned insufficient data: {len(query_result) if query_result else 0} characters")
-                    fresh_intelligence_parts.extend([
-                        f"\n⚠️ QUERY {i} - INSUFFICIENT DATA: {query}",
-                        "-" * 50,
-                        "Data source returned insufficient information for this query.",
-                        "",
-                        "=" * 70,
-                        ""
-                    ])
+    def _run_queries(self, queries: List[str], start_index: int = 1, stop: Optional[threading.Event] = None) -> List[Tuple[List[str], bool]]:
+        """
+        Execute dynamic queries and return (report_parts, succeeded) per query, in query order.
+        Queries fan out over a thread pool when parallel execution is enabled; a shared
+        token bucket throttles query starts across all agents. Once stop is set, queries
+        that have not started yet are skipped and come back as ([], False).
+        """
+        def run(i: int, query: str) -> Tuple[List[str], bool]:
+            if stop is not None and stop.is_set():
+                return [], False
+            return self._execute_query(i, query)
+
+        exec_config = self.config.query_execution
+        if not exec_config.parallel or len(queries) <= 1:
+            return [run(i, query) for i, query in enumerate(queries, start_index)]
+
+        max_workers = max(1, min(exec_config.max_concurrent_queries, len(queries)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent-query") as executor:
+            futures = [
+                executor.submit(run, i, query)
+                for i, query in enumerate(queries, start_index)
+            ]
+            # Collect in submission order so the intelligence block keeps query ordering
+            return [future.result() for future in futures]
+
+    async def _arun_queries(self, queries: List[str], start_index: int = 1) -> List[Tuple[List[str], bool]]:
+        """Async _run_queries: queries run as tasks, at most max_concurrent_queries at a time"""
+        exec_config = self.config.query_execution
+        if not exec_config.parallel or len(queries) <= 1:
+            return [await self._aexecute_query(i, query) for i, query in enumerate(queries, start_index)]
+
+        semaphore = asyncio.Semaphore(max(1, exec_config.max_concurrent_queries))
+
+        async def bounded(i: int, query: str) -> Tuple[List[str], bool]:
+            async with semaphore:
+                return await self._aexecute_query(i, query)
+
+        return list(await asyncio.gather(*(bounded(i, query) for i, query in enumerate(queries, start_index))))
+
+    def _perspective_sector_queries(self, fin_context: Dict[str, Any]) -> List[str]:
+        """Perspective-specific sector queries that do not depend on the opponent's arguments"""
+        if self.config.perspective == "bullish":
+            return [
+                f"Nifty IT sector outperformance vs Nifty 50 {fin_context['quarter_full']} relative strength analysis",
+                f"Indian IT companies revenue growth margin expansion {fin_context['quarter_full']} quarterly results",
+                f"IT sector local market leadership technology adoption {fin_context['quarter_full']} competitive advantages"
+            ]
+        return [
+            f"Nifty IT underperformance vs Nifty 50 {fin_context['quarter_full']} sector weakness indicators",
+            f"Indian IT sector margin pressure wage inflation {fin_context['quarter_full']} cost challenges",
+            f"IT sector client concentration risks demand slowdown {fin_context['quarter_full']} earnings decline"
+        ]
 
+    def _prefetch_queries(self, num_queries: int) -> List[str]:
+        """Sector queries for the next prefetch, rotating by turn so rebuttals get fresh ones"""
+        sector_queries = self._perspective_sector_queries(get_current_financial_context())
+        queries = [
+            sector_queries[(self.turn_count + n) % len(sector_queries)]
+            for n in range(num_queries)
+        ]
+        logger.info(f"{self.config.name} prefetching {len(queries)} opponent-independent queries")
+        return queries
+
+    def prefetch_intelligence(self, num_queries: int = 1) -> PrefetchFuture:
+        """
+        Start this agent's opponent-independent data gathering in the background.
+        Runs perspective-specific sector queries (rotating by turn) so the results are
+        ready when respond(prefetched=...) is called after the opponent has spoken.
+        Resolves to (queries, query_results) for _formulate_and_execute_queries.
+        """
+        queries = self._prefetch_queries(num_queries)
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agent-prefetch")
+        future = PrefetchFuture()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result((queries, self._run_queries(queries, stop=future.stop)))
             except Exception as e:
-                logger.warning(f"Query {i} failed: {e}")
-                fresh_intelligence_parts.extend([
-                    f"\n❌ QUERY {i} - DATA UNAVAILABLE: {query}",
-                    "-" * 50,
-                    f"Data source error: {str(e)[:100]}",
-                    "",
-                    "=" * 70,
-                    ""
-                ])
+                future.set_exception(e)
 
-        fresh_intelligence = "\n".join(fresh_intelligence_parts)
+        self._prefetches = [prefetch for prefetch in self._prefetches if not prefetch.done()] + [future]
+        self._prefetch_executor.submit(run)
+        return future
 
-        # Log success rate but continue regardless
-        logger.info(f"{self.config.name} completed {successful_queries}/3 queries successfully")
-        return fresh_intelligence
+    def close(self):
+        """Stop outstanding prefetches and release the prefetch thread; a later prefetch starts a new one"""
+        for prefetch in self._prefetches:
+            prefetch.cancel()
+        self._prefetches = []
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_executor = None
+
+    def aprefetch_intelligence(self, num_queries: int = 1) -> asyncio.Task:
+        """prefetch_intelligence() as a task on the running event loop"""
+        queries = self._prefetch_queries(num_queries)
+
+        async def run() -> Tuple[List[str], List[Tuple[List[str], bool]]]:
+            return queries, await self._arun_queries(queries)
+        return asyncio.create_task(run())
+
+    def _execute_query(self, i: int, query: str) -> Tuple[List[str], bool]:
+        """Run a single dynamic query and format its section of the intelligence block"""
+        logger.info(f"{self.config.name} executing dynamic query {i}/3: {query[:50]}...")
 
+        # Throttle via the shared token bucket to prevent API overload
+        self.query_rate_limiter.acquire()
+
+        try:
+            # Get multi-source intelligence
+            query_result = self.data_loader.get_intelligent_context(query)
+        except Exception as e:
+            return self._query_section(i, query, error=e)
+        return self._query_section(i, query, query_result)
+
+    async def _aexecute_query(self, i: int, query: str) -> Tuple[List[str], bool]:
+        """Async _execute_query; waits for the shared token bucket without blocking the loop"""
+        logger.info(f"{self.config.name} executing dynamic query {i}/3: {query[:50]}...")
+
+        await self.query_rate_limiter.aacquire()
+
+        try:
+            query_result = await self.data_loader.aget_intelligent_context(query)
+        except Exception as e:
+            return self._query_section(i, query, error=e)
+        return self._query_section(i, query, query_result)
+
+    def _query_section(self, i: int, query: str, query_result: Optional[str] = None, error: Optional[Exception] = None) -> Tuple[List[str], bool]:
+        """Format one query's section of the intelligence block and whether it succeeded"""
+        if error is not None:
+            logger.warning(f"Query {i} failed: {error}")
+            return [
+                f"\n❌ QUERY {i} - DATA UNAVAILABLE: {query}",
+                "-" * 50,
+                f"Data source error: {str(error)[:100]}",
+                "",
+                "=" * 70,
+                ""
+            ], False
+
+        if query_result and len(query_result.strip()) >= 50:
+            return [
+                f"\n🔍 DYNAMIC QUERY {i}: {query}",
+                "-" * 50,
+                query_result[:1000] + "..." if len(query_result) > 1000 else query_result,
+                "",
+                "=" * 70,
+                ""
+            ], True
+
+        logger.warning(f"Query {i} returned insufficient data: {len(query_result) if query_result else 0} characters")
+        return [
+            f"\n⚠️ QUERY {i} - INSUFFICIENT DATA: {query}",
+            "-" * 50,
+            "Data source returned insufficient information for this query.",
+            "",
+            "=" * 70,
+            ""
+        ], False
 
     def _build_system_prompt(self) -> str:
         # Get dynamic financial context
@@ -185,18 +355,50 @@ Before each response, you will receive REAL-TIME data queries executed specifica
 
 Remember: Your credibility depends on using ONLY the fresh market intelligence provided. Training data usage will invalidate your argument."""
 
-    def respond(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1) -> DebateMessage:
+    def respond(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1, prefetched: Optional[Future] = None, on_chunk: Optional[Callable[[str], None]] = None) -> DebateMessage:
         logger.info(f"{self.config.name} starting 2-phase response generation...")
 
         # PHASE 1: MANDATORY DATA GATHERING - Query connectors for fresh intelligence
         logger.info(f"{self.config.name} Phase 1: Executing mandatory data queries...")
         fresh_market_intelligence = self._formulate_and_execute_queries(
-            debate_context, opponent_messages, turn_number
+            debate_context, opponent_messages, turn_number, prefetched=prefetched
         )
 
         # PHASE 2: INFORMED RESPONSE GENERATION - Use fresh data to formulate arguments
         logger.info(f"{self.config.name} Phase 2: Generating informed response with fresh data...")
+        chain_inputs = self._build_response_inputs(debate_context, opponent_messages, fresh_market_intelligence)
+
+        try:
+            # Streams content chunks to on_chunk as they arrive when a consumer is attached
+            content = run_chain(self.chain, chain_inputs, on_chunk)
+            return self._record_response(content, turn_number)
+
+        except Exception as e:
+            logger.error(f"Error generating response for {self.config.name}: {e}")
+            return self._fallback_response(turn_number)
+
+    async def arespond(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1, prefetched: Optional[Awaitable] = None, on_chunk: Optional[Callable[[str], None]] = None) -> DebateMessage:
+        """Async respond(): data gathering and generation run on the event loop (ainvoke/astream)"""
+        logger.info(f"{self.config.name} starting 2-phase response generation...")
+
+        logger.info(f"{self.config.name} Phase 1: Executing mandatory data queries...")
+        fresh_market_intelligence = await self._aformulate_and_execute_queries(
+            debate_context, opponent_messages, turn_number, prefetched=prefetched
+        )
+
+        logger.info(f"{self.config.name} Phase 2: Generating informed response with fresh data...")
+        chain_inputs = self._build_response_inputs(debate_context, opponent_messages, fresh_market_intelligence)
+
+        try:
+            content = await arun_chain(self.chain, chain_inputs, on_chunk)
+            return self._record_response(content, turn_number)
+
+        except Exception as e:
+            logger.error(f"Error generating response for {self.config.name}: {e}")
+            return self._fallback_response(turn_number)
 
+    def _build_response_inputs(self, debate_context: str, opponent_messages: Optional[List[str]], fresh_market_intelligence: str) -> Dict[str, Any]:
+        """Chain inputs (history + input message) for the response-generation phase"""
         history_messages = []
 
         # Add conversation history
@@ -256,49 +458,63 @@ Remember: Your credibility depends on using ONLY the fresh market intelligence p
             ])
 
         input_message = "\n".join(input_parts)
+        return {
+            "history": history_messages,
+            "input": input_message
+        }
+
+    def _record_response(self, content: str, turn_number: int) -> DebateMessage:
+        # Create debate message
+        debate_msg = DebateMessage(
+            agent_name=self.config.name,
+            perspective=self.config.perspective,
+            content=content,
+            turn_number=turn_number
+        )
 
-        try:
-            response = self.chain.invoke({
-                "history": history_messages,
-                "input": input_message
-            })
-
-            # Create debate message
-            debate_msg = DebateMessage(
-                agent_name=self.config.name,
-                perspective=self.config.perspective,
-                content=response.content,
-                turn_number=turn_number
-            )
-
-            # Add to conversation history and increment turn count
-            self.conversation_history.append(debate_msg)
-            self.turn_count += 1
-
-            logger.info(f"{self.config.name} generated data-driven response for turn {turn_number} using fresh market intelligence")
-            return debate_msg
+        # Add to conversation history and increment turn count
+        self.conversation_history.append(debate_msg)
+        self.turn_count += 1
 
-        except Exception as e:
-            logger.error(f"Error generating response for {self.config.name}: {e}")
+        logger.info(f"{self.config.name} generated data-driven response for turn {turn_number} using fresh market intelligence")
+        return debate_msg
 
-            # Fallback response
-            fallback_content = f"I apologize, but I encountered an error generating my {self.config.perspective} perspective on the Indian Banking sector. Please check the system configuration."
+    def _fallback_response(self, turn_number: int) -> DebateMessage:
+        fallback_content = f"I apologize, but I encountered an error generating my {self.config.perspective} perspective on the Indian Banking sector. Please check the system configuration."
 
-            return DebateMessage(
-                agent_name=self.config.name,
-                perspective=self.config.perspective,
-                content=fallback_content,
-                turn_number=turn_number
-            )
+        return DebateMessage(
+            agent_name=self.config.name,
+            perspective=self.config.perspective,
+            content=fallback_content,
+            turn_number=turn_number
+        )
 
-    def _generate_dynamic_queries(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1) -> List[str]:
+    def _generate_dynamic_queries(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1, num_queries: int = 3) -> List[str]:
         """
-        Generate up to 3 dynamic queries based on debate context and opponent arguments.
+        Generate num_queries (default 3) dynamic queries based on debate context and opponent arguments.
         Uses LLM to formulate targeted queries with dynamic date awareness.
         NO FALLBACKS - This must succeed or fail clearly.
         """
+        if num_queries <= 0:
+            return []
+
         # Get dynamic financial context
         fin_context = get_current_financial_context()
+        prompt = self._query_generation_prompt(debate_context, opponent_messages, turn_number, num_queries, fin_context)
+        response = self.llm.invoke(prompt)
+        return self._parse_generated_queries(response.content, num_queries, fin_context)
+
+    async def _agenerate_dynamic_queries(self, debate_context: str, opponent_messages: Optional[List[str]] = None, turn_number: int = 1, num_queries: int = 3) -> List[str]:
+        """Async _generate_dynamic_queries using llm.ainvoke"""
+        if num_queries <= 0:
+            return []
+
+        fin_context = get_current_financial_context()
+        prompt = self._query_generation_prompt(debate_context, opponent_messages, turn_number, num_queries, fin_context)
+        response = await self.llm.ainvoke(prompt)
+        return self._parse_generated_queries(response.content, num_queries, fin_context)
+
+    def _query_generation_prompt(self, debate_context: str, opponent_messages: Optional[List[str]], turn_number: int, num_queries: int, fin_context: Dict[str, Any]) -> str:
         prev_quarters = get_previous_quarters(fin_context, 2)
 
         # Build context for query generation
@@ -316,7 +532,7 @@ Remember: Your credibility depends on using ONLY the fresh market intelligence p
 
         query_generation_prompt = f"""
 You are a {self.config.perspective} financial analyst in a debate about the Indian IT sector.
-Generate EXACTLY 3 specific, targeted queries to gather market intelligence that will help you respond effectively.
+Generate EXACTLY {num_queries} specific, targeted queries to gather market intelligence that will help you respond effectively.
 
 CRITICAL DATE CONTEXT:
 - Current Date: {fin_context['current_date_str']}
@@ -329,7 +545,7 @@ Context:
 {chr(10).join(context_parts)}
 
 Rules:
-1. Generate EXACTLY 3 queries (no more, no less)
+1. Generate EXACTLY {num_queries} queries (no more, no less)
 2. Focus on SECTOR-LEVEL trends, policies, and macroeconomic factors (NOT individual companies)
 3. Target themes: government policies, industry transformation, regulatory changes, global trends
 4. Queries should align with your {self.config.perspective} perspective
@@ -342,14 +558,14 @@ Query Examples:
 - "Indian IT sector quarterly earnings revenue trends {fin_context['quarter_full']} margin analysis"
 - "IT sector local market dynamics client concentration risks {fin_context['quarter_full']} competitive positioning"
 
-Return EXACTLY 3 queries, one per line:
+Return EXACTLY {num_queries} queries, one per line:
 """
+        return query_generation_prompt
 
-        response = self.llm.invoke(query_generation_prompt)
-
+    def _parse_generated_queries(self, content: str, num_queries: int, fin_context: Dict[str, Any]) -> List[str]:
         # Parse queries from response - NO FALLBACKS
         queries = []
-        for line in response.content.strip().split('\n'):
+        for line in content.strip().split('\n'):
             line = line.strip()
             if line and not line.startswith(('1.', '2.', '3.', '-', '•')):
                 queries.append(line)
@@ -359,30 +575,16 @@ Return EXACTLY 3 queries, one per line:
                 if clean_query:
                     queries.append(clean_query)
 
-        # Limit to exactly 3 queries - NO FALLBACKS, must succeed
-        queries = queries[:3]
+        # Limit to exactly num_queries queries - NO FALLBACKS, must succeed
+        queries = queries[:num_queries]
 
         if len(queries) < 1:
             raise ValueError(f"Query generation failed: No queries generated from LLM response")
 
-        # Ensure exactly 3 queries - pad with sector-focused queries if needed
-        sector_queries_bullish = [
-            f"Nifty IT sector outperformance vs Nifty 50 {fin_context['quarter_full']} relative strength analysis",
-            f"Indian IT companies revenue growth margin expansion {fin_context['quarter_full']} quarterly results",
-            f"IT sector local market leadership technology adoption {fin_context['quarter_full']} competitive advantages"
-        ]
-
-        sector_queries_bearish = [
-            f"Nifty IT underperformance vs Nifty 50 {fin_context['quarter_full']} sector weakness indicators",
-            f"Indian IT sector margin pressure wage inflation {fin_context['quarter_full']} cost challenges",
-            f"IT sector client concentration risks demand slowdown {fin_context['quarter_full']} earnings decline"
-        ]
-
-        while len(queries) < 3:
-            if self.config.perspective == "bullish":
-                queries.append(sector_queries_bullish[(len(queries) - 1) % len(sector_queries_bullish)])
-            else:
-                queries.append(sector_queries_bearish[(len(queries) - 1) % len(sector_queries_bearish)])
+        # Ensure exactly num_queries queries - pad with sector-focused queries if needed
+        sector_queries = self._perspective_sector_queries(fin_context)
+        while len(queries) < num_queries:
+            queries.append(sector_queries[(len(queries) - 1) % len(sector_queries)])
 
         logger.info(f"{self.config.name} generated {len(queries)} dynamic queries")
         return queries
@@ -394,12 +596,20 @@ class MetaAgent:
         self.data_loader = data_loader
         self.llm = get_llm_from_config(model_config)
 
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", self._build_system_prompt()),
-            ("human", "{debate_transcript}")
-        ])
-
-        self.chain = self.prompt | self.llm
+        # Prompt needs the multi-source financial context, so it is built on first synthesize()
+        self._chain = None
+        self._chain_lock = threading.Lock()
+
+    @property
+    def chain(self):
+        with self._chain_lock:
+            if self._chain is None:
+                self.prompt = ChatPromptTemplate.from_messages([
+                    ("system", self._build_system_prompt()),
+                    ("human", "{debate_transcript}")
+                ])
+                self._chain = self.prompt | self.llm
+            return self._chain
 
     def _build_system_prompt(self) -> str:
         financial_context = self.data_loader.get_financial_context()
@@ -473,7 +683,40 @@ AVAILABLE FINANCIAL DATA:
 
 MAINTAIN RIGOROUS OBJECTIVITY: Apply rigorous fact-checking, demand evidence for all claims, and provide probabilistic rather than deterministic conclusions."""
 
-    def synthesize(self, debate_messages: List[DebateMessage]) -> str:
+    def synthesize(self, debate_messages: List[DebateMessage], on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        debate_transcript = self._build_debate_transcript(debate_messages)
+
+        try:
+            report = run_chain(self.chain, {
+                "debate_transcript": debate_transcript
+            }, on_chunk)
+
+            logger.info("Comprehensive meta-analysis report generated successfully")
+            return report
+
+        except Exception as e:
+            logger.error(f"Error generating meta-analysis report: {e}")
+            return f"Error generating meta-analysis report: {str(e)}"
+
+    async def asynthesize(self, debate_messages: List[DebateMessage], on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Async synthesize() using ainvoke/astream"""
+        debate_transcript = self._build_debate_transcript(debate_messages)
+
+        try:
+            # First access builds the prompt from the loader's (possibly blocking) financial context
+            chain = await asyncio.to_thread(lambda: self.chain)
+            report = await arun_chain(chain, {
+                "debate_transcript": debate_transcript
+            }, on_chunk)
+
+            logger.info("Comprehensive meta-analysis report generated successfully")
+            return report
+
+        except Exception as e:
+            logger.error(f"Error generating meta-analysis report: {e}")
+            return f"Error generating meta-analysis report: {str(e)}"
+
+    def _build_debate_transcript(self, debate_messages: List[DebateMessage]) -> str:
         # Build comprehensive debate transcript with meta-analysis context
         transcript_parts = [
             "MULTI-AGENT DEBATE TRANSCRIPT - Indian IT/Technology Sector Analysis",
@@ -509,19 +752,7 @@ MAINTAIN RIGOROUS OBJECTIVITY: Apply rigorous fact-checking, demand evidence for
                 ""
             ])
 
-        debate_transcript = "\n".join(transcript_parts)
-
-        try:
-            response = self.chain.invoke({
-                "debate_transcript": debate_transcript
-            })
-
-            logger.info("Comprehensive meta-analysis report generated successfully")
-            return response.content
-
-        except Exception as e:
-            logger.error(f"Error generating meta-analysis report: {e}")
-            return f"Error generating meta-analysis report: {str(e)}"
+        return "\n".join(transcript_parts)
 
     def _analyze_turn_distribution(self, debate_messages: List[DebateMessage]) -> str:
         """Analyze how turns were distributed among agents"""
@@ -577,12 +808,23 @@ def load_ethos_persona(persona_type: Literal["growth_believer", "cynic"]) -> str
         return f"You are a {persona_type} financial analyst focused on the Indian Banking sector."
 
 
+def restore_agent_history(agents, debate_messages: List[DebateMessage]):
+    """Rebuild each agent's history and turn count from checkpointed debate messages"""
+    for agent in agents:
+        own_messages = [msg for msg in debate_messages if msg.agent_name == agent.config.name]
+        agent.conversation_history = own_messages
+        agent.turn_count = len(own_messages)
+
+
 class MultiAgentDebateSystem:
     """Dialectical Agent System with 2 Ethos Personas: Growth Believer and Cynic"""
 
-    def __init__(self, data_loader: IntelligentFinancialDataLoader, model_config):
+    def __init__(self, data_loader: IntelligentFinancialDataLoader, model_config, pipelined: bool = False):
         self.data_loader = data_loader
         self.model_config = model_config
+        # Start the next speaker's opponent-independent data gathering while the current one
+        # speaks; this swaps one LLM-generated query per turn for a canned sector query
+        self.pipelined = pipelined
         self.agents: Dict[str, DebateAgent] = {}
         self.meta_agent = MetaAgent(model_config, data_loader)
 
@@ -615,26 +857,67 @@ class MultiAgentDebateSystem:
             except Exception as e:
                 logger.error(f"Failed to initialize agent {name}: {e}")
 
-    def run_debate_round(self, topic: str, max_rounds: int = 2) -> List[DebateMessage]:
-        """Run a structured dialectical debate with direct agent-to-agent exchanges"""
+    def run_debate_round(self, topic: str, max_rounds: int = 2, stream: Optional[MarkdownStreamWriter] = None) -> List[DebateMessage]:
+        """
+        Run a structured dialectical debate with direct agent-to-agent exchanges.
+        With a stream writer, each turn is written to it chunk by chunk while the agent speaks.
+        """
         debate_messages = []
+        schedule = self._debate_schedule(topic, debate_messages)
+        result, error = None, None
+        while True:
+            try:
+                step, agent, kwargs = schedule.throw(error) if error is not None else schedule.send(result)
+            except StopIteration:
+                return debate_messages
+            result, error = None, None
+            try:
+                result = self._prefetch(agent) if step == "prefetch" else self._respond(agent, stream, **kwargs)
+            except Exception as e:
+                error = e
+
+    async def arun_debate_round(self, topic: str, max_rounds: int = 2, stream: Optional[MarkdownStreamWriter] = None) -> List[DebateMessage]:
+        """Async run_debate_round(): same schedule, with turns and prefetches driven on the event loop"""
+        debate_messages = []
+        schedule = self._debate_schedule(topic, debate_messages)
+        result, error = None, None
+        while True:
+            try:
+                step, agent, kwargs = schedule.throw(error) if error is not None else schedule.send(result)
+            except StopIteration:
+                return debate_messages
+            result, error = None, None
+            try:
+                result = self._aprefetch(agent) if step == "prefetch" else await self._arespond(agent, stream, **kwargs)
+            except Exception as e:
+                error = e
 
+    def _debate_schedule(self, topic: str, debate_messages: List[DebateMessage]):
+        """
+        Turn order shared by run_debate_round and arun_debate_round. Yields
+        ("prefetch", agent, None) for a prefetch handle (Future or Task, None when not
+        pipelined) and ("respond", agent, kwargs) for a DebateMessage; a failed turn is
+        thrown back in and logged. Responses are appended to debate_messages.
+        """
         # Get the two agents
         growth_believer = self.agents.get("Growth Believer")
         cynic = self.agents.get("Cynic")
 
         if not growth_believer or not cynic:
             logger.error("Both Growth Believer and Cynic agents must be initialized")
-            return debate_messages
+            return
 
         logger.info("Starting dialectical debate with direct agent-to-agent exchanges")
 
         # Round 1: Opening statements
         logger.info("Round 1: Opening statements")
 
+        # Cynic's sector queries run while the Growth Believer gathers data and speaks
+        cynic_prefetch = yield "prefetch", cynic, None
+
         # Growth Believer opens
         try:
-            response = growth_believer.respond(
+            response = yield "respond", growth_believer, dict(
                 debate_context=topic,
                 opponent_messages=None,
                 turn_number=1
@@ -644,13 +927,19 @@ class MultiAgentDebateSystem:
         except Exception as e:
             logger.error(f"Error getting opening from Growth Believer: {e}")
 
+        # Growth Believer's rebuttal sector queries run while the Cynic speaks
+        growth_rebuttal_prefetch = None
+        if growth_believer.turn_count < growth_believer.max_turns_per_agent:
+            growth_rebuttal_prefetch = yield "prefetch", growth_believer, None
+
         # Cynic responds
         try:
             growth_message = [debate_messages[-1].content] if debate_messages else None
-            response = cynic.respond(
+            response = yield "respond", cynic, dict(
                 debate_context=topic,
                 opponent_messages=growth_message,
-                turn_number=2
+                turn_number=2,
+                prefetched=cynic_prefetch
             )
             debate_messages.append(response)
             logger.info(f"Cynic presented opening statement")
@@ -663,13 +952,17 @@ class MultiAgentDebateSystem:
 
             logger.info("Round 2: Targeted rebuttals")
 
+            # Cynic's counter-rebuttal sector queries run while the Growth Believer speaks
+            cynic_rebuttal_prefetch = yield "prefetch", cynic, None
+
             # Growth Believer rebuttal
             try:
                 cynic_messages = [msg.content for msg in debate_messages if msg.agent_name == "Cynic"]
-                response = growth_believer.respond(
+                response = yield "respond", growth_believer, dict(
                     debate_context=topic,
                     opponent_messages=cynic_messages,
-                    turn_number=len(debate_messages) + 1
+                    turn_number=len(debate_messages) + 1,
+                    prefetched=growth_rebuttal_prefetch
                 )
                 debate_messages.append(response)
                 logger.info(f"Growth Believer presented rebuttal")
@@ -679,22 +972,68 @@ class MultiAgentDebateSystem:
             # Cynic counter-rebuttal
             try:
                 growth_messages = [msg.content for msg in debate_messages if msg.agent_name == "Growth Believer"]
-                response = cynic.respond(
+                response = yield "respond", cynic, dict(
                     debate_context=topic,
                     opponent_messages=growth_messages,
-                    turn_number=len(debate_messages) + 1
+                    turn_number=len(debate_messages) + 1,
+                    prefetched=cynic_rebuttal_prefetch
                 )
                 debate_messages.append(response)
                 logger.info(f"Cynic presented counter-rebuttal")
             except Exception as e:
                 logger.error(f"Error getting counter-rebuttal from Cynic: {e}")
+        elif growth_rebuttal_prefetch is not None:
+            growth_rebuttal_prefetch.cancel()
 
         logger.info(f"Dialectical debate completed with {len(debate_messages)} exchanges")
-        return debate_messages
 
-    def generate_meta_analysis(self, debate_messages: List[DebateMessage]) -> str:
+    def _respond(self, agent: DebateAgent, stream: Optional[MarkdownStreamWriter], **kwargs) -> DebateMessage:
+        """Have an agent speak, streaming its turn into the transcript writer if one is attached"""
+        if stream is None:
+            return agent.respond(**kwargs)
+
+        stream.begin_section(f"## Turn {kwargs['turn_number']} - {agent.config.name} ({agent.config.perspective.upper()})")
+        try:
+            return agent.respond(on_chunk=stream.write, **kwargs)
+        finally:
+            stream.end_section()
+
+    async def _arespond(self, agent: DebateAgent, stream: Optional[MarkdownStreamWriter], **kwargs) -> DebateMessage:
+        if stream is None:
+            return await agent.arespond(**kwargs)
+
+        stream.begin_section(f"## Turn {kwargs['turn_number']} - {agent.config.name} ({agent.config.perspective.upper()})")
+        try:
+            return await agent.arespond(on_chunk=stream.write, **kwargs)
+        finally:
+            stream.end_section()
+
+    def _prefetch(self, agent: DebateAgent) -> Optional[Future]:
+        """Kick off an agent's opponent-independent queries when pipelining is enabled"""
+        if not self.pipelined:
+            return None
+        return agent.prefetch_intelligence()
+
+    def _aprefetch(self, agent: DebateAgent) -> Optional[asyncio.Task]:
+        if not self.pipelined:
+            return None
+        return agent.aprefetch_intelligence()
+
+    def generate_meta_analysis(self, debate_messages: List[DebateMessage], on_chunk: Optional[Callable[[str], None]] = None) -> str:
         """Generate comprehensive meta-analysis of the debate"""
-        return self.meta_agent.synthesize(debate_messages)
+        return self.meta_agent.synthesize(debate_messages, on_chunk)
+
+    async def agenerate_meta_analysis(self, debate_messages: List[DebateMessage], on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        return await self.meta_agent.asynthesize(debate_messages, on_chunk)
+
+    def close(self):
+        """Stop the agents' background prefetching"""
+        for agent in self.agents.values():
+            agent.close()
+
+    def restore_history(self, debate_messages: List[DebateMessage]):
+        """Rebuild each agent's history and turn count from checkpointed debate messages"""
+        restore_agent_history(self.agents.values(), debate_messages)
 
     def get_agent_stats(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics about agent participation"""
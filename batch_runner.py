@@ -0,0 +1,167 @@
+"""
+Batch runner for debating many topics in one process.
+
+Topics run on a bounded thread pool and share one IntelligentFinancialDataLoader
+(connector sessions, Chroma client, embedding and routing caches), the cached LLM
+clients and the process-wide OpenRouter/Gemini rate limiters. Each topic's results
+are saved to its own directory under the output root.
+
+Usage:
+    python batch_runner.py topics.txt --workers 3 --output-root outputs/batch
+"""
+
+import re
+import json
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Union
+
+from dotenv import load_dotenv
+
+from config import SystemConfig, DebateConfig, load_config, configure_rate_limits
+from connectors.http_transport import configure_http_transport
+from checkpointing import new_thread_id
+from advanced_orchestrator import AdvancedDebateOrchestrator
+from intelligent_data_loader import IntelligentFinancialDataLoader
+
+logger = logging.getLogger(__name__)
+
+TopicSpec = Union[str, DebateConfig]
+
+
+def topic_slug(topic: str, max_length: int = 60) -> str:
+    """Filesystem-safe directory name for a topic"""
+    slug = re.sub(r"[^a-z0-9]+", "_", topic.lower()).strip("_")
+    return slug[:max_length].rstrip("_") or "topic"
+
+
+def _save_results(result: Dict[str, Any], output_dir: str):
+    # main pulls in the PDF converter (weasyprint), so import it only when saving
+    from main import save_results
+    save_results(result, output_dir)
+
+
+class BatchDebateRunner:
+    def __init__(
+        self,
+        base_config: Optional[SystemConfig] = None,
+        max_workers: int = 3,
+        output_root: str = "outputs/batch",
+        data_loader: Optional[IntelligentFinancialDataLoader] = None,
+        save_fn: Optional[Callable[[Dict[str, Any], str], None]] = None,
+    ):
+        """
+        Args:
+            base_config: config every topic starts from; its rate_limits set the global budgets
+            max_workers: debates running at the same time
+            output_root: each topic writes to output_root/<topic slug>/
+            data_loader: shared loader; created on first use if not given
+            save_fn: (result, output_dir) writer, defaults to main.save_results
+        """
+        self.base_config = base_config or load_config()
+        self.max_workers = max(1, max_workers)
+        self.output_root = Path(output_root)
+        self.save_fn = save_fn or _save_results
+        self._data_loader = data_loader
+        self._data_loader_lock = threading.Lock()
+
+        # One budget and one connection pool per upstream API for all debates in the process
+        configure_rate_limits(self.base_config.rate_limits)
+        configure_http_transport(self.base_config.http)
+
+    @property
+    def data_loader(self) -> IntelligentFinancialDataLoader:
+        with self._data_loader_lock:
+            if self._data_loader is None:
+                self._data_loader = IntelligentFinancialDataLoader()
+            return self._data_loader
+
+    def _build_configs(self, topics: List[TopicSpec]) -> List[SystemConfig]:
+        """Per-topic SystemConfigs with unique output directories"""
+        configs = []
+        used_dirs = set()
+        for item in topics:
+            if isinstance(item, DebateConfig):
+                debate = item
+            else:
+                debate = self.base_config.debate.model_copy(update={"topic": item})
+
+            slug = topic_slug(debate.topic)
+            candidate, n = slug, 2
+            while candidate in used_dirs:
+                candidate, n = f"{slug}_{n}", n + 1
+            used_dirs.add(candidate)
+
+            debate = debate.model_copy(update={"output_directory": str(self.output_root / candidate)})
+            configs.append(self.base_config.model_copy(update={"debate": debate}))
+        return configs
+
+    def run_topic(self, config: SystemConfig) -> Dict[str, Any]:
+        """Run and save one debate; failures are reported, never raised"""
+        start = time.perf_counter()
+        output_dir = config.debate.output_directory
+        try:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            orchestrator = AdvancedDebateOrchestrator(config, data_loader=self.data_loader)
+            result = orchestrator.run_advanced_debate(thread_id=new_thread_id(f"batch_{Path(output_dir).name}"))
+            self.save_fn(result, output_dir)
+            status, error = result["status"], result.get("error")
+        except Exception as e:
+            logger.error(f"Batch debate failed for '{config.debate.topic}': {e}")
+            status, error = "error", str(e)
+
+        summary = {
+            "topic": config.debate.topic,
+            "status": status,
+            "output_directory": output_dir,
+            "seconds": round(time.perf_counter() - start, 1),
+        }
+        if error:
+            summary["error"] = error
+        logger.info(f"Batch debate finished: {summary}")
+        return summary
+
+    def run(self, topics: List[TopicSpec]) -> List[Dict[str, Any]]:
+        """Run all topics across the worker pool; summaries come back in input order"""
+        configs = self._build_configs(topics)
+        logger.info(f"Running {len(configs)} debates with {self.max_workers} workers")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-debate") as executor:
+            summaries = list(executor.map(self.run_topic, configs))
+
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        with open(self.output_root / "batch_summary.json", 'w', encoding='utf-8') as f:
+            json.dump(summaries, f, indent=2, ensure_ascii=False)
+        return summaries
+
+
+def load_topics(path: str) -> List[TopicSpec]:
+    """Topics from a JSON list (strings or DebateConfig dicts) or a text file with one per line"""
+    text = Path(path).read_text(encoding='utf-8')
+    if path.endswith(".json"):
+        return [item if isinstance(item, str) else DebateConfig(**item) for item in json.loads(text)]
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run debates for many topics")
+    parser.add_argument("topics_file", help="JSON list or text file with one topic per line")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--output-root", default="outputs/batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    runner = BatchDebateRunner(max_workers=args.workers, output_root=args.output_root)
+    summaries = runner.run(load_topics(args.topics_file))
+
+    completed = sum(summary["status"] == "completed" for summary in summaries)
+    print(f"{completed}/{len(summaries)} debates completed; summary in {args.output_root}/batch_summary.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Durable LangGraph checkpointers so an interrupted debate can resume from its
+last completed node instead of re-running every agent turn
+"""
+
+import uuid
+import sqlite3
+import logging
+from datetime import datetime
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+logger = logging.getLogger(__name__)
+
+
+def new_thread_id(prefix: str = "debate") -> str:
+    """Thread id unique to one run, so a new debate never resumes or appends to an earlier one"""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+
+def create_checkpointer(checkpoint_path: Optional[str]) -> BaseCheckpointSaver:
+    """SQLite checkpointer at checkpoint_path, or an in-memory one when the path is empty"""
+    if not checkpoint_path:
+        return MemorySaver()
+
+    path = Path(checkpoint_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Several orchestrators (e.g. batch runs) may write to the same file from different threads
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=30.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    logger.info(f"Checkpointing debate state to {path}")
+    return SqliteSaver(conn)
+
+
+@asynccontextmanager
+async def open_async_checkpointer(checkpoint_path: Optional[str], fallback: BaseCheckpointSaver) -> AsyncIterator[BaseCheckpointSaver]:
+    """
+    Async-capable checkpointer for graph.ainvoke. SqliteSaver has no async methods,
+    so SQLite-backed runs open an AsyncSqliteSaver on the same file for the duration
+    of the call; in-memory runs reuse fallback.
+    """
+    if not checkpoint_path:
+        yield fallback
+        return
+
+    Path(checkpoint_path).parent.mkdir(parents=True, exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(str(checkpoint_path)) as saver:
+        yield saver
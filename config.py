@@ -1,8 +1,12 @@
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, Literal
 import os
+import threading
 from pathlib import Path
 
+from rate_limiter import ChatModelRateLimiter, TokenBucketRateLimiter, configure_rate_limiter, get_rate_limiter
+from connectors.http_transport import HttpTransportConfig
+
 class ModelConfig(BaseModel):
     provider: Literal["openai", "anthropic", "openrouter"] = "openrouter"
     model_name: str = "openrouter/deepseek/deepseek-r1"  # Updated for reasoning model
@@ -14,6 +18,12 @@ class ModelConfig(BaseModel):
     reasoning_effort: Optional[str] = "high"  # low, medium, high
     max_reasoning_tokens: Optional[int] = 15000  # Control reasoning depth
 
+class QueryExecutionConfig(BaseModel):
+    parallel: bool = True  # Fan out an agent's dynamic queries instead of running them one by one
+    max_concurrent_queries: int = 3  # Concurrency cap for the fan-out
+    rate_limit_per_second: float = 0.5  # Token refill rate shared by all agents (replaces fixed 2s sleeps)
+    rate_limit_burst: int = 3  # Queries allowed to start back-to-back before throttling kicks in
+
 class AgentConfig(BaseModel):
     name: str
     role: str
@@ -21,6 +31,7 @@ class AgentConfig(BaseModel):
     model: ModelConfig
     system_prompt: str
     max_turns: int = 5
+    query_execution: QueryExecutionConfig = Field(default_factory=QueryExecutionConfig)
 
 class DebateConfig(BaseModel):
     topic: str = "Indian IT/Technology Sector Analysis - September 2025"
@@ -28,6 +39,19 @@ class DebateConfig(BaseModel):
     max_rounds: int = 2  # Maximum debate rounds
     output_directory: str = "outputs"
     reasoning_depth: int = 3  # Advanced reasoning depth for reasoning models
+    stream_output: bool = False  # Also write transcript/report to live_* files as tokens arrive (main.py --stream)
+    # Prefetch each agent's next turn while the opponent speaks. Faster, but one of the
+    # agent's LLM-generated queries per turn becomes a canned sector query, since the
+    # prefetch can't see the opponent's argument yet
+    pipeline_queries: bool = False
+    checkpoint_path: Optional[str] = "outputs/checkpoints.sqlite"  # Durable graph state for resume (each run gets its own thread id); None keeps it in memory
+
+class RateLimitConfig(BaseModel):
+    # Process-wide budgets shared by every debate running in the process
+    openrouter_per_second: float = 2.0  # Agent, meta-agent and router LLM requests
+    openrouter_burst: int = 5
+    gemini_per_second: float = 5.0  # Embedding requests
+    gemini_burst: int = 10
 
 class SystemConfig(BaseModel):
     # Legacy fields for backwards compatibility (not used in advanced system)
@@ -36,6 +60,8 @@ class SystemConfig(BaseModel):
     orchestrator: ModelConfig
     synthesis_agent: ModelConfig
     debate: DebateConfig
+    rate_limits: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    http: HttpTransportConfig = Field(default_factory=HttpTransportConfig)  # Shared connector HTTP pool
 
     @classmethod
     def create_default(cls) -> "SystemConfig":
@@ -79,7 +105,33 @@ def save_config(config: SystemConfig):
     with open("config.json", 'w') as f:
         json.dump(config.model_dump(), f, indent=2)
 
+def get_service_rate_limiter(service: Literal["openrouter", "gemini"]) -> TokenBucketRateLimiter:
+    """Shared limiter for an upstream API, created with RateLimitConfig defaults on first use"""
+    limits = RateLimitConfig()
+    return get_rate_limiter(service, getattr(limits, f"{service}_per_second"), getattr(limits, f"{service}_burst"))
+
+def configure_rate_limits(limits: RateLimitConfig):
+    """Apply a RateLimitConfig to the process-wide OpenRouter and Gemini limiters"""
+    configure_rate_limiter("openrouter", limits.openrouter_per_second, limits.openrouter_burst)
+    configure_rate_limiter("gemini", limits.gemini_per_second, limits.gemini_burst)
+
+_llm_clients: Dict[str, Any] = {}
+_llm_clients_lock = threading.Lock()
+
 def get_llm_from_config(model_config: ModelConfig):
+    """
+    Chat model for a model config. Clients are cached per config so agents and
+    concurrent debates reuse one HTTP connection pool.
+    """
+    cache_key = model_config.model_dump_json()
+    with _llm_clients_lock:
+        llm = _llm_clients.get(cache_key)
+        if llm is None:
+            llm = _create_llm(model_config)
+            _llm_clients[cache_key] = llm
+        return llm
+
+def _create_llm(model_config: ModelConfig):
     if model_config.provider == "openrouter":
         from langchain_openai import ChatOpenAI
         # Use API key from environment variable
@@ -98,7 +150,8 @@ def get_llm_from_config(model_config: ModelConfig):
             max_tokens=model_config.max_tokens,
             api_key=api_key,
             base_url=model_config.base_url,
-            default_headers=extra_headers
+            default_headers=extra_headers,
+            rate_limiter=ChatModelRateLimiter(get_service_rate_limiter("openrouter"))
         )
     elif model_config.provider == "openai":
         from langchain_openai import ChatOpenAI
@@ -0,0 +1,229 @@
+"""
+Process-wide HTTP transport shared by the data connectors.
+
+One keep-alive requests.Session (urllib3 keeps a connection pool per host) and one
+httpx.AsyncClient per event loop, with central timeouts and retries with backoff,
+so repeated calls to the same API reuse TCP/TLS connections instead of
+handshaking every time. The async client speaks HTTP/2 when the h2 package is
+installed. Bulk fetchers take a host_slot() per request to cap how many requests
+hit one host at once. POSTs are only retried for URL prefixes registered with
+allow_post_retries().
+"""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Optional, Set
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpTransportConfig(BaseModel):
+    connect_timeout: float = 5.0  # Seconds to establish a connection
+    read_timeout: float = 30.0  # Seconds to wait for response data
+    retries: int = 3  # Retries on connection errors and RETRY_STATUSES
+    backoff_factor: float = 0.5  # Sleeps 0.5s, 1s, 2s, ... between retries
+    pool_connections: int = 16  # Hosts whose connection pools are kept open
+    pool_maxsize: int = 16  # Keep-alive connections per host
+    http2: bool = True  # Async client only, and only when h2 is installed
+    max_per_host: int = 4  # Concurrent requests per host for callers using host_slot()
+
+
+class _TimeoutSession(requests.Session):
+    """Session that applies the configured timeout to requests that don't set one"""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+_settings = HttpTransportConfig()
+_session: Optional[_TimeoutSession] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+# URL prefixes whose POSTs are read-only queries and safe to repeat
+_post_retry_prefixes: Set[str] = set()
+_lock = threading.Lock()
+
+
+def _retry_policy(settings: HttpTransportConfig, retry_post: bool) -> Retry:
+    return Retry(
+        total=settings.retries,
+        backoff_factor=settings.backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=(Retry.DEFAULT_ALLOWED_METHODS | {"POST"}) if retry_post else Retry.DEFAULT_ALLOWED_METHODS,
+        respect_retry_after_header=True,
+        # Hand the last response back so callers can still inspect 4xx/5xx status codes
+        raise_on_status=False,
+    )
+
+
+def _mount_adapters(session: _TimeoutSession, settings: HttpTransportConfig):
+    # requests picks the adapter with the longest matching prefix, so registered
+    # POST prefixes override the scheme-wide adapters
+    prefixes = {"https://": False, "http://": False, **{prefix: True for prefix in _post_retry_prefixes}}
+    for prefix, retry_post in prefixes.items():
+        old_adapter = session.adapters.get(prefix)
+        session.mount(prefix, HTTPAdapter(
+            pool_connections=settings.pool_connections,
+            pool_maxsize=settings.pool_maxsize,
+            max_retries=_retry_policy(settings, retry_post)
+        ))
+        if old_adapter is not None:
+            old_adapter.close()
+    session.default_timeout = (settings.connect_timeout, settings.read_timeout)
+
+
+def allow_post_retries(url_prefix: str):
+    """
+    Retry POSTs to URLs starting with url_prefix like GETs. Only register endpoints
+    whose POSTs are read-only queries (e.g. niftyindices history), since a retried
+    POST may run twice on the server.
+    """
+    with _lock:
+        if url_prefix in _post_retry_prefixes:
+            return
+        _post_retry_prefixes.add(url_prefix)
+        if _session is not None:
+            _mount_adapters(_session, _settings)
+
+
+def _retries_post(url: str) -> bool:
+    return url.startswith(tuple(_post_retry_prefixes))
+
+
+def get_session() -> requests.Session:
+    """
+    The shared requests.Session. Pass per-API headers on each request rather than
+    updating session.headers, since every connector uses the same session.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = _TimeoutSession((_settings.connect_timeout, _settings.read_timeout))
+            _mount_adapters(_session, _settings)
+        return _session
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    The shared httpx.AsyncClient for the running event loop. httpx connections are
+    bound to the loop that opened them, so each loop gets its own client.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            settings = _settings
+            client = httpx.AsyncClient(
+                http2=settings.http2 and _http2_available(),
+                timeout=httpx.Timeout(settings.read_timeout, connect=settings.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.pool_connections * settings.pool_maxsize,
+                    max_keepalive_connections=settings.pool_maxsize,
+                ),
+                # Transport-level retries cover failed connects; arequest() handles retryable statuses
+                transport=httpx.AsyncHTTPTransport(retries=settings.retries, http2=settings.http2 and _http2_available()),
+            )
+            _async_clients[loop] = client
+        return client
+
+
+async def arequest(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request on the shared async client, retrying RETRY_STATUSES and timeouts
+    with the same backoff as the sync session
+    """
+    settings = _settings
+    retries = settings.retries if method.upper() != "POST" or _retries_post(url) else 0
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        try:
+            response = await get_async_client().request(method, url, **kwargs)
+        except httpx.TimeoutException:
+            if last_attempt:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+            await response.aclose()
+        await asyncio.sleep(settings.backoff_factor * (2 ** attempt))
+
+
+@contextmanager
+def host_slot(url: str):
+    """Hold one of the max_per_host request slots for url's host while the block runs"""
+    host = urlsplit(url).netloc
+    with _lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(_settings.max_per_host)
+    with slot:
+        yield
+
+
+def _close_async_clients():
+    """Close and forget every loop's async client; each is closed on its own loop"""
+    with _lock:
+        clients = list(_async_clients.items())
+        _async_clients.clear()
+
+    # Outside the lock: running a loop may reach get_async_client()
+    for loop, client in clients:
+        if client.is_closed or loop.is_closed():
+            # A closed loop's connections can't be closed any more
+            continue
+        try:
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                loop.run_until_complete(client.aclose())
+        except Exception as e:
+            logger.warning(f"Could not close async HTTP client: {e}")
+
+
+def configure_http_transport(settings: HttpTransportConfig):
+    """
+    Apply new timeouts/retries/pool sizes. The shared session is updated in place;
+    existing async clients are closed and rebuilt on their next use, so call this
+    before starting requests on them.
+    """
+    global _settings
+    with _lock:
+        _settings = settings
+        if _session is not None:
+            _mount_adapters(_session, settings)
+        # Requests already holding a slot finish on the old semaphore
+        _host_slots.clear()
+    _close_async_clients()
+    logger.info(f"HTTP transport configured: {settings.model_dump()}")
+
+
+def close_http_transport():
+    """Close the shared session's and async clients' pooled connections (e.g. at process shutdown)"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+    _close_async_clients()
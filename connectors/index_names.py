@@ -0,0 +1,206 @@
+"""
+Precomputed index-name lookup shared by NiftyIndicesTracker and the fast-path router.
+
+Built once per process from config/indices-list.csv and cached on disk under
+cache/indices, keyed by the CSV's size and mtime. Exact names, ids, compact
+spellings ("niftyit") and aliases ("cnx it") resolve with one dict lookup; other
+search terms are ranked by trigram similarity over a pruned candidate set.
+"""
+
+import re
+import json
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+INDICES_FILE = Path(__file__).parent.parent / "config" / "indices-list.csv"
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "indices"
+CACHE_VERSION = 1
+
+# Common spellings that do not follow from the names in indices-list.csv
+INDEX_ALIASES = {
+    "nifty bank": "Nifty Bank",
+    "bank nifty": "Nifty Bank",
+    "banknifty": "Nifty Bank",
+    "junior nifty": "Nifty Next 50",
+    "nifty junior": "Nifty Next 50",
+    "nifty information technology": "Nifty IT",
+    "india vix": "India VIX",
+    "vix": "India VIX",
+}
+
+# Minimum similarity for a fuzzy match to count as the index the caller meant
+MIN_MATCH_SCORE = 0.65
+# Candidates (by shared trigram count) that get a full similarity score
+MAX_CANDIDATES = 25
+
+
+def normalize_index_name(name: str) -> str:
+    """Lowercase, '&' -> 'and', punctuation to spaces, collapsed whitespace"""
+    name = name.lower().replace("&", " and ")
+    return re.sub(r"[^a-z0-9]+", " ", name).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class IndexNameIndex:
+    """Alias table plus token and trigram inverted indexes over the canonical names"""
+
+    def __init__(self, names: List[str], aliases: Dict[str, str], trigrams: Dict[str, List[int]], tokens: Dict[str, List[int]]):
+        self.names = names
+        self.aliases = aliases
+        self.trigrams = trigrams
+        self.tokens = tokens
+        self._name_trigrams = [_trigrams(normalize_index_name(name)) for name in names]
+        self._name_tokens = [set(normalize_index_name(name).split()) for name in names]
+
+    @classmethod
+    def build(cls, rows: List[Tuple[str, str]]) -> "IndexNameIndex":
+        """rows: (index_id, index_name) pairs from indices-list.csv"""
+        names: List[str] = []
+        aliases: Dict[str, str] = {}
+        for index_id, name in rows:
+            if name not in names:
+                names.append(name)
+            aliases[str(index_id)] = name
+
+        for name in names:
+            normalized = normalize_index_name(name)
+            variants = {name.lower(), normalized, normalized.replace(" ", "")}
+            # NSE indices were branded "CNX ..." before the rename to "Nifty ..."
+            if normalized.startswith("nifty "):
+                variants.add("cnx " + normalized[len("nifty "):])
+            for variant in variants:
+                aliases.setdefault(variant, name)
+        for alias, name in INDEX_ALIASES.items():
+            if name in names:
+                aliases.setdefault(alias, name)
+
+        trigrams: Dict[str, List[int]] = {}
+        tokens: Dict[str, List[int]] = {}
+        for name_id, name in enumerate(names):
+            normalized = normalize_index_name(name)
+            for trigram in _trigrams(normalized):
+                trigrams.setdefault(trigram, []).append(name_id)
+            for token in set(normalized.split()):
+                tokens.setdefault(token, []).append(name_id)
+        return cls(names, aliases, trigrams, tokens)
+
+    def phrases(self) -> Dict[str, str]:
+        """Alias -> name for everything except numeric ids, for matching names inside free text"""
+        return {alias: name for alias, name in self.aliases.items() if not alias.isdigit()}
+
+    def lookup(self, term: str) -> Optional[str]:
+        """Exact name, id, compact spelling or alias"""
+        term = term.strip()
+        return self.aliases.get(term) or self.aliases.get(term.lower()) or self.aliases.get(normalize_index_name(term))
+
+    def search(self, term: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """(name, score) pairs best first; an exact lookup scores 1.0"""
+        exact = self.lookup(term)
+        if exact:
+            return [(exact, 1.0)]
+
+        normalized = normalize_index_name(term)
+        if not normalized:
+            return []
+        query_trigrams = _trigrams(normalized)
+        query_tokens = set(normalized.split())
+
+        shared = Counter()
+        for trigram in query_trigrams:
+            name_ids = self.trigrams.get(trigram, ())
+            # Trigrams of "nifty" are in most names and say nothing about which index is meant
+            if len(name_ids) * 2 <= len(self.names):
+                shared.update(name_ids)
+        candidates = {name_id for name_id, _ in shared.most_common(MAX_CANDIDATES)}
+        for token in query_tokens:
+            token_ids = self.tokens.get(token, ())
+            # Words like "nifty" appear in nearly every name and would make every index a candidate
+            if len(token_ids) <= MAX_CANDIDATES:
+                candidates.update(token_ids)
+
+        scored = []
+        for name_id in candidates:
+            name_trigrams = self._name_trigrams[name_id]
+            score = 2 * len(query_trigrams & name_trigrams) / (len(query_trigrams) + len(name_trigrams))
+            name_tokens = self._name_tokens[name_id]
+            if query_tokens <= name_tokens:
+                # Every word of the query appears in the name; fewer extra words ranks higher
+                score = max(score, 0.7 + 0.3 * len(query_tokens) / len(name_tokens))
+            scored.append((self.names[name_id], round(score, 4)))
+
+        scored.sort(key=lambda item: (-item[1], len(item[0])))
+        return scored[:limit]
+
+    def best_match(self, term: str, min_score: float = MIN_MATCH_SCORE) -> Optional[str]:
+        matches = self.search(term, limit=1)
+        if matches and matches[0][1] >= min_score:
+            return matches[0][0]
+        return None
+
+    def to_json(self) -> Dict:
+        return {"names": self.names, "aliases": self.aliases, "trigrams": self.trigrams, "tokens": self.tokens}
+
+
+def _signature(indices_file: Path) -> str:
+    stat = indices_file.stat()
+    return f"{CACHE_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _read_rows(indices_file: Path) -> List[Tuple[str, str]]:
+    df = pd.read_csv(indices_file)
+    df = df[df['index_name'].notna()]
+    ids = df['index_id'].astype(str).tolist()
+    names = df['index_name'].astype(str).str.strip().tolist()
+    return [(index_id, name) for index_id, name in zip(ids, names) if name]
+
+
+def _load_or_build(indices_file: Path, cache_dir: Path) -> IndexNameIndex:
+    if not indices_file.exists():
+        return IndexNameIndex.build([])
+
+    signature = _signature(indices_file)
+    cache_path = Path(cache_dir) / "index_names.json"
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get("signature") == signature and cached.get("source") == str(indices_file):
+            return IndexNameIndex(**cached["index"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    index = IndexNameIndex.build(_read_rows(indices_file))
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({"signature": signature, "source": str(indices_file), "index": index.to_json()}, f)
+    except OSError as e:
+        logger.warning(f"Could not write index name cache {cache_path}: {e}")
+    return index
+
+
+_indexes: Dict[str, Tuple[str, IndexNameIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index_name_index(indices_file=INDICES_FILE, cache_dir=DEFAULT_CACHE_DIR) -> IndexNameIndex:
+    """Process-wide index for indices_file, rebuilt when the CSV changes"""
+    indices_file = Path(indices_file)
+    with _indexes_lock:
+        key = str(indices_file.resolve())
+        signature = _signature(indices_file) if indices_file.exists() else ""
+        cached = _indexes.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, _load_or_build(indices_file, cache_dir))
+            _indexes[key] = cached
+        return cached[1]
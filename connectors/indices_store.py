@@ -0,0 +1,127 @@
+"""
+Local SQLite store of daily index OHLC bars for NiftyIndicesTracker.
+
+Bars are keyed by (index, date). A coverage table records which date ranges have
+already been fetched from niftyindices.com, including holidays that have no bars,
+so callers only download the gaps.
+"""
+
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_STORE_PATH = Path(__file__).parent.parent / "cache" / "indices" / "indices.sqlite3"
+
+DateRange = Tuple[date, date]
+
+
+class IndicesStore:
+    """Thread-safe bar + coverage store; one file can be shared by several processes"""
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS bars ("
+            "index_name TEXT NOT NULL, date TEXT NOT NULL, open REAL, high REAL, low REAL, close REAL, "
+            "PRIMARY KEY (index_name, date)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS coverage (index_name TEXT NOT NULL, start TEXT NOT NULL, end TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS coverage_index ON coverage (index_name)")
+
+    def _coverage(self, index_name: str) -> List[DateRange]:
+        rows = self._conn.execute(
+            "SELECT start, end FROM coverage WHERE index_name = ? ORDER BY start", (index_name,)
+        ).fetchall()
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows]
+
+    def missing_ranges(self, index_name: str, start: date, end: date) -> List[DateRange]:
+        """Sub-ranges of [start, end] that have not been fetched yet"""
+        with self._lock:
+            covered = self._coverage(index_name)
+
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in covered:
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start - timedelta(days=1)))
+            cursor = max(cursor, covered_end + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def save(self, index_name: str, df: Optional[pd.DataFrame], start: date, end: date):
+        """
+        Upsert the bars in df and mark [start, end] as fetched. Today is never marked,
+        since its bar can still change or appear later in the day.
+        """
+        rows = []
+        if df is not None and not df.empty:
+            bars = df[["Date", "Open", "High", "Low", "Close"]].copy()
+            bars["Date"] = pd.to_datetime(bars["Date"]).dt.strftime("%Y-%m-%d")
+            bars = bars.astype(object).where(bars.notna(), None)
+            rows = [(index_name, *row) for row in bars.itertuples(index=False, name=None)]
+
+        end = min(end, date.today() - timedelta(days=1))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if rows:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO bars (index_name, date, open, high, low, close) VALUES (?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+                if start <= end:
+                    self._add_coverage(index_name, start, end)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _add_coverage(self, index_name: str, start: date, end: date):
+        """Insert [start, end], merging it with overlapping or adjacent ranges"""
+        merged_start, merged_end = start, end
+        for covered_start, covered_end in self._coverage(index_name):
+            if covered_start <= merged_end + timedelta(days=1) and covered_end >= merged_start - timedelta(days=1):
+                merged_start = min(merged_start, covered_start)
+                merged_end = max(merged_end, covered_end)
+        self._conn.execute(
+            "DELETE FROM coverage WHERE index_name = ? AND start <= ? AND end >= ?",
+            (index_name, merged_end.isoformat(), merged_start.isoformat())
+        )
+        self._conn.execute(
+            "INSERT INTO coverage (index_name, start, end) VALUES (?, ?, ?)",
+            (index_name, merged_start.isoformat(), merged_end.isoformat())
+        )
+
+    def load(self, index_name: str, start: date, end: date) -> pd.DataFrame:
+        """Stored bars in [start, end] with the tracker's Date/Open/High/Low/Close/Index columns"""
+        with self._lock:
+            df = pd.read_sql_query(
+                "SELECT date AS Date, open AS Open, high AS High, low AS Low, close AS Close FROM bars "
+                "WHERE index_name = ? AND date BETWEEN ? AND ? ORDER BY date",
+                self._conn,
+                params=(index_name, start.isoformat(), end.isoformat())
+            )
+        df["Date"] = pd.to_datetime(df["Date"])
+        df["Index"] = index_name
+        return df
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -5,80 +5,72 @@ Nifty Indices Tracker - A CLI tool for tracking and visualizing Nifty indices da
 import json
 import requests
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import re
+import os
+import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from connectors.http_transport import get_session, allow_post_retries
+from connectors.indices_store import IndicesStore
+from connectors.index_names import get_index_name_index
+
 
 class NiftyIndicesTracker:
     """Main class for fetching and processing Nifty indices data"""
 
     BASE_URL = "https://www.niftyindices.com/Backpage.aspx/getHistoricaldataDBtoString"
 
-    def __init__(self):
+    def __init__(self, store: Optional[IndicesStore] = None, use_store: bool = True):
+        """
+        Args:
+            store: local bar store; defaults to the shared file under cache/indices
+            use_store: False always fetches the full range from niftyindices.com
+        """
+        self.name_index = get_index_name_index()
         self.indices_map = self._load_indices_map()
-        self.session = requests.Session()
-        self._setup_session()
-
-    def _setup_session(self):
-        """Setup session with required headers"""
-        self.session.headers.update({
+        self.store = (store or IndicesStore()) if use_store else None
+        # Serializes gap-filling per index so concurrent callers don't fetch the same range twice
+        self._index_locks = defaultdict(threading.Lock)
+        self._index_locks_lock = threading.Lock()
+        # Shared keep-alive session; the niftyindices headers are sent per request.
+        # The history endpoint is a read-only POST query, so it's safe to retry
+        allow_post_retries(self.BASE_URL)
+        self.session = get_session()
+        self.headers = {
             'Content-Type': 'application/json; charset=UTF-8',
             'Accept': 'application/json, text/javascript, */*; q=0.01',
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
             'X-Requested-With': 'XMLHttpRequest',
             'Origin': 'https://www.niftyindices.com',
             'Referer': 'https://www.niftyindices.com/market-data/advanced-charting'
-        })
+        }
 
     def _load_indices_map(self) -> Dict[str, str]:
-        """Load indices names from indices-list.csv"""
-        indices_map = {}
-        indices_file = Path(__file__).parent.parent / 'config' / 'indices-list.csv'
-
-        if indices_file.exists():
-            df = pd.read_csv(indices_file)
-            for _, row in df.iterrows():
-                index_id = str(row['index_id'])
-                index_name = row['index_name']
-                if pd.notna(index_name) and index_name.strip():  # Only add non-empty names
-                    indices_map[index_name.lower()] = index_name
-                    indices_map[index_id] = index_name
-
-        return indices_map
+        """Lowercase index name and index id -> exact index name, from the shared name index"""
+        return {alias: name for alias, name in self.name_index.aliases.items() if alias.isdigit() or alias == name.lower()}
 
     def list_indices(self) -> List[str]:
         """Return list of available indices"""
-        unique_indices = set()
-        for key, value in self.indices_map.items():
-            if not key.isdigit():  # Only add the actual names, not numbers
-                unique_indices.add(value)
-        return sorted(list(unique_indices))
+        return sorted(self.name_index.names)
 
     def find_index_name(self, search_term: str) -> Optional[str]:
-        """Find exact index name from search term"""
-        search_term = search_term.strip()
-
-        # Direct match
-        if search_term in self.indices_map:
-            return self.indices_map[search_term]
+        """Find exact index name from search term (name, id, alias or close spelling)"""
+        return self.name_index.best_match(search_term)
 
-        # Case insensitive match
-        search_lower = search_term.lower()
-        if search_lower in self.indices_map:
-            return self.indices_map[search_lower]
-
-        # Partial match
-        for key, value in self.indices_map.items():
-            if search_lower in key.lower():
-                return value
-
-        return None
+    def match_index_names(self, search_term: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Ranked (index name, score) candidates for a search term, best first"""
+        return self.name_index.search(search_term, limit)
 
     def fetch_historical_data(self, index_name: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
         """
-        Fetch historical data for a given index
+        Fetch historical data for a given index. With the local store, only date ranges
+        that were never fetched before are requested from niftyindices.com.
 
         Args:
             index_name: Name of the index
@@ -94,6 +86,35 @@ class NiftyIndicesTracker:
         if not exact_name:
             raise ValueError(f"Index '{index_name}' not found. Use list_indices() to see available indices.")
 
+        if self.store is None:
+            df = self._fetch_remote(exact_name, start_date, end_date)
+            return df if df is not None and not df.empty else None
+
+        start = datetime.strptime(start_date, '%d-%b-%Y').date()
+        end = datetime.strptime(end_date, '%d-%b-%Y').date()
+        with self._index_locks_lock:
+            index_lock = self._index_locks[exact_name]
+        with index_lock:
+            for gap_start, gap_end in self.store.missing_ranges(exact_name, start, end):
+                if self._is_weekend(gap_start, gap_end):
+                    # No trading on weekends; record the gap as fetched without a request
+                    self.store.save(exact_name, None, gap_start, gap_end)
+                    continue
+
+                df = self._fetch_remote(exact_name, gap_start.strftime('%d-%b-%Y'), gap_end.strftime('%d-%b-%Y'))
+                if df is None:
+                    return None
+                self.store.save(exact_name, df, gap_start, gap_end)
+
+        df = self.store.load(exact_name, start, end)
+        return df if not df.empty else None
+
+    @staticmethod
+    def _is_weekend(start: date, end: date) -> bool:
+        return (end - start).days < 2 and start.weekday() >= 5 and end.weekday() >= 5
+
+    def _fetch_remote(self, exact_name: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """POST one date range to niftyindices.com; empty DataFrame when it has no bars, None on failure"""
         payload = {
             "cinfo": json.dumps({
                 'name': exact_name,
@@ -105,7 +126,7 @@ class NiftyIndicesTracker:
         }
 
         try:
-            response = self.session.post(self.BASE_URL, json=payload, timeout=30)
+            response = self.session.post(self.BASE_URL, json=payload, headers=self.headers)
             response.raise_for_status()
 
             data = response.json()
@@ -128,7 +149,7 @@ class NiftyIndicesTracker:
             historical_data = json.loads(json_data)
 
             if not historical_data:
-                return None
+                return pd.DataFrame(columns=['Date', 'Open', 'High', 'Low', 'Close', 'Index'])
 
             # Convert to DataFrame
             df = pd.DataFrame(historical_data)
@@ -239,6 +260,46 @@ class NiftyIndicesTracker:
         df = self.fetch_historical_data(exact_name, start_date, end_date)
         return self._process_data(df, frequency)
 
+    def fetch_many(self, indices: List[str], start_date: str, end_date: str, frequency: str = "daily", max_workers: int = 4) -> pd.DataFrame:
+        """
+        Fetch several indices concurrently and align their closes on one date index
+
+        Args:
+            indices: Index names (e.g. ["Nifty IT", "Nifty 50", "Nifty Next 50"])
+            start_date: Start date in DD-MMM-YYYY format
+            end_date: End date in DD-MMM-YYYY format
+            frequency: daily, weekly, monthly, quarterly, yearly
+            max_workers: Fetches in flight at once
+
+        Returns:
+            DataFrame indexed by Date with one close column per index. Indices that
+            could not be fetched are left out.
+        """
+        names = list(dict.fromkeys(indices))
+        if not names:
+            return pd.DataFrame()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names))), thread_name_prefix="indices-fetch") as executor:
+            frames = list(executor.map(lambda name: self._fetch_or_none(name, start_date, end_date), names))
+
+        columns = {name: df.set_index('Date')['Close'] for name, df in zip(names, frames) if df is not None and not df.empty}
+        if not columns:
+            return pd.DataFrame()
+
+        # Carry the last close over days one index did not trade so the columns stay aligned
+        wide = pd.DataFrame(columns).sort_index().ffill()
+        wide.index.name = 'Date'
+        if frequency != "daily":
+            wide = self._freq_selection(wide.reset_index(), frequency).set_index('Date')
+        return wide
+
+    def _fetch_or_none(self, index_name: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        try:
+            return self.fetch_historical_data(index_name, start_date, end_date)
+        except ValueError as e:
+            print(f"Skipping {index_name}: {e}")
+            return None
+
     def compare_indices(self, index1: str, index2: str, timeframes: List[str]) -> Dict:
         """
         Compare performance between two indices across multiple timeframes
@@ -251,71 +312,100 @@ class NiftyIndicesTracker:
         Returns:
             Dictionary with comparative analysis
         """
-        comparison_results = {}
+        return self.compare_many([index1, index2], timeframes)
+
+    def compare_many(self, indices: List[str], timeframes: List[str], benchmark: Optional[str] = None) -> Dict:
+        """
+        Compare any number of indices across timeframes. Each index is fetched once over
+        the widest window; every timeframe is a slice of one date-aligned close frame.
+
+        Args:
+            indices: Index names, e.g. the whole sector list
+            timeframes: List of timeframes ['1w', '1m', '3m', '6m', '1y'] or 'start,end'
+            benchmark: Index that relative strength is measured against (default: first index)
 
+        Returns:
+            {timeframe: metrics}; per index <name>_return, _volatility, _max_drawdown,
+            _relative_strength, _start and _end. With two indices, 'outperformance' is
+            the second index's return minus the first's (0.0 when both name the same index).
+            Spellings of one index ("Nifty IT", "nifty it") are fetched and reported once,
+            under the first spelling given.
+
+        Raises:
+            ValueError: indices is empty
+        """
+        if not indices:
+            raise ValueError("compare_many needs at least one index")
+
+        # Resolved index name -> first spelling given for it
+        spellings = {}
+        requested = [spellings.setdefault(self.find_index_name(name) or name, name) for name in indices]
+        indices = list(dict.fromkeys(requested))
+        benchmark = spellings.setdefault(self.find_index_name(benchmark) or benchmark, benchmark) if benchmark else indices[0]
+        if benchmark not in indices:
+            indices.insert(0, benchmark)
+        pair = tuple(requested) if len(requested) == 2 and len(indices) <= 2 else None
+
+        windows = {}
+        bounds = {}
+        comparison_results = {}
         for timeframe in timeframes:
             try:
                 start_date, end_date = self.get_timeframe_dates(timeframe)
-
-                # Get data for both indices
-                data1 = self.get_data(index1, start_date, end_date)
-                data2 = self.get_data(index2, start_date, end_date)
-
-                if data1 and data2:
-                    # Calculate performance metrics
-                    values1 = list(data1.values())
-                    values2 = list(data2.values())
-
-                    if len(values1) >= 2 and len(values2) >= 2:
-                        # Calculate returns
-                        return1 = ((values1[-1] - values1[0]) / values1[0]) * 100
-                        return2 = ((values2[-1] - values2[0]) / values2[0]) * 100
-
-                        # Calculate volatility (std deviation of daily returns)
-                        if len(values1) > 1:
-                            daily_returns1 = [(values1[i] - values1[i-1]) / values1[i-1] * 100
-                                            for i in range(1, len(values1))]
-                            daily_returns2 = [(values2[i] - values2[i-1]) / values2[i-1] * 100
-                                            for i in range(1, len(values2))]
-
-                            vol1 = pd.Series(daily_returns1).std() if daily_returns1 else 0
-                            vol2 = pd.Series(daily_returns2).std() if daily_returns2 else 0
-                        else:
-                            vol1 = vol2 = 0
-
-                        comparison_results[timeframe] = {
-                            'period': timeframe,
-                            'start_date': start_date,
-                            'end_date': end_date,
-                            f'{index1}_return': round(return1, 2),
-                            f'{index2}_return': round(return2, 2),
-                            'outperformance': round(return2 - return1, 2),  # index2 vs index1
-                            f'{index1}_volatility': round(vol1, 2),
-                            f'{index2}_volatility': round(vol2, 2),
-                            f'{index1}_start': values1[0],
-                            f'{index1}_end': values1[-1],
-                            f'{index2}_start': values2[0],
-                            f'{index2}_end': values2[-1],
-                            'data_points': len(values1)
-                        }
-                    else:
-                        comparison_results[timeframe] = {
-                            'period': timeframe,
-                            'error': 'Insufficient data points for analysis'
-                        }
-                else:
-                    comparison_results[timeframe] = {
-                        'period': timeframe,
-                        'error': f'Data unavailable for {index1 if not data1 else index2}'
-                    }
-
+                bounds[timeframe] = tuple(pd.to_datetime([start_date, end_date], format='%d-%b-%Y'))
+                windows[timeframe] = (start_date, end_date)
             except Exception as e:
-                comparison_results[timeframe] = {
-                    'period': timeframe,
-                    'error': str(e)
-                }
-
-        return comparison_results
+                comparison_results[timeframe] = {'period': timeframe, 'error': str(e)}
+
+        if windows:
+            widest_start = min(start for start, _ in bounds.values()).strftime('%d-%b-%Y')
+            widest_end = max(end for _, end in bounds.values()).strftime('%d-%b-%Y')
+            closes = self.fetch_many(indices, widest_start, widest_end)
+            missing = [name for name in indices if name not in closes.columns]
+
+        for timeframe, (start_date, end_date) in windows.items():
+            if missing:
+                comparison_results[timeframe] = {'period': timeframe, 'error': f'Data unavailable for {", ".join(missing)}'}
+                continue
+
+            start, end = bounds[timeframe]
+            window = closes.loc[start:end].dropna()
+            if len(window) < 2:
+                comparison_results[timeframe] = {'period': timeframe, 'error': 'Insufficient data points for analysis'}
+                continue
+
+            comparison_results[timeframe] = {
+                'period': timeframe,
+                'start_date': start_date,
+                'end_date': end_date,
+                **self._window_metrics(window, benchmark, pair)
+            }
+
+        return {timeframe: comparison_results[timeframe] for timeframe in timeframes}
+
+    @staticmethod
+    def _window_metrics(window: pd.DataFrame, benchmark: str, pair: Optional[tuple] = None) -> Dict:
+        first, last = window.iloc[0], window.iloc[-1]
+        returns = (last / first - 1) * 100
+        volatility = window.pct_change().std() * 100
+        max_drawdown = (window / window.cummax() - 1).min() * 100
+        relative_strength = ((1 + returns / 100) / (1 + returns[benchmark] / 100) - 1) * 100
+
+        metrics = {}
+        for name in window.columns:
+            metrics[f'{name}_return'] = round(float(returns[name]), 2)
+        if pair is not None:
+            metrics['outperformance'] = round(float(returns[pair[1]] - returns[pair[0]]), 2)
+        for name in window.columns:
+            metrics[f'{name}_volatility'] = round(float(volatility[name]), 2)
+            metrics[f'{name}_max_drawdown'] = round(float(max_drawdown[name]), 2)
+            if name != benchmark:
+                metrics[f'{name}_relative_strength'] = round(float(relative_strength[name]), 2)
+        for name in window.columns:
+            metrics[f'{name}_start'] = float(first[name])
+            metrics[f'{name}_end'] = float(last[name])
+        metrics['data_points'] = len(window)
+        return metrics
 
     def _freq_selection(self, df, frequency):
         if df is None:
@@ -351,14 +441,11 @@ class NiftyIndicesTracker:
         if df is None:
             return None
 
-        data_dict = {}
         processed_df = self._freq_selection(df, frequency)
         if processed_df is None:
             return None
 
-        for i, row in processed_df.iterrows():
-            data_dict[row['Date'].strftime('%d-%b-%Y')] = row['Close']
-        return data_dict
+        return dict(zip(processed_df['Date'].dt.strftime('%d-%b-%Y'), processed_df['Close'].tolist()))
 
 if __name__ == "__main__":
     tracker = NiftyIndicesTracker()
@@ -1,8 +1,13 @@
+import sys
 import requests
+import httpx
 import json 
 import os
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from connectors.http_transport import get_session, arequest
+
 class JinaSearchTool:
     def __init__(self, api_key):
         self.api_key = api_key
@@ -11,18 +16,21 @@ class JinaSearchTool:
     def _format_query(self, query):
         return query.replace(" ", "+")
 
-    def search(self, query):
-        headers = {
+    def _headers(self):
+        return {
             'Accept': 'application/json',
             'Authorization': f'Bearer {self.api_key}',
             'X-Engine': 'browser',
             'X-Retain-Images': 'none'
         }
+
+    def search(self, query):
+        headers = self._headers()
         url = self.base_url.format(query=self._format_query(query))
         print(url)
 
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = get_session().get(url, headers=headers)
             response.raise_for_status()
             return self._format_results(response.json())
         except requests.exceptions.RequestException as e:
@@ -32,6 +40,22 @@ class JinaSearchTool:
             print(f"Jina API error: {e}")
             return []
     
+    async def asearch(self, query):
+        """Non-blocking search() for event-loop callers"""
+        url = self.base_url.format(query=self._format_query(query))
+        print(url)
+
+        try:
+            response = await arequest("GET", url, headers=self._headers())
+            response.raise_for_status()
+            return self._format_results(response.json())
+        except httpx.HTTPError as e:
+            print(f"Jina API request failed: {e}")
+            return []
+        except Exception as e:
+            print(f"Jina API error: {e}")
+            return []
+
     def _format_results(self, results):
         response_json = []
         # Handle case where results is None or doesn't have expected structure
@@ -1,33 +1,47 @@
 import sys
 import os
+import asyncio
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.vector_db_utils import ChromaDB
 from utils.gemini_embedding import GeminiEmbedding
 
 class DataRetriever:
-    def __init__(self, summary_collection_name, chunk_collection_name, gemini_api_key):
+    def __init__(self, summary_collection_name, chunk_collection_name, gemini_api_key, rate_limiter=None):
         self.summary_collection_name = summary_collection_name
         self.chunk_collection_name = chunk_collection_name
         self.summary_collection = ChromaDB(summary_collection_name)
         self.chunk_collection = ChromaDB(chunk_collection_name)
-        self.gemini_embedding = GeminiEmbedding(gemini_api_key)
+        self.gemini_embedding = GeminiEmbedding(gemini_api_key, rate_limiter=rate_limiter)
 
     
-    def retrieve_docs(self, query, doc_count=5):
-        query_embedding = self.gemini_embedding.embed(query,task_type="RETRIEVAL_QUERY")
+    def embed_query(self, query):
+        return self.gemini_embedding.embed(query, task_type="RETRIEVAL_QUERY")
+
+    def retrieve_docs(self, query, doc_count=5, query_embedding=None):
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
         retrieved_docs = self.summary_collection.search_by_embedding(query_embedding, n_results=doc_count)
         return [doc["source"] for doc in retrieved_docs["metadatas"][0]]
         
-    def retrieve_chunks(self, query, doc_list, chunk_count=15):
-        query_embedding = self.gemini_embedding.embed(query,task_type="RETRIEVAL_QUERY")
+    def retrieve_chunks(self, query, doc_list, chunk_count=15, query_embedding=None):
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
         retrieved_chunks = self.chunk_collection.search_by_embedding(query_embedding, n_results=chunk_count, filter_param={"source": {"$in": doc_list}})
         return retrieved_chunks["documents"][0]
     
     def retrieve(self, query, chunk_count=5, doc_count=3):
-        docs = self.retrieve_docs(query, doc_count)
-        chunks = self.retrieve_chunks(query, docs, chunk_count)
+        # Embed once and reuse the vector for both stages
+        query_embedding = self.embed_query(query)
+        docs = self.retrieve_docs(query, doc_count, query_embedding=query_embedding)
+        chunks = self.retrieve_chunks(query, docs, chunk_count, query_embedding=query_embedding)
         return chunks
 
+    async def aretrieve(self, query, chunk_count=5, doc_count=3):
+        """Async retrieve(): the embedding call is awaited, Chroma lookups run off the event loop"""
+        query_embedding = await self.gemini_embedding.aembed(query, task_type="RETRIEVAL_QUERY")
+        docs = await asyncio.to_thread(self.retrieve_docs, query, doc_count, query_embedding=query_embedding)
+        return await asyncio.to_thread(self.retrieve_chunks, query, docs, chunk_count, query_embedding=query_embedding)
+
 if __name__ == "__main__":
     from dotenv import load_dotenv
     load_dotenv()
@@ -0,0 +1,77 @@
+"""
+Local cache of raw Trendlyne fundamentals, one gzip-compressed JSON file per stock id.
+
+Quarterly and annual numbers only change when a company reports, so an entry stays
+valid until the financial quarter changes or its TTL runs out. The TTL is short
+during results season, when new numbers can appear any day, and long otherwise.
+"""
+
+import os
+import gzip
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from date_utils import get_current_financial_context, is_results_season
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "cache" / "trendlyne"
+DEFAULT_TTL = timedelta(days=7)
+DEFAULT_RESULTS_SEASON_TTL = timedelta(hours=12)
+
+
+class FundamentalsCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl: timedelta = DEFAULT_TTL, results_season_ttl: timedelta = DEFAULT_RESULTS_SEASON_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.results_season_ttl = results_season_ttl
+        self._lock = threading.Lock()
+
+    def _path(self, stock_id) -> Path:
+        return self.cache_dir / f"{int(stock_id)}.json.gz"
+
+    def is_fresh(self, fetched_at: datetime, now: Optional[datetime] = None) -> bool:
+        """Whether data fetched at fetched_at can still be served at now"""
+        context = get_current_financial_context(now)
+        # A new quarter means new results may have been published since the fetch
+        if get_current_financial_context(fetched_at)["quarter_full"] != context["quarter_full"]:
+            return False
+        ttl = self.results_season_ttl if is_results_season(context) else self.ttl
+        return context["current_date"] - fetched_at < ttl
+
+    def get(self, stock_id) -> Optional[dict]:
+        """Cached fundamentals JSON for stock_id, or None when missing or stale"""
+        path = self._path(stock_id)
+        try:
+            fetched_at = datetime.fromtimestamp(path.stat().st_mtime)
+        except FileNotFoundError:
+            return None
+        if not self.is_fresh(fetched_at):
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable Trendlyne cache entry {path}: {e}")
+            self.invalidate(stock_id)
+            return None
+
+    def put(self, stock_id, fundamentals_data: dict):
+        path = self._path(stock_id)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(fundamentals_data, f, separators=(',', ':'))
+        # Readers never see a half-written file
+        with self._lock:
+            os.replace(tmp_path, path)
+
+    def invalidate(self, stock_id):
+        try:
+            self._path(stock_id).unlink()
+        except FileNotFoundError:
+            pass
@@ -1,16 +1,36 @@
 import sys
 import os
+import re
 import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
 import requests
-import copy
+import pandas as pd
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.trendlyne_company_token_extractor import TrendlyneCompanyTokenExtractor
+from connectors.http_transport import get_session, host_slot
+from connectors.trendlyne_cache import FundamentalsCache
+from connectors import trendlyne_frames, trendlyne_views
+from connectors.trendlyne_views import FundamentalsView
+
+FUNDAMENTALS_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://trendlyne.com/',
+    'Origin': 'https://trendlyne.com'
+}
+# Statuses Trendlyne returns for an expired or wrong token
+TOKEN_REJECTED_STATUSES = (401, 403, 404)
 
 class TrendlyneConnector:
-    def __init__(self):
+    def __init__(self, cache=None, use_cache=True):
         self.company_token_extractor = TrendlyneCompanyTokenExtractor()
         self.base_url = "https://trendlyne.com/fundamentals/get-fundamental_results-v2/"
+        # Raw fundamentals per stock id, kept until the quarter changes or the TTL expires
+        self.cache = (cache or FundamentalsCache()) if use_cache else None
 
     def _get_company_fundamentals(self, stock_id=None, company_name=None):
         if not stock_id and not company_name:
@@ -22,6 +42,11 @@ class TrendlyneConnector:
                 return None
             matched_name, stock_id = company_match
         
+        if self.cache is not None:
+            cached = self.cache.get(stock_id)
+            if cached is not None:
+                return cached
+        
         # Try cached token first
         company_token = self.company_token_extractor.get_company_token(stock_id, fetch_new=False)
         if not company_token:
@@ -29,113 +54,100 @@ class TrendlyneConnector:
             if not company_token:
                 return None
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://trendlyne.com/',
-            'Origin': 'https://trendlyne.com'
-        }
-        
         # Try request with cached token
-        url = f"{self.base_url}{stock_id}/{company_token}/"
-        response = requests.get(url, headers=headers, timeout=30)
+        response = self._request_fundamentals(stock_id, company_token)
         
         # If cached token fails (403/401), try with fresh token
-        if response.status_code in [401, 403, 404]:
+        if response.status_code in TOKEN_REJECTED_STATUSES:
             company_token = self.company_token_extractor.get_company_token(stock_id, fetch_new=True)
             if company_token:
-                url = f"{self.base_url}{stock_id}/{company_token}/"
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self._request_fundamentals(stock_id, company_token)
         
-        return response.json() if response.status_code == 200 else None
+        if response.status_code != 200:
+            return None
+        fundamentals_data = response.json()
+        if self.cache is not None:
+            self.cache.put(stock_id, fundamentals_data)
+        return fundamentals_data
+
+    def _request_fundamentals(self, stock_id, company_token):
+        url = f"{self.base_url}{stock_id}/{company_token}/"
+        with host_slot(url):
+            return get_session().get(url, headers=FUNDAMENTALS_HEADERS)
+
+    def _fetch_or_none(self, stock_id, company_token):
+        try:
+            return self._request_fundamentals(stock_id, company_token)
+        except requests.exceptions.RequestException as e:
+            print(f"Request error for stock {stock_id}: {e}")
+            return None
+
+    def resolve_stock_ids(self, stock_ids=None, company_names=None) -> List[int]:
+        """Stock ids for the given ids and company names, in order and without duplicates"""
+        resolved = [int(stock_id) for stock_id in stock_ids or []]
+        for company_name in company_names or []:
+            company_match = self.company_token_extractor.get_company_id(company_name)
+            if company_match:
+                resolved.append(company_match[1])
+        return list(dict.fromkeys(resolved))
+
+    def fetch_fundamentals_many(self, stock_ids, max_workers=8) -> Dict[int, Optional[dict]]:
+        """
+        Raw fundamentals for several stocks. Stocks in the response cache are served
+        from it; for the rest, missing tokens are scraped in parallel up front,
+        requests run concurrently (at most max_per_host at a time against
+        trendlyne.com), and stocks whose token was rejected are refreshed together and
+        retried once.
+
+        Returns:
+            {stock_id: fundamentals JSON, or None when it could not be fetched}
+        """
+        stock_ids = list(dict.fromkeys(int(stock_id) for stock_id in stock_ids))
+        results = {stock_id: self.cache.get(stock_id) if self.cache is not None else None for stock_id in stock_ids}
+        to_fetch = [stock_id for stock_id, data in results.items() if data is None]
+        if not to_fetch:
+            return results
+        extractor = self.company_token_extractor
+
+        tokens = {stock_id: extractor.get_company_token(stock_id, fetch_new=False) for stock_id in to_fetch}
+        missing = [stock_id for stock_id, token in tokens.items() if not token]
+        if missing:
+            tokens.update(extractor.refresh_tokens(missing, max_workers=max_workers))
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_fetch))), thread_name_prefix="trendlyne-fetch") as executor:
+            def fetch_all(ids):
+                return dict(zip(ids, executor.map(lambda stock_id: self._fetch_or_none(stock_id, tokens[stock_id]), ids)))
+
+            responses = fetch_all([stock_id for stock_id in to_fetch if tokens.get(stock_id)])
+            rejected = [stock_id for stock_id, response in responses.items() if response is not None and response.status_code in TOKEN_REJECTED_STATUSES]
+            if rejected:
+                refreshed = extractor.refresh_tokens(rejected, max_workers=max_workers)
+                tokens.update(refreshed)
+                responses.update(fetch_all(list(refreshed)))
+
+        for stock_id, response in responses.items():
+            if response is not None and response.status_code == 200:
+                results[stock_id] = response.json()
+                if self.cache is not None:
+                    self.cache.put(stock_id, results[stock_id])
+        return results
 
     def _get_quarterly_financials(self, fundamentals_data, type="standalone"):
         #type = consolidated, standalone
-        if type == "consolidated":
-            data = fundamentals_data.get("body", {}).get("quarterlyDataDump", {}).get("consolidated", {})
-            data_dict = {}
-            for k, v in data.items():
-                # Create a deep copy to avoid modifying original data
-                v_copy = copy.deepcopy(v)
-                v_copy.pop("earnings_transcripts", None)
-                v_copy.pop("results_pdf", None)
-                v_copy.pop("ai_summary", None)
-                v_copy.pop("result_notes", None)
-                data_dict[k] = v_copy
-            return data_dict
-        elif type == "standalone":
-            data = fundamentals_data.get("body", {}).get("quarterlyDataDump", {}).get("standalone", {})
-            data_dict = {}
-            for k, v in data.items():
-                # Create a deep copy to avoid modifying original data
-                v_copy = copy.deepcopy(v)
-                v_copy.pop("earnings_transcripts", None)
-                v_copy.pop("results_pdf", None)
-                v_copy.pop("ai_summary", None)
-                v_copy.pop("result_notes", None)
-                data_dict[k] = v_copy
-            return data_dict
-        else:
-            raise ValueError("Invalid type")
+        return trendlyne_views.quarterly_financials(fundamentals_data, type)
     
     def _get_annual_financials(self, fundamentals_data, type="standalone"):
         #type = consolidated, standalone
-        if type == "consolidated":
-            data = fundamentals_data.get("body", {}).get("annualDataDump", {}).get("consolidated", {})
-            data_dict = {}
-            for k, v in data.items():
-                # Create a deep copy to avoid modifying original data
-                v_copy = copy.deepcopy(v)
-                v_copy.pop("result_notes", None)
-                v_copy.pop("Annual_Reports", None)
-                data_dict[k] = v_copy
-            return data_dict
-        elif type == "standalone":
-            data = fundamentals_data.get("body", {}).get("annualDataDump", {}).get("standalone", {})
-            data_dict = {}
-            for k, v in data.items():
-                # Create a deep copy to avoid modifying original data
-                v_copy = copy.deepcopy(v)
-                v_copy.pop("result_notes", None)
-                v_copy.pop("Annual_Reports", None)
-                data_dict[k] = v_copy
-            return data_dict
-        else:
-            raise ValueError("Invalid type")
+        return trendlyne_views.annual_financials(fundamentals_data, type)
     
     def _get_earnings_transcripts(self, fundamentals_data):
-        quarterly_data = fundamentals_data.get("body", {}).get("quarterlyDataDump", {}).get("standalone", {})
-        transcript_dict = {}
-        for k, v in quarterly_data.items():
-            earnings_transcripts = v.get("earnings_transcripts", {})
-            values = earnings_transcripts.get("values", [])
-            url = values[0].get("url", None) if values else None
-            transcript_dict[k] = url
-        return transcript_dict
+        return trendlyne_views.earnings_transcripts(fundamentals_data)
     
     def _get_annual_reports(self, fundamentals_data):
-        annual_data = fundamentals_data.get("body", {}).get("annualDataDump", {}).get("standalone", {})
-        report_dict = {}
-        for k, v in annual_data.items():
-            annual_reports = v.get("Annual_Reports", {})
-            document_url = annual_reports.get("document_url", None)
-            report_dict[k] = document_url
-        return report_dict
+        return trendlyne_views.annual_reports(fundamentals_data)
     
     def _get_peer_companies(self, fundamentals_data):
-        peer_data = fundamentals_data.get("body", {}).get("pr", {}).get("table_data", [])
-        peer_dict = {}
-        for company in peer_data:
-            # Create a deep copy to avoid modifying original data
-            company_data = copy.deepcopy(company)
-            stock_info = company.get("Stock", {})
-            company_data["leader_flag"] = stock_info.get("leader_flag", None)
-            company_data.pop("Stock", None)
-            company_data.pop("Stock Compare", None)
-            order_by = stock_info.get("order_by", f"company_{len(peer_dict)}")
-            peer_dict[order_by] = company_data
-        return peer_dict
+        return trendlyne_views.peer_companies(fundamentals_data)
     
     def get_info(self, stock_id=None, company_name=None, args=[]):
         """
@@ -156,29 +168,72 @@ class TrendlyneConnector:
             dict
         """
         fundamentals_data = self._get_company_fundamentals(stock_id, company_name)
-        if "peer_companies" in args:
-            peer_companies = self._get_peer_companies(fundamentals_data)
-        if "quarterly_financials_consolidated" in args:
-            quarterly_financials_consolidated = self._get_quarterly_financials(fundamentals_data, type="consolidated")
-        if "annual_financials_consolidated" in args:
-            annual_financials_consolidated = self._get_annual_financials(fundamentals_data, type="consolidated")
-        if "quarterly_financials_standalone" in args:
-            quarterly_financials_standalone = self._get_quarterly_financials(fundamentals_data, type="standalone")
-        if "annual_financials_standalone" in args:
-            annual_financials_standalone = self._get_annual_financials(fundamentals_data, type="standalone")
-        if "earnings_transcripts" in args:
-            earnings_transcripts = self._get_earnings_transcripts(fundamentals_data)
-        if "annual_reports" in args:
-            annual_reports = self._get_annual_reports(fundamentals_data)
-        return {
-            "peer_companies": peer_companies if "peer_companies" in args else None,
-            "quarterly_financials_consolidated": quarterly_financials_consolidated if "quarterly_financials_consolidated" in args else None,
-            "quarterly_financials_standalone": quarterly_financials_standalone if "quarterly_financials_standalone" in args else None,
-            "annual_financials_consolidated": annual_financials_consolidated if "annual_financials_consolidated" in args else None,
-            "annual_financials_standalone": annual_financials_standalone if "annual_financials_standalone" in args else None,
-            "earnings_transcripts": earnings_transcripts if "earnings_transcripts" in args else None,
-            "annual_reports": annual_reports if "annual_reports" in args else None
-        }
+        return self._build_info(fundamentals_data, args)
+
+    def get_info_bulk(self, stock_ids=None, company_names=None, args=[], include_peers=False, max_workers=8) -> Dict[int, Optional[FundamentalsView]]:
+        """
+        get_info for many companies at once, e.g. a whole sector.
+
+        Args:
+            stock_ids: list of int
+            company_names: list of str, resolved through the company index
+            args: same section names as get_info
+            include_peers: also fetch every company listed in the peer tables of the requested ones
+            max_workers: fetches in flight at once (still capped per host by the HTTP transport)
+        Returns:
+            {stock_id: FundamentalsView, or None when the fundamentals could not be fetched}.
+            A view reads like the get_info dict but builds each section on first access;
+            call to_dict() to serialize it.
+        """
+        fundamentals = self._fetch_with_peers(stock_ids, company_names, include_peers, max_workers)
+        return {stock_id: FundamentalsView(data, args) if data else None for stock_id, data in fundamentals.items()}
+
+    def get_financials_frame(self, stock_ids=None, company_names=None, periodicities=("quarterly", "annual"), statements=("consolidated", "standalone"), include_peers=False, derived=True, max_workers=8) -> pd.DataFrame:
+        """
+        Quarterly/annual financials of one or many companies as one long DataFrame
+        (stock_id x periodicity x statement x period x metric), e.g. for sector-wide
+        groupbys or compact prompt tables. Use trendlyne_frames.to_arrow for Arrow.
+
+        Args:
+            stock_ids: list of int
+            company_names: list of str, resolved through the company index
+            periodicities: "quarterly" and/or "annual"
+            statements: "consolidated" and/or "standalone"
+            include_peers: also include every company listed in the peer tables
+            derived: add qoq_growth, yoy_growth and margin columns
+            max_workers: fetches in flight at once
+        Returns:
+            DataFrame with trendlyne_frames.FRAME_COLUMNS (plus the derived columns)
+        """
+        fundamentals = self._fetch_with_peers(stock_ids, company_names, include_peers, max_workers)
+        df = trendlyne_frames.financials_frame(fundamentals, periodicities, statements)
+        if derived:
+            df = trendlyne_frames.add_margins(trendlyne_frames.add_growth(df))
+        return df
+
+    def _fetch_with_peers(self, stock_ids, company_names, include_peers, max_workers) -> Dict[int, Optional[dict]]:
+        fundamentals = self.fetch_fundamentals_many(self.resolve_stock_ids(stock_ids, company_names), max_workers=max_workers)
+        if include_peers:
+            peer_ids = [
+                peer_id
+                for data in list(fundamentals.values()) if data
+                for peer_id in self._get_peer_stock_ids(data)
+                if peer_id not in fundamentals
+            ]
+            fundamentals.update(self.fetch_fundamentals_many(peer_ids, max_workers=max_workers))
+        return fundamentals
+
+    def _get_peer_stock_ids(self, fundamentals_data) -> List[int]:
+        """Stock ids of the peer table rows, read from the equity links in their Stock cells"""
+        peer_ids = []
+        for company in fundamentals_data.get("body", {}).get("pr", {}).get("table_data", []):
+            match = re.search(r"/equity/(\d+)/", json.dumps(company.get("Stock", {})))
+            if match:
+                peer_ids.append(int(match.group(1)))
+        return list(dict.fromkeys(peer_ids))
+
+    def _build_info(self, fundamentals_data, args):
+        return FundamentalsView(fundamentals_data, args).to_dict()
 
 if __name__ == "__main__": 
     connector = TrendlyneConnector()
@@ -0,0 +1,182 @@
+"""
+Tabular view of Trendlyne quarterly and annual financials.
+
+financials_frame flattens the quarterlyDataDump/annualDataDump sections of one or
+many fundamentals payloads into a long DataFrame (company x period x metric), so
+growth, margins and sector-wide aggregates are groupby/vector operations instead
+of loops over nested dicts. to_arrow hands the same table to Arrow consumers when
+pyarrow is installed.
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from connectors.trendlyne_views import ANNUAL_DROP_KEYS, QUARTERLY_DROP_KEYS
+
+PERIODICITIES = {"quarterly": ("quarterlyDataDump", QUARTERLY_DROP_KEYS), "annual": ("annualDataDump", ANNUAL_DROP_KEYS)}
+STATEMENTS = ("consolidated", "standalone")
+
+# Growth rates, ratios and per-share lines reuse the names of the lines they describe
+DERIVED_METRIC_PATTERN = re.compile(r"%|growth|ratio|margin|change|\byoy\b|\bqoq\b|per share|\beps\b", re.IGNORECASE)
+# Revenue line per company/statement when none is named, most specific first
+REVENUE_PATTERNS = (
+    re.compile(r"^total revenue", re.IGNORECASE),
+    re.compile(r"revenue from operations", re.IGNORECASE),
+    re.compile(r"^(net )?revenue\b", re.IGNORECASE),
+    re.compile(r"net sales", re.IGNORECASE),
+    re.compile(r"revenue|sales|total income", re.IGNORECASE),
+)
+# Profit lines that get a margin when none are named
+PROFIT_PATTERN = re.compile(r"profit|ebitda|ebit\b|\bpat\b|net income", re.IGNORECASE)
+
+FRAME_COLUMNS = ["stock_id", "periodicity", "statement", "period", "period_end", "period_index", "metric", "value"]
+SERIES_KEYS = ["stock_id", "periodicity", "statement", "metric"]
+
+
+def _metric_value(value):
+    """Trendlyne cells are numbers, numeric strings or {"value": ...} dicts"""
+    if isinstance(value, dict):
+        value = value.get("value")
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, str):
+        return value.replace(",", "").replace("%", "").strip() or None
+    return value if isinstance(value, (int, float)) else None
+
+
+def financials_frame(fundamentals: Dict[int, Optional[dict]], periodicities: Iterable[str] = ("quarterly", "annual"), statements: Iterable[str] = STATEMENTS) -> pd.DataFrame:
+    """
+    Long table of numeric metrics for every company, period and statement type.
+
+    Args:
+        fundamentals: {stock_id: raw fundamentals JSON}; None entries are skipped
+        periodicities: "quarterly" and/or "annual"
+        statements: "consolidated" and/or "standalone"
+
+    Returns:
+        DataFrame with FRAME_COLUMNS. period_end is the parsed period label (NaT when it
+        doesn't parse) and period_index orders a company's periods oldest first.
+    """
+    records = {column: [] for column in ("stock_id", "periodicity", "statement", "period", "metric", "value")}
+    for stock_id, data in fundamentals.items():
+        if not data:
+            continue
+        body = data.get("body", {})
+        for periodicity in periodicities:
+            dump, drop = PERIODICITIES[periodicity]
+            for statement in statements:
+                for period, row in body.get(dump, {}).get(statement, {}).items():
+                    for metric, cell in row.items():
+                        if metric in drop:
+                            continue
+                        value = _metric_value(cell)
+                        if value is None:
+                            continue
+                        records["stock_id"].append(int(stock_id))
+                        records["periodicity"].append(periodicity)
+                        records["statement"].append(statement)
+                        records["period"].append(str(period))
+                        records["metric"].append(metric)
+                        records["value"].append(value)
+
+    df = pd.DataFrame(records)
+    df["stock_id"] = df["stock_id"].astype("int64")
+    df["value"] = pd.to_numeric(df["value"], errors="coerce").astype("float64")
+    df = df.dropna(subset=["value"])
+    df["period_end"] = pd.to_datetime(df["period"], errors="coerce", format="mixed")
+
+    # Oldest period first; labels that don't parse as dates keep the payload's order
+    periods = df[["stock_id", "periodicity", "statement", "period", "period_end"]].drop_duplicates(subset=["stock_id", "periodicity", "statement", "period"])
+    periods = periods.assign(first_seen=np.arange(len(periods))).sort_values(["period_end", "first_seen"], na_position="first", kind="stable")
+    periods["period_index"] = periods.groupby(["stock_id", "periodicity", "statement"]).cumcount()
+    df = df.merge(periods[["stock_id", "periodicity", "statement", "period", "period_index"]], on=["stock_id", "periodicity", "statement", "period"])
+
+    for column in ("periodicity", "statement", "metric"):
+        df[column] = df[column].astype("category")
+    return df[FRAME_COLUMNS].sort_values(SERIES_KEYS + ["period_index"], kind="stable").reset_index(drop=True)
+
+
+def _value_months_back(df: pd.DataFrame, months: pd.Series, offset: int) -> np.ndarray:
+    """Each row's value in the same series offset months earlier; NaN when that period is absent"""
+    known = df[SERIES_KEYS].assign(month=months, value=df["value"]).dropna(subset=["month"])
+    known = known.drop_duplicates(subset=SERIES_KEYS + ["month"])
+    wanted = df[SERIES_KEYS].assign(month=months - offset)
+    return wanted.merge(known, on=SERIES_KEYS + ["month"], how="left")["value"].to_numpy()
+
+
+def add_growth(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add qoq_growth and yoy_growth (percent) per company/statement/metric series.
+    Periods are matched by calendar month, so a missing quarter gives NaN instead
+    of comparing with the wrong one. Quarterly rows compare with 3 and 12 months
+    earlier; annual rows have yoy_growth only. Unparsed period labels get NaN.
+    """
+    df = df.sort_values(SERIES_KEYS + ["period_index"], kind="stable").reset_index(drop=True)
+    months = df["period_end"].dt.to_period("M")
+    quarter_ago = _value_months_back(df, months, 3)
+    year_ago = _value_months_back(df, months, 12)
+    quarterly = (df["periodicity"] == "quarterly").to_numpy()
+    values = df["value"].to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sequential = (values - quarter_ago) / np.abs(quarter_ago) * 100
+        yearly = (values - year_ago) / np.abs(year_ago) * 100
+    df["qoq_growth"] = np.where(quarterly, sequential, np.nan)
+    df["yoy_growth"] = yearly
+    df[["qoq_growth", "yoy_growth"]] = df[["qoq_growth", "yoy_growth"]].replace([np.inf, -np.inf], np.nan)
+    return df
+
+
+def _revenue_rank(metric: str) -> Optional[int]:
+    if DERIVED_METRIC_PATTERN.search(metric):
+        return None
+    return next((rank for rank, pattern in enumerate(REVENUE_PATTERNS) if pattern.search(metric)), None)
+
+
+def add_margins(df: pd.DataFrame, revenue_metric: Optional[str] = None, profit_metrics: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Add margin (percent of revenue in the same company/statement/period) for profit
+    lines. Without revenue_metric, each company/statement uses its best match in
+    REVENUE_PATTERNS; without profit_metrics, lines matching PROFIT_PATTERN get
+    margins. Growth, ratio and % lines are never revenue or profit.
+    """
+    group_keys = ["stock_id", "periodicity", "statement"]
+    df = df.copy()
+    df["margin"] = np.nan
+    metric_names = df["metric"].astype(str)
+    if profit_metrics is None:
+        profit_metrics = [metric for metric in metric_names.unique() if PROFIT_PATTERN.search(metric) and not DERIVED_METRIC_PATTERN.search(metric)]
+
+    lines = df[group_keys].assign(metric=metric_names)
+    if revenue_metric is None:
+        ranks = {metric: _revenue_rank(metric) for metric in metric_names.unique()}
+        candidates = lines.drop_duplicates().assign(rank=lambda frame: frame["metric"].map(ranks)).dropna(subset=["rank"])
+        chosen = candidates.sort_values("rank", kind="stable").drop_duplicates(subset=group_keys)[group_keys + ["metric"]]
+    else:
+        chosen = lines[group_keys].drop_duplicates().assign(metric=revenue_metric)
+    if chosen.empty:
+        return df
+
+    period_keys = group_keys + ["period"]
+    revenue = (
+        lines.assign(period=df["period"], revenue=df["value"])
+        .merge(chosen, on=group_keys + ["metric"])[period_keys + ["revenue"]]
+        .drop_duplicates(subset=period_keys)
+    )
+    revenue = df[period_keys].merge(revenue, on=period_keys, how="left")["revenue"].to_numpy()
+    has_margin = metric_names.isin(list(profit_metrics)).to_numpy() & (revenue != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["margin"] = np.where(has_margin, df["value"].to_numpy() / revenue * 100, np.nan)
+    return df
+
+
+def to_arrow(df: pd.DataFrame):
+    """The frame as a pyarrow.Table (pyarrow is optional)"""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("to_arrow needs pyarrow: pip install pyarrow") from e
+    return pa.Table.from_pandas(df, preserve_index=False)
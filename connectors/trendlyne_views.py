@@ -0,0 +1,118 @@
+"""
+Projections of the Trendlyne fundamentals payload into the sections get_info returns.
+
+Rows are key-filtered shallow copies: the dropped keys (transcripts, PDFs, notes)
+are skipped and every kept value is shared with the payload rather than deep-copied.
+FundamentalsView builds each section on first access, so callers holding many
+companies only pay for the sections they read.
+"""
+
+from collections.abc import Mapping
+from typing import Iterable, Optional
+
+QUARTERLY_DROP_KEYS = frozenset({"earnings_transcripts", "results_pdf", "ai_summary", "result_notes"})
+ANNUAL_DROP_KEYS = frozenset({"result_notes", "Annual_Reports"})
+PEER_DROP_KEYS = frozenset({"Stock", "Stock Compare"})
+
+SECTIONS = (
+    "peer_companies",
+    "quarterly_financials_consolidated",
+    "quarterly_financials_standalone",
+    "annual_financials_consolidated",
+    "annual_financials_standalone",
+    "earnings_transcripts",
+    "annual_reports",
+)
+
+
+def project(row: dict, drop: frozenset) -> dict:
+    """row without the drop keys; nested values are shared, not copied"""
+    return {key: value for key, value in row.items() if key not in drop}
+
+
+def _dump(fundamentals_data: dict, dump: str, type: str) -> dict:
+    return fundamentals_data.get("body", {}).get(dump, {}).get(type, {})
+
+
+def quarterly_financials(fundamentals_data: dict, type: str = "standalone") -> dict:
+    if type not in ("consolidated", "standalone"):
+        raise ValueError("Invalid type")
+    return {period: project(row, QUARTERLY_DROP_KEYS) for period, row in _dump(fundamentals_data, "quarterlyDataDump", type).items()}
+
+
+def annual_financials(fundamentals_data: dict, type: str = "standalone") -> dict:
+    if type not in ("consolidated", "standalone"):
+        raise ValueError("Invalid type")
+    return {period: project(row, ANNUAL_DROP_KEYS) for period, row in _dump(fundamentals_data, "annualDataDump", type).items()}
+
+
+def earnings_transcripts(fundamentals_data: dict) -> dict:
+    transcript_dict = {}
+    for period, row in _dump(fundamentals_data, "quarterlyDataDump", "standalone").items():
+        values = row.get("earnings_transcripts", {}).get("values", [])
+        transcript_dict[period] = values[0].get("url", None) if values else None
+    return transcript_dict
+
+
+def annual_reports(fundamentals_data: dict) -> dict:
+    return {
+        period: row.get("Annual_Reports", {}).get("document_url", None)
+        for period, row in _dump(fundamentals_data, "annualDataDump", "standalone").items()
+    }
+
+
+def peer_companies(fundamentals_data: dict) -> dict:
+    peer_dict = {}
+    for company in fundamentals_data.get("body", {}).get("pr", {}).get("table_data", []):
+        stock_info = company.get("Stock", {})
+        company_data = project(company, PEER_DROP_KEYS)
+        company_data["leader_flag"] = stock_info.get("leader_flag", None)
+        order_by = stock_info.get("order_by", f"company_{len(peer_dict)}")
+        peer_dict[order_by] = company_data
+    return peer_dict
+
+
+_BUILDERS = {
+    "peer_companies": peer_companies,
+    "quarterly_financials_consolidated": lambda data: quarterly_financials(data, "consolidated"),
+    "quarterly_financials_standalone": lambda data: quarterly_financials(data, "standalone"),
+    "annual_financials_consolidated": lambda data: annual_financials(data, "consolidated"),
+    "annual_financials_standalone": lambda data: annual_financials(data, "standalone"),
+    "earnings_transcripts": earnings_transcripts,
+    "annual_reports": annual_reports,
+}
+
+
+class FundamentalsView(Mapping):
+    """
+    Read-only get_info-shaped mapping over one fundamentals payload. Sections named
+    in args are built on first access and kept; the others read as None.
+    """
+    __slots__ = ("_data", "_args", "_sections")
+
+    def __init__(self, fundamentals_data: dict, args: Optional[Iterable[str]] = None):
+        self._data = fundamentals_data
+        self._args = frozenset(SECTIONS if args is None else args)
+        self._sections = {}
+
+    def __getitem__(self, section):
+        if section not in _BUILDERS:
+            raise KeyError(section)
+        if section not in self._args:
+            return None
+        if section not in self._sections:
+            self._sections[section] = _BUILDERS[section](self._data)
+        return self._sections[section]
+
+    def __iter__(self):
+        return iter(SECTIONS)
+
+    def __len__(self):
+        return len(SECTIONS)
+
+    def __repr__(self):
+        return f"FundamentalsView(built={sorted(self._sections)}, requested={sorted(self._args)})"
+
+    def to_dict(self) -> dict:
+        """Plain dict with every requested section built, e.g. for json.dump"""
+        return {section: self[section] for section in SECTIONS}
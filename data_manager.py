@@ -1,24 +1,82 @@
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from connectors.indices_tracker import NiftyIndicesTracker
 from connectors.youtube_connector import YouTubeConnector
 from connectors.jina_web_connector import JinaSearchTool
 from connectors.local_docs_connector import DataRetriever
+from routing_cache import RoutingCache
+from query_router import FastPathRouter
+from config import get_service_rate_limiter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import os
 import json
+import time
+import asyncio
+import logging
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 class DataManager:
-    def __init__(self, open_router_api_key, youtube_api_key, jina_api_key, gemini_api_key, summary_collection_name="document_summary", chunk_collection_name="document_chunks"):
+    # Per-tool deadlines in seconds; tools not listed use default_tool_timeout
+    DEFAULT_TOOL_TIMEOUTS = {
+        "RAG": 30,
+        "Indices Tracker": 45,
+        "Index Comparison": 60,
+        "Jina Web Connector": 45,
+        "YouTube Connector": 90,
+    }
+
+    def __init__(self, open_router_api_key, youtube_api_key, jina_api_key, gemini_api_key, summary_collection_name="document_summary", chunk_collection_name="document_chunks", tool_timeouts=None, default_tool_timeout=60, max_workers=16, speculative=True, use_routing_cache=True, use_fast_path=True):
         self.llm_client = OpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=open_router_api_key,
         )
+        # Used by asearch() so router/filter calls never block the event loop
+        self.async_llm_client = AsyncOpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=open_router_api_key,
+        )
         self.indices_connector = NiftyIndicesTracker()
         self.youtube_connector = YouTubeConnector(api_key=youtube_api_key)
         self.jina_connector = JinaSearchTool(api_key=jina_api_key)
-        self.local_docs_connector = DataRetriever(summary_collection_name=summary_collection_name, chunk_collection_name=chunk_collection_name, gemini_api_key=gemini_api_key)
+        self.local_docs_connector = DataRetriever(summary_collection_name=summary_collection_name, chunk_collection_name=chunk_collection_name, gemini_api_key=gemini_api_key, rate_limiter=get_service_rate_limiter("gemini"))
+        # Router/filter calls share the OpenRouter budget with the debate agents
+        self.openrouter_limiter = get_service_rate_limiter("openrouter")
 
-    def _route_query(self, query):
+        # Long-lived pool so a timed-out tool never blocks the caller on shutdown
+        self.tool_timeouts = {**self.DEFAULT_TOOL_TIMEOUTS, **(tool_timeouts or {})}
+        self.default_tool_timeout = default_tool_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-tool")
+        self.last_search_timings = {}
+        # Start always-on tools alongside the router call instead of after it
+        self.speculative = speculative
+
+        # Deterministic keyword/index-name routing for obvious queries; LLM only when unsure
+        self.fast_path_router = FastPathRouter() if use_fast_path else None
+
+        # Router decisions persisted across runs; near-duplicate queries are matched on
+        # the same RETRIEVAL_QUERY embedding RAG computes for the query, and their index
+        # and date args are re-extracted from the current query by the fast-path rules
+        self.routing_cache = RoutingCache(
+            embedder=lambda text: self.local_docs_connector.gemini_embedding.embed(text, task_type="RETRIEVAL_QUERY"),
+            arg_binder=self.fast_path_router.bind_tool_args if self.fast_path_router else None
+        ) if use_routing_cache else None
+
+    def _route_locally(self, query):
+        """Tool selection from the fast path or routing cache, or None if the LLM is needed"""
+        if self.fast_path_router:
+            fast_selection = self.fast_path_router.try_route(query)
+            if fast_selection:
+                return json.dumps(fast_selection)
+
+        if self.routing_cache:
+            cached_selection = self.routing_cache.get(query)
+            if cached_selection:
+                logger.info(f"Routing cache hit for query: {query[:50]}...")
+                return cached_selection
+        return None
+
+    def _router_request(self, query):
         system_prompt = """
         You are given an input question and certain tools to use that can be used to ansewer the question. Your job is to select the appropriate tool to use to answer the question. The answer could be more than one tool.
 
@@ -69,7 +127,7 @@ class DataManager:
         frequency: the frequency to get the value of the index this can take the following values daily, weekly, monthly, quarterly, yearly
 
         Index Comparison:
-        this is a tool to compare performance between two indices (like Nifty 50 vs Nifty IT) across multiple timeframes.
+        this is a tool to compare performance between two indices (like Nifty 50 vs Nifty IT) across multiple timeframes. It returns each index's return, volatility, max drawdown and relative strength against index1.
         Arguments:
         index1: the first index name (e.g., "Nifty 50")
         index2: the second index name (e.g., "Nifty IT")
@@ -77,26 +135,49 @@ class DataManager:
 
         IMPORTANT: Always include RAG for financial sector queries. You can use multiple tools in the same query.
         """
-        
-        response = self.llm_client.chat.completions.create(
-            model="x-ai/grok-4-fast:free",
-            messages=[
+
+        return {
+            "model": "x-ai/grok-4-fast:free",
+            "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": query}
             ],
-            response_format={"type": "json_object"}
-        )
-        
+            "response_format": {"type": "json_object"}
+        }
+
+    def _finish_routing(self, query, response):
         # Check for errors in response
         if hasattr(response, 'error') and response.error:
             raise Exception(f"API Error: {response.error}")
             
         if not response.choices or len(response.choices) == 0:
             raise Exception("No response choices returned from API")
+
+        tool_selection = response.choices[0].message.content
+        if self.routing_cache:
+            self.routing_cache.put(query, tool_selection)
+        return tool_selection
+
+    def _route_query(self, query):
+        local_selection = self._route_locally(query)
+        if local_selection:
+            return local_selection
+
+        self.openrouter_limiter.acquire()
+        response = self.llm_client.chat.completions.create(**self._router_request(query))
+        return self._finish_routing(query, response)
+
+    async def _aroute_query(self, query):
+        # Cache lookups may embed the query, so they run off the event loop
+        local_selection = await asyncio.to_thread(self._route_locally, query)
+        if local_selection:
+            return local_selection
+
+        await self.openrouter_limiter.aacquire()
+        response = await self.async_llm_client.chat.completions.create(**self._router_request(query))
+        return await asyncio.to_thread(self._finish_routing, query, response)
         
-        return response.choices[0].message.content
-        
-    def filter_youtube_videos(self, videos, query):
+    def _youtube_filter_request(self, videos, query):
         system_prompt = """
         you are given a list of youtube videos and a query. you need to filter the videos based on the query.
 
@@ -123,47 +204,233 @@ class DataManager:
             Videos: {videos}
             Query: {query}
         """
-        response = self.llm_client.chat.completions.create(
-            model="x-ai/grok-4-fast:free",
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": input_prompt}],
-            response_format={"type": "json_object"}
-        )
+        return {
+            "model": "x-ai/grok-4-fast:free",
+            "messages": [{"role": "system", "content": system_prompt}, {"role": "user", "content": input_prompt}],
+            "response_format": {"type": "json_object"}
+        }
+
+    def filter_youtube_videos(self, videos, query):
+        self.openrouter_limiter.acquire()
+        response = self.llm_client.chat.completions.create(**self._youtube_filter_request(videos, query))
         result = json.loads(response.choices[0].message.content)
         return result.get("videos", [])
 
-    def search(self, query, tools=None):
-        if tools:
-            tool_selection_json = tools
-        else:
-            tool_selection_json = self._route_query(query)
-        tool_selection = json.loads(tool_selection_json)
-        
-        result = {}
+    async def afilter_youtube_videos(self, videos, query):
+        await self.openrouter_limiter.aacquire()
+        response = await self.async_llm_client.chat.completions.create(**self._youtube_filter_request(videos, query))
+        result = json.loads(response.choices[0].message.content)
+        return result.get("videos", [])
+
+    def _youtube_search(self, query, tool_args):
+        videos = self.youtube_connector.video_search(**tool_args)
+        filtered_videos = self.filter_youtube_videos(videos, query)
+        transcript_dict = {}
+        print(filtered_videos)
+        for video in filtered_videos:
+            transcript_dict[video["title"]] = self.youtube_connector.get_transcript(video["video_id"])
+        return transcript_dict
+
+    async def _ayoutube_search(self, query, tool_args):
+        # googleapiclient and youtube-transcript-api are blocking, so they run in threads;
+        # transcripts are fetched concurrently instead of one by one
+        videos = await asyncio.to_thread(self.youtube_connector.video_search, **tool_args)
+        filtered_videos = await self.afilter_youtube_videos(videos, query)
+        logger.debug(f"Filtered YouTube videos: {filtered_videos}")
+        transcripts = await asyncio.gather(*(
+            asyncio.to_thread(self.youtube_connector.get_transcript, video["video_id"])
+            for video in filtered_videos
+        ))
+        return {video["title"]: transcript for video, transcript in zip(filtered_videos, transcripts)}
+
+    def _build_tool_calls(self, query, tool_selection):
+        """Map the router's tool selection to (result_key, callable) pairs"""
+        tool_calls = []
         for tool_name, tool_config in tool_selection.items():
             tool_args = tool_config.get("tool_args", {})
             tool_name_lower = tool_name.lower().replace(" ", "_")
-            
+
             if tool_name_lower == "indices_tracker":
-                result[tool_name] = self.indices_connector.get_data(**tool_args)
+                tool_calls.append((tool_name, lambda tool_args=tool_args: self.indices_connector.get_data(**tool_args)))
             elif tool_name_lower == "index_comparison":
-                result[tool_name] = self.indices_connector.compare_indices(**tool_args)
+                tool_calls.append((tool_name, lambda tool_args=tool_args: self.indices_connector.compare_indices(**tool_args)))
             elif tool_name_lower == "youtube_connector":
-                videos = self.youtube_connector.video_search(**tool_args)
-                filtered_videos = self.filter_youtube_videos(videos, query)
-                transcript_dict = {}
-                print(filtered_videos)
-                for video in filtered_videos:
-                    transcript_dict[video["title"]] = self.youtube_connector.get_transcript(video["video_id"])
-                result[tool_name] = transcript_dict
+                tool_calls.append((tool_name, lambda tool_args=tool_args: self._youtube_search(query, tool_args)))
             elif tool_name_lower == "jina_web_connector":
-                result[tool_name] = self.jina_connector.search(**tool_args)
+                tool_calls.append((tool_name, lambda tool_args=tool_args: self.jina_connector.search(**tool_args)))
             elif tool_name_lower == "rag":
-                # RAG is handled automatically below, skip here
+                # RAG is always run on the original query, added by search()
                 pass
             else:
                 raise ValueError(f"Invalid tool name: {tool_name}")
-        
-        result["RAG"] = self.local_docs_connector.retrieve(query)
+        return tool_calls
+
+    def _build_async_tool_calls(self, query, tool_selection):
+        """Async counterpart of _build_tool_calls: (result_key, coroutine factory) pairs"""
+        tool_calls = []
+        for tool_name, tool_fn in self._build_tool_calls(query, tool_selection):
+            tool_args = tool_selection[tool_name].get("tool_args", {})
+            tool_name_lower = tool_name.lower().replace(" ", "_")
+
+            if tool_name_lower == "jina_web_connector":
+                tool_calls.append((tool_name, lambda tool_args=tool_args: self.jina_connector.asearch(**tool_args)))
+            elif tool_name_lower == "youtube_connector":
+                tool_calls.append((tool_name, lambda tool_args=tool_args: self._ayoutube_search(query, tool_args)))
+            else:
+                # NSE scraping has no async client; keep the blocking call off the event loop
+                tool_calls.append((tool_name, lambda tool_fn=tool_fn: asyncio.to_thread(tool_fn)))
+        return tool_calls
+
+    def _run_tool(self, tool_fn):
+        start = time.perf_counter()
+        value = tool_fn()
+        return value, time.perf_counter() - start
+
+    def _get_tool_timeout(self, tool_name):
+        return self.tool_timeouts.get(tool_name, self.default_tool_timeout)
+
+    def _collect_tool_results(self, pending):
+        """
+        Wait for dispatched tools, each against its own deadline.
+        pending: list of (tool_name, future, launched_at)
+        Returns (result, timings); slow or failing tools are left out of result.
+        """
+        result = {}
+        timings = {}
+        for tool_name, future, launched_at in pending:
+            remaining = self._get_tool_timeout(tool_name) - (time.perf_counter() - launched_at)
+            try:
+                value, elapsed = future.result(timeout=max(remaining, 0))
+                result[tool_name] = value
+                timings[tool_name] = {"status": "ok", "seconds": round(elapsed, 3)}
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning(f"Tool {tool_name} timed out after {self._get_tool_timeout(tool_name)}s")
+                timings[tool_name] = {"status": "timeout", "seconds": round(time.perf_counter() - launched_at, 3)}
+            except Exception as e:
+                logger.warning(f"Tool {tool_name} failed: {e}")
+                timings[tool_name] = {"status": "error", "seconds": round(time.perf_counter() - launched_at, 3), "error": str(e)}
+        return result, timings
+
+    def _build_always_on_calls(self, query):
+        """Tools that run on every search regardless of what the router selects"""
+        return [("RAG", lambda: self.local_docs_connector.retrieve(query))]
+
+    def _build_async_always_on_calls(self, query):
+        return [("RAG", lambda: self.local_docs_connector.aretrieve(query))]
+
+    async def _arun_tool(self, tool_name, coro_fn):
+        start = time.perf_counter()
+        value = await asyncio.wait_for(coro_fn(), timeout=self._get_tool_timeout(tool_name))
+        return value, time.perf_counter() - start
+
+    def _alaunch(self, tool_calls):
+        return [
+            (tool_name, asyncio.create_task(self._arun_tool(tool_name, coro_fn)), time.perf_counter())
+            for tool_name, coro_fn in tool_calls
+        ]
+
+    async def _acollect_tool_results(self, pending):
+        """Async _collect_tool_results; each task already enforces its own deadline"""
+        result = {}
+        timings = {}
+        for tool_name, task, launched_at in pending:
+            try:
+                value, elapsed = await task
+                result[tool_name] = value
+                timings[tool_name] = {"status": "ok", "seconds": round(elapsed, 3)}
+            except asyncio.TimeoutError:
+                logger.warning(f"Tool {tool_name} timed out after {self._get_tool_timeout(tool_name)}s")
+                timings[tool_name] = {"status": "timeout", "seconds": round(time.perf_counter() - launched_at, 3)}
+            except Exception as e:
+                logger.warning(f"Tool {tool_name} failed: {e}")
+                timings[tool_name] = {"status": "error", "seconds": round(time.perf_counter() - launched_at, 3), "error": str(e)}
+        return result, timings
+
+    def _launch(self, tool_calls):
+        return [
+            (tool_name, self.executor.submit(self._run_tool, tool_fn), time.perf_counter())
+            for tool_name, tool_fn in tool_calls
+        ]
+
+    def search(self, query, tools=None, return_timings=False):
+        """
+        Route the query and dispatch every selected tool, plus RAG, concurrently.
+        In speculative mode the always-on tools (RAG) start before the router call, so
+        the router only decides which extra tools to launch.
+        Tools that fail or exceed their timeout are dropped so partial results still
+        come back. With return_timings=True returns (result, timings), where timings
+        maps each tool to its status and elapsed seconds.
+        """
+        search_start = time.perf_counter()
+        always_on_calls = self._build_always_on_calls(query)
+        speculative_pending = self._launch(always_on_calls) if self.speculative else []
+
+        try:
+            if tools:
+                tool_selection_json = tools
+            else:
+                tool_selection_json = self._route_query(query)
+            tool_selection = json.loads(tool_selection_json)
+            tool_calls = self._build_tool_calls(query, tool_selection)
+        except Exception:
+            # Don't leave speculative retrievals running for a search that failed
+            for _, future, _ in speculative_pending:
+                future.cancel()
+            raise
+        routing_seconds = time.perf_counter() - search_start
+
+        if not self.speculative:
+            tool_calls.extend(always_on_calls)
+        # Routed tools first so the result dict keeps RAG last, as before
+        pending = self._launch(tool_calls) + speculative_pending
+        result, timings = self._collect_tool_results(pending)
+
+        timings["router"] = {"status": "ok", "seconds": round(routing_seconds, 3)}
+        timings["total"] = {"status": "ok", "seconds": round(time.perf_counter() - search_start, 3)}
+        self.last_search_timings = timings
+        logger.info(f"Search completed in {timings['total']['seconds']}s: {timings}")
+
+        if return_timings:
+            return result, timings
+        return result
+
+    async def asearch(self, query, tools=None, return_timings=False):
+        """
+        Async search(): same routing, speculative RAG, per-tool timeouts and result
+        layout, but every tool runs as a task on the caller's event loop so many
+        searches can be in flight without a thread per search.
+        """
+        search_start = time.perf_counter()
+        always_on_calls = self._build_async_always_on_calls(query)
+        speculative_pending = self._alaunch(always_on_calls) if self.speculative else []
+
+        try:
+            if tools:
+                tool_selection_json = tools
+            else:
+                tool_selection_json = await self._aroute_query(query)
+            tool_selection = json.loads(tool_selection_json)
+            tool_calls = self._build_async_tool_calls(query, tool_selection)
+        except Exception:
+            for _, task, _ in speculative_pending:
+                task.cancel()
+            raise
+        routing_seconds = time.perf_counter() - search_start
+
+        if not self.speculative:
+            tool_calls.extend(always_on_calls)
+        # Routed tools first so the result dict keeps RAG last, as in search()
+        pending = self._alaunch(tool_calls) + speculative_pending
+        result, timings = await self._acollect_tool_results(pending)
+
+        timings["router"] = {"status": "ok", "seconds": round(routing_seconds, 3)}
+        timings["total"] = {"status": "ok", "seconds": round(time.perf_counter() - search_start, 3)}
+        self.last_search_timings = timings
+        logger.info(f"Async search completed in {timings['total']['seconds']}s: {timings}")
+
+        if return_timings:
+            return result, timings
         return result
 
 if __name__ == "__main__":
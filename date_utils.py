@@ -3,9 +3,13 @@ Dynamic date and financial year utilities for the dialectical agent system
 """
 
 from datetime import datetime
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 
-def get_current_financial_context() -> Dict[str, Any]:
+# SEBI LODR deadlines: quarterly results within 45 days of quarter end, annual (Q4) results within 60
+RESULTS_SEASON_DAYS = 45
+ANNUAL_RESULTS_SEASON_DAYS = 60
+
+def get_current_financial_context(now: Optional[datetime] = None) -> Dict[str, Any]:
     """
     Get current financial year and quarter context dynamically.
 
@@ -15,10 +19,13 @@ def get_current_financial_context() -> Dict[str, Any]:
     Q3: October - December
     Q4: January - March
 
+    Args:
+        now: Date to describe instead of today (e.g. when a cached result was fetched)
+
     Returns:
         Dict containing current date, FY, quarter, and formatted strings
     """
-    now = datetime.now()
+    now = now or datetime.now()
 
     # Determine financial year
     if now.month >= 4:  # April onwards = current calendar year FY
@@ -64,6 +71,23 @@ def get_current_financial_context() -> Dict[str, Any]:
 
     return context
 
+def is_results_season(current_context: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Whether listed companies may still be reporting results for the quarter that just ended.
+
+    Args:
+        current_context: Output from get_current_financial_context(); defaults to today
+
+    Returns:
+        True within the results deadline after the start of the current quarter
+    """
+    current_context = current_context or get_current_financial_context()
+    now = current_context["current_date"]
+    quarter_start = datetime(now.year, (now.month - 1) // 3 * 3 + 1, 1)
+    # Q1 (April-June) follows Q4, whose results come with the annual accounts
+    deadline = ANNUAL_RESULTS_SEASON_DAYS if current_context["quarter"] == 1 else RESULTS_SEASON_DAYS
+    return (now - quarter_start).days < deadline
+
 def get_previous_quarters(current_context: Dict[str, Any], num_quarters: int = 2) -> list:
     """
     Get previous quarters for reference in queries.
@@ -98,4 +122,5 @@ if __name__ == "__main__":
     for key, value in context.items():
         print(f"  {key}: {value}")
 
-    print(f"\nPrevious quarters: {get_previous_quarters(context, 3)}")
\ No newline at end of file
+    print(f"\nPrevious quarters: {get_previous_quarters(context, 3)}")
+    print(f"Results season: {is_results_season(context)}")
\ No newline at end of file
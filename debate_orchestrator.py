@@ -2,12 +2,12 @@ from typing import Dict, Any, List, Optional, Annotated
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
 import logging
 
-from agents import DebateAgent, SynthesisAgent, DebateMessage
+from agents import DebateAgent, SynthesisAgent, DebateMessage, restore_agent_history
 from config import SystemConfig
 from data_loader import FinancialDataLoader
+from checkpointing import create_checkpointer, new_thread_id
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,7 @@ class DialecticalDebateOrchestrator:
         self.synthesis_agent = SynthesisAgent(config.synthesis_agent, self.data_loader)
 
         # Create the debate graph
-        self.checkpointer = MemorySaver()
+        self.checkpointer = create_checkpointer(config.debate.checkpoint_path)
         self.graph = self._build_graph()
 
         logger.info("Dialectical Debate Orchestrator initialized")
@@ -166,7 +166,9 @@ class DialecticalDebateOrchestrator:
             "is_complete": True
         }
 
-    def run_debate(self, thread_id: str = "debate_thread") -> Dict[str, Any]:
+    def run_debate(self, thread_id: Optional[str] = None) -> Dict[str, Any]:
+        thread_id = thread_id or new_thread_id()
+        logger.info(f"Starting debate thread '{thread_id}'")
         try:
             # Initial state
             initial_state: DebateState = {
@@ -182,25 +184,47 @@ class DialecticalDebateOrchestrator:
             # Run the debate
             config = {"configurable": {"thread_id": thread_id}}
             final_state = self.graph.invoke(initial_state, config)
+            return self._completed_result(final_state)
 
-            logger.info("Debate completed successfully")
+        except Exception as e:
+            return self._error_result(e)
 
-            return {
-                "status": "completed",
-                "debate_messages": final_state["debate_messages"],
-                "synthesis_report": final_state["synthesis_report"],
-                "total_turns": len(final_state["debate_messages"]),
-                "topic": final_state["topic"]
-            }
+    def resume_debate(self, thread_id: str) -> Dict[str, Any]:
+        """Continue a checkpointed debate from its last completed node"""
+        try:
+            config = {"configurable": {"thread_id": thread_id}}
+            snapshot = self.graph.get_state(config)
+            if not snapshot.values:
+                raise ValueError(f"No checkpoint found for thread '{thread_id}'")
+
+            # Agents keep their own history and turn counts in memory; rebuild them from the saved messages
+            restore_agent_history((self.bull_agent, self.bear_agent), snapshot.values["debate_messages"])
+
+            final_state = self.graph.invoke(None, config) if snapshot.next else snapshot.values
+            return self._completed_result(final_state)
 
         except Exception as e:
-            logger.error(f"Error running debate: {e}")
-            return {
-                "status": "error",
-                "error": str(e),
-                "debate_messages": [],
-                "synthesis_report": None
-            }
+            return self._error_result(e)
+
+    def _completed_result(self, final_state: DebateState) -> Dict[str, Any]:
+        logger.info("Debate completed successfully")
+
+        return {
+            "status": "completed",
+            "debate_messages": final_state["debate_messages"],
+            "synthesis_report": final_state["synthesis_report"],
+            "total_turns": len(final_state["debate_messages"]),
+            "topic": final_state["topic"]
+        }
+
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        logger.error(f"Error running debate: {error}")
+        return {
+            "status": "error",
+            "error": str(error),
+            "debate_messages": [],
+            "synthesis_report": None
+        }
 
     def get_debate_summary(self, result: Dict[str, Any]) -> str:
         if result["status"] == "error":
@@ -3,8 +3,10 @@ from pathlib import Path
 from typing import List, Dict, Any
 from langchain_core.documents import Document
 import logging
+import threading
 from dotenv import load_dotenv
 from data_manager import DataManager
+from connectors.trendlyne_connector import TrendlyneConnector
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,13 @@ class IntelligentFinancialDataLoader:
             ]
         }
 
+        # One financial context snapshot per loader, shared by every meta-agent using it
+        self._financial_context = None
+        self._financial_context_lock = threading.Lock()
+
+        # Created on first use; opening the Trendlyne token store is not needed for every run
+        self._trendlyne = None
+
         logger.info("Intelligent data loader initialized with multi-modal connectors")
 
     def get_intelligent_context(self, query_context: str = None) -> str:
@@ -55,87 +64,115 @@ class IntelligentFinancialDataLoader:
         Combines real-time data, historical documents, and web intelligence.
         """
         try:
-            # Build comprehensive query for current IT sector state
-            base_query = "Current state of Indian IT sector, latest quarterly results, AI impact, and recent developments"
-            if query_context:
-                base_query = f"{base_query}. Specific focus: {query_context}"
-
             # Get multi-source data
             logger.info("Fetching multi-source intelligence for IT sector context")
-            result = self.data_manager.search(base_query)
+            result = self.data_manager.search(self._build_base_query(query_context))
+            return self._format_intelligent_context(result)
 
-            context_parts = [
-                "MULTI-SOURCE FINANCIAL INTELLIGENCE:",
-                "=" * 60,
-                f"Domain: {self.sector_context['domain']}",
-                f"Data Sources: {', '.join(result.keys())}",
-                "",
-                "RECENT MARKET INTELLIGENCE:",
-                "=" * 40
-            ]
-
-            # Process each data source
-            for source_name, data in result.items():
-                context_parts.append(f"\n📊 {source_name.upper()}:")
-                context_parts.append("-" * 30)
+        except Exception as e:
+            logger.error(f"Error getting intelligent context: {e}")
+            raise ValueError(f"Failed to get intelligent context: {e}")
 
-                if source_name == "RAG" and isinstance(data, list):
-                    # Process RAG document chunks
-                    context_parts.append("Research Document Insights:")
-                    for i, chunk in enumerate(data[:3], 1):  # Limit to top 3 chunks
-                        context_parts.append(f"{i}. {chunk}")
-                        context_parts.append("")
+    async def aget_intelligent_context(self, query_context: str = None) -> str:
+        """Async get_intelligent_context() backed by DataManager.asearch"""
+        try:
+            logger.info("Fetching multi-source intelligence for IT sector context")
+            result = await self.data_manager.asearch(self._build_base_query(query_context))
+            return self._format_intelligent_context(result)
 
-                elif source_name == "Jina Web Connector" and isinstance(data, list):
-                    # Process web search results
-                    context_parts.append("Current Market News & Analysis:")
-                    for i, item in enumerate(data[:3], 1):  # Limit to top 3 results
-                        title = item.get('title', 'No title')
-                        content = item.get('content', '')[:400]  # Limit content length
-                        context_parts.append(f"{i}. {title}")
-                        if content:
-                            context_parts.append(f"   {content}...")
-                        context_parts.append("")
+        except Exception as e:
+            logger.error(f"Error getting intelligent context: {e}")
+            raise ValueError(f"Failed to get intelligent context: {e}")
 
-                elif source_name == "YouTube Connector" and isinstance(data, dict):
-                    # Process video transcripts
-                    context_parts.append("Expert Commentary & Interviews:")
-                    for i, (title, transcript) in enumerate(data.items(), 1):
-                        if isinstance(transcript, str) and len(transcript) > 100:
-                            context_parts.append(f"{i}. {title}")
-                            context_parts.append(f"   {transcript[:400]}...")
-                            context_parts.append("")
-
-                elif source_name == "Indices Tracker" and isinstance(data, dict):
-                    # Process market indices data
-                    context_parts.append("Market Index Performance:")
-                    for date, value in list(data.items())[:5]:  # Show last 5 data points
-                        context_parts.append(f"   {date}: {value}")
+    def _build_base_query(self, query_context: str = None) -> str:
+        # Build comprehensive query for current IT sector state
+        base_query = "Current state of Indian IT sector, latest quarterly results, AI impact, and recent developments"
+        if query_context:
+            base_query = f"{base_query}. Specific focus: {query_context}"
+        return base_query
+
+    def _format_intelligent_context(self, result: Dict[str, Any]) -> str:
+        """Render DataManager search results as the multi-source intelligence block"""
+        context_parts = [
+            "MULTI-SOURCE FINANCIAL INTELLIGENCE:",
+            "=" * 60,
+            f"Domain: {self.sector_context['domain']}",
+            f"Data Sources: {', '.join(result.keys())}",
+            "",
+            "RECENT MARKET INTELLIGENCE:",
+            "=" * 40
+        ]
+
+        # Process each data source
+        for source_name, data in result.items():
+            context_parts.append(f"\n📊 {source_name.upper()}:")
+            context_parts.append("-" * 30)
+
+            if source_name == "RAG" and isinstance(data, list):
+                # Process RAG document chunks
+                context_parts.append("Research Document Insights:")
+                for i, chunk in enumerate(data[:3], 1):  # Limit to top 3 chunks
+                    context_parts.append(f"{i}. {chunk}")
                     context_parts.append("")
 
-            context_parts.extend([
-                "",
-                "KEY SECTOR THEMES TO ANALYZE:",
-                "=" * 35
-            ])
-
-            for theme in self.sector_context["focus_areas"]:
-                context_parts.append(f"• {theme}")
-
-            context_parts.extend([
-                "",
-                "MAJOR COMPANIES IN SCOPE:",
-                "=" * 25,
-                ", ".join(self.sector_context["key_companies"]),
-                "",
-                "=" * 80
-            ])
+            elif source_name == "Jina Web Connector" and isinstance(data, list):
+                # Process web search results
+                context_parts.append("Current Market News & Analysis:")
+                for i, item in enumerate(data[:3], 1):  # Limit to top 3 results
+                    title = item.get('title', 'No title')
+                    content = item.get('content', '')[:400]  # Limit content length
+                    context_parts.append(f"{i}. {title}")
+                    if content:
+                        context_parts.append(f"   {content}...")
+                    context_parts.append("")
 
-            return "\n".join(context_parts)
+            elif source_name == "YouTube Connector" and isinstance(data, dict):
+                # Process video transcripts
+                context_parts.append("Expert Commentary & Interviews:")
+                for i, (title, transcript) in enumerate(data.items(), 1):
+                    if isinstance(transcript, str) and len(transcript) > 100:
+                        context_parts.append(f"{i}. {title}")
+                        context_parts.append(f"   {transcript[:400]}...")
+                        context_parts.append("")
 
-        except Exception as e:
-            logger.error(f"Error getting intelligent context: {e}")
-            raise ValueError(f"Failed to get intelligent context: {e}")
+            elif source_name == "Indices Tracker" and isinstance(data, dict):
+                # Process market indices data
+                context_parts.append("Market Index Performance:")
+                for date, value in list(data.items())[:5]:  # Show last 5 data points
+                    context_parts.append(f"   {date}: {value}")
+                context_parts.append("")
+
+        context_parts.extend([
+            "",
+            "KEY SECTOR THEMES TO ANALYZE:",
+            "=" * 35
+        ])
+
+        for theme in self.sector_context["focus_areas"]:
+            context_parts.append(f"• {theme}")
+
+        context_parts.extend([
+            "",
+            "MAJOR COMPANIES IN SCOPE:",
+            "=" * 25,
+            ", ".join(self.sector_context["key_companies"]),
+            "",
+            "=" * 80
+        ])
+
+        return "\n".join(context_parts)
+
+    def get_sector_fundamentals(self, args: List[str] = None, include_peers: bool = False) -> Dict[int, Any]:
+        """
+        Trendlyne fundamentals for every key company, fetched concurrently and keyed by
+        Trendlyne stock id. On demand only: get_financial_context does not call it, since
+        a cold fetch may scrape tokens. include_peers adds every company in their peer
+        tables, which is several times as many requests.
+        """
+        if self._trendlyne is None:
+            self._trendlyne = TrendlyneConnector()
+        args = args or ["quarterly_financials_consolidated", "annual_financials_consolidated"]
+        return self._trendlyne.get_info_bulk(company_names=self.sector_context["key_companies"], args=args, include_peers=include_peers)
 
     def get_market_data_context(self, indices: List[str] = None, timeframe: str = "3m") -> str:
         """Get specific market data context for indices analysis"""
@@ -165,24 +202,16 @@ class IntelligentFinancialDataLoader:
             start_str = start_date.strftime('%d-%b-%Y')
             end_str = end_date.strftime('%d-%b-%Y')
 
-            for index in indices[:1]:  # OPTIMIZATION: Limit to 1 index to reduce API calls
-                try:
-                    # Use the exact index name as it appears in the API
-                    api_index_name = index  # Use exact name: "Nifty IT"
-
-                    data = self.data_manager.indices_connector.get_data(
-                        api_index_name, start_str, end_str, "weekly"
-                    )
-                    if data:
-                        context_parts.append(f"\n{index} ({timeframe} performance):")
-                        recent_data = list(data.items())[-3:]  # Reduce to last 3 weeks
-                        for date, value in recent_data:
-                            context_parts.append(f"  {date}: {value}")
-                    else:
-                        context_parts.append(f"\n{index}: No recent data available")
-                except Exception as e:
-                    logger.warning(f"Could not fetch data for {index}: {e}")
-                    context_parts.append(f"\n{index}: Data unavailable ({str(e)[:50]})")
+            # All indices in one concurrent fetch, served from the local bar store where possible
+            weekly = self.data_manager.indices_connector.fetch_many(indices, start_str, end_str, "weekly")
+            for index in indices:
+                if index in weekly.columns:
+                    context_parts.append(f"\n{index} ({timeframe} performance):")
+                    recent_data = weekly[index].dropna().iloc[-3:]  # Last 3 weeks
+                    for date, value in recent_data.items():
+                        context_parts.append(f"  {date.strftime('%d-%b-%Y')}: {value}")
+                else:
+                    context_parts.append(f"\n{index}: No recent data available")
 
             return "\n".join(context_parts)
 
@@ -201,9 +230,12 @@ class IntelligentFinancialDataLoader:
             logger.error(f"Error searching documents: {e}")
             return []
 
-    def get_financial_context(self) -> str:
-        """Main method called by agents - provides comprehensive context"""
-        return self.get_intelligent_context()
+    def get_financial_context(self, refresh: bool = False) -> str:
+        """Main method called by agents - provides comprehensive context (memoized snapshot)"""
+        with self._financial_context_lock:
+            if self._financial_context is None or refresh:
+                self._financial_context = self.get_intelligent_context()
+            return self._financial_context
 
     def get_all_documents(self) -> List[Document]:
         """Legacy compatibility method - returns empty list since we use RAG now"""
@@ -1,11 +1,14 @@
 import logging
 import os
+import argparse
 from pathlib import Path
 from datetime import datetime
 import json
 from dotenv import load_dotenv
 
-from config import load_config, save_config
+from config import load_config, save_config, configure_rate_limits
+from checkpointing import new_thread_id
+from connectors.http_transport import configure_http_transport
 from advanced_orchestrator import AdvancedDebateOrchestrator
 from pdf_converter import MarkdownToPDFConverter
 
@@ -23,7 +26,7 @@ def cleanup_old_files():
         if outputs_dir.exists():
             # Get all files with timestamps
             pattern_files = {}
-            for pattern in ['debate_raw_', 'debate_transcript_', 'synthesis_report_']:
+            for pattern in ['debate_raw_', 'debate_transcript_', 'synthesis_report_', 'live_debate_transcript_', 'live_synthesis_report_']:
                 files = list(outputs_dir.glob(f"{pattern}*"))
                 files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
                 # Keep only the 3 most recent files of each type
@@ -102,6 +105,11 @@ def save_results(result: dict, output_dir: str = "outputs"):
         print("Markdown files are still available")
 
 def main():
+    parser = argparse.ArgumentParser(description="Dialectical agent debate")
+    parser.add_argument("--resume", metavar="THREAD_ID", help="continue a checkpointed debate from its last completed step")
+    parser.add_argument("--stream", action="store_true", help="write live transcript/report files while agents are generating")
+    args = parser.parse_args()
+
     # Load environment variables from .env file
     load_dotenv()
 
@@ -118,6 +126,10 @@ def main():
         # Load configuration
         print("Loading configuration...")
         config = load_config()
+        configure_rate_limits(config.rate_limits)
+        configure_http_transport(config.http)
+        if args.stream:
+            config.debate.stream_output = True
 
         # API key is now loaded directly in config.py, no need to check environment variables
 
@@ -130,11 +142,17 @@ def main():
         orchestrator = AdvancedDebateOrchestrator(config)
 
         # Run debate
-        print("\nStarting dialectical debate...")
-        print("This may take several minutes depending on the model and turn count.")
-        print("-" * 50)
-
-        result = orchestrator.run_debate()
+        if args.resume:
+            print(f"\nResuming debate thread {args.resume}...")
+            print("-" * 50)
+            result = orchestrator.resume_advanced_debate(args.resume)
+        else:
+            thread_id = new_thread_id()
+            print("\nStarting dialectical debate...")
+            print("This may take several minutes depending on the model and turn count.")
+            print(f"Thread ID: {thread_id} (rerun with --resume {thread_id} if it fails)")
+            print("-" * 50)
+            result = orchestrator.run_advanced_debate(thread_id)
 
         # Display summary
         print("\n" + orchestrator.get_debate_summary(result))
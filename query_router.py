@@ -0,0 +1,176 @@
+"""
+Rule-based fast-path router for DataManager.
+
+Produces the same tool-selection structure as the router LLM for queries whose
+intent is obvious from keywords and index names, together with a confidence score.
+DataManager only falls back to the LLM when the confidence is below threshold.
+"""
+
+import re
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+
+from connectors.index_names import INDICES_FILE, get_index_name_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEFRAMES = ['1w', '1m', '3m', '6m', '1y']
+
+COMPARISON_PATTERN = re.compile(
+    r"\b(vs\.?|versus|compare[sd]?|comparing|comparison|relative\s+(strength|performance)|outperform\w*|underperform\w*)(?!\w)",
+    re.IGNORECASE
+)
+INDEX_DATA_PATTERN = re.compile(
+    r"\b(value|values|level|levels|price|prices|close|closing|performance|returns?|movement|moved|trend|chart|history|historical|from\s+\S+\s+to)\b",
+    re.IGNORECASE
+)
+YOUTUBE_PATTERN = re.compile(
+    r"\b(interviews?|commentary|commentaries|podcasts?|videos?|con-?calls?|earnings\s+calls?|analysts?\s+(said|say|says|views?|opinions?)|management\s+said|what\s+did\s+\w+\s+say)\b",
+    re.IGNORECASE
+)
+# Explicit asks for news or a reporting period: enough on their own to route to web search
+NEWS_PATTERN = re.compile(
+    r"\b(latest|news|headlines?|today|yesterday|this\s+week|breaking|announce\w*|q[1-4]\s*fy\s*\d{2,4}|[hf]y\s*\d{2,4}|h[12]\s*fy\s*\d{2,4})\b",
+    re.IGNORECASE
+)
+# Generic words that often but not always mean web search ("deal pipeline", "current valuations");
+# they add the web tool but leave the decision to the LLM unless something stronger matched
+WEB_PATTERN = re.compile(
+    r"\b(recent|recently|current|update[sd]?|impact|polic(y|ies)|regulat\w*|tariffs?|h-?1b|visa|guidance|outlook|trends?|deals?|results|earnings)\b",
+    re.IGNORECASE
+)
+FREQUENCY_PATTERN = re.compile(r"\b(daily|weekly|monthly|quarterly|yearly)\b", re.IGNORECASE)
+ISO_DATE_PATTERN = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+NSE_DATE_PATTERN = re.compile(r"\b(\d{1,2}-[A-Za-z]{3}-\d{4})\b")
+TIMEFRAME_PATTERNS = [
+    ('1w', re.compile(r"\b(1\s*w|one\s+week|1\s+week|past\s+week|last\s+week|weekly\s+performance)\b", re.IGNORECASE)),
+    ('1m', re.compile(r"\b(1\s*m|one\s+month|1\s+month|past\s+month|last\s+month)\b", re.IGNORECASE)),
+    ('3m', re.compile(r"\b(3\s*m|three\s+months|3\s+months|quarter|quarterly|q[1-4])\b", re.IGNORECASE)),
+    ('6m', re.compile(r"\b(6\s*m|six\s+months|6\s+months|half[-\s]year|h[12])\b", re.IGNORECASE)),
+    ('1y', re.compile(r"\b(1\s*y|one\s+year|1\s+year|past\s+year|last\s+year|annual|yoy|fy\s*\d{2,4})\b", re.IGNORECASE)),
+]
+
+
+class FastPathRouter:
+    def __init__(self, indices_file=INDICES_FILE, min_confidence: float = 0.7):
+        self.min_confidence = min_confidence
+        self.index_names = self._load_index_names(indices_file)
+        self.index_pattern = self._compile_index_pattern()
+
+    def _load_index_names(self, indices_file) -> Dict[str, str]:
+        """Map lowercase index name/alias to the exact index name"""
+        return get_index_name_index(indices_file).phrases()
+
+    def _compile_index_pattern(self) -> Optional[re.Pattern]:
+        if not self.index_names:
+            return None
+        # Longest names first so "Nifty 500" is never read as "Nifty 50" + "0"
+        alternatives = sorted(self.index_names, key=len, reverse=True)
+        return re.compile(
+            r"(?<![\w])(" + "|".join(re.escape(name) for name in alternatives) + r")(?![\w])",
+            re.IGNORECASE
+        )
+
+    def find_indices(self, query: str) -> List[str]:
+        """Exact index names mentioned in the query, in order of first mention"""
+        if not self.index_pattern:
+            return []
+        found = []
+        for match in self.index_pattern.finditer(query):
+            index_name = self.index_names[match.group(1).lower()]
+            if index_name not in found:
+                found.append(index_name)
+        return found
+
+    def _extract_date_range(self, query: str) -> Tuple[str, str]:
+        """Dates in the query as DD-MMM-YYYY, defaulting to the last 3 months"""
+        dates = [datetime.strptime(d, '%Y-%m-%d') for d in ISO_DATE_PATTERN.findall(query)]
+        dates += [datetime.strptime(d.title(), '%d-%b-%Y') for d in NSE_DATE_PATTERN.findall(query)]
+        dates.sort()
+
+        if len(dates) >= 2:
+            start, end = dates[0], dates[-1]
+        elif len(dates) == 1:
+            start, end = dates[0], datetime.now()
+        else:
+            end = datetime.now()
+            start = end - timedelta(days=90)
+        return start.strftime('%d-%b-%Y'), end.strftime('%d-%b-%Y')
+
+    def _extract_timeframes(self, query: str) -> List[str]:
+        timeframes = [timeframe for timeframe, pattern in TIMEFRAME_PATTERNS if pattern.search(query)]
+        return timeframes or list(DEFAULT_TIMEFRAMES)
+
+    def bind_tool_args(self, tool_name: str, query: str) -> Optional[Dict[str, Any]]:
+        """
+        tool_args for tool_name taken from this query alone, or None when the query
+        doesn't name what the tool needs (e.g. two indices for Index Comparison)
+        """
+        if tool_name in ("RAG", "YouTube Connector", "Jina Web Connector"):
+            return {"query": query}
+
+        indices = self.find_indices(query)
+        if tool_name == "Index Comparison":
+            if len(indices) < 2:
+                return None
+            return {"index1": indices[0], "index2": indices[1], "timeframes": self._extract_timeframes(query)}
+        if tool_name == "Indices Tracker":
+            if not indices:
+                return None
+            start_date, end_date = self._extract_date_range(query)
+            frequency_match = FREQUENCY_PATTERN.search(query)
+            span_days = (datetime.strptime(end_date, '%d-%b-%Y') - datetime.strptime(start_date, '%d-%b-%Y')).days
+            return {
+                "index_name": indices[0],
+                "start_date": start_date,
+                "end_date": end_date,
+                "frequency": frequency_match.group(1).lower() if frequency_match else ("daily" if span_days <= 31 else "weekly")
+            }
+        return None
+
+    def route(self, query: str) -> Tuple[Dict[str, Any], float]:
+        """
+        Select tools for the query without calling the LLM.
+
+        Returns:
+            (tool_selection, confidence) where tool_selection has the router LLM's
+            {"tool_name": {"tool_args": {...}}} structure and confidence is in [0, 1]
+        """
+        selection = {"RAG": {"tool_args": self.bind_tool_args("RAG", query)}}
+        confidence = 0.4  # RAG alone is always a valid but weak answer
+
+        indices = self.find_indices(query)
+        wants_comparison = bool(COMPARISON_PATTERN.search(query))
+        wants_index_data = bool(INDEX_DATA_PATTERN.search(query))
+
+        if len(indices) >= 2 and wants_comparison:
+            selection["Index Comparison"] = {"tool_args": self.bind_tool_args("Index Comparison", query)}
+            confidence = max(confidence, 0.9)
+        elif indices:
+            selection["Indices Tracker"] = {"tool_args": self.bind_tool_args("Indices Tracker", query)}
+            # An index mention without price/return wording may just be sector context
+            confidence = max(confidence, 0.9 if wants_index_data else 0.5)
+
+        if YOUTUBE_PATTERN.search(query):
+            selection["YouTube Connector"] = {"tool_args": self.bind_tool_args("YouTube Connector", query)}
+            confidence = max(confidence, 0.85)
+
+        if NEWS_PATTERN.search(query):
+            selection["Jina Web Connector"] = {"tool_args": self.bind_tool_args("Jina Web Connector", query)}
+            confidence = max(confidence, 0.75)
+        elif WEB_PATTERN.search(query):
+            selection["Jina Web Connector"] = {"tool_args": self.bind_tool_args("Jina Web Connector", query)}
+            # Below min_confidence: one generic word can't rule out YouTube or index data
+            confidence = max(confidence, 0.55)
+
+        return selection, confidence
+
+    def try_route(self, query: str) -> Optional[Dict[str, Any]]:
+        """Tool selection if the rules are confident enough, otherwise None"""
+        selection, confidence = self.route(query)
+        if confidence < self.min_confidence:
+            logger.info(f"Fast-path router not confident ({confidence:.2f}) for query: {query[:50]}...")
+            return None
+        logger.info(f"Fast-path routed ({confidence:.2f}) to {list(selection)}: {query[:50]}...")
+        return selection
@@ -0,0 +1,173 @@
+"""
+Token-bucket rate limiting shared across agents and data connectors
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Each
+    call to acquire() consumes tokens, blocking until enough are available,
+    so short bursts go through immediately while the long-run rate is capped.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reconfigure(self, rate: float, capacity: int = 1):
+        """Change rate/capacity in place and start from a full bucket"""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        with self._lock:
+            self.rate = rate
+            self.capacity = capacity
+            self._tokens = float(capacity)
+            self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """Take tokens if available right now, without blocking"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def _wait_time(self, tokens: int, deadline: Optional[float]) -> Optional[float]:
+        """
+        Consume tokens if available and return 0, otherwise return how long to wait.
+        Returns None once the deadline has passed.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            wait_time = (tokens - self._tokens) / self.rate
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            wait_time = min(wait_time, remaining)
+        return wait_time
+
+    def _check_tokens(self, tokens: int):
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Block until `tokens` are available and consume them.
+
+        Returns False if `timeout` seconds pass before the tokens are available.
+        """
+        self._check_tokens(tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait_time = self._wait_time(tokens, deadline)
+            if wait_time is None:
+                return False
+            if wait_time == 0:
+                return True
+            time.sleep(wait_time)
+
+    async def aacquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """Async acquire(): waits with asyncio.sleep so the event loop keeps running"""
+        self._check_tokens(tokens)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            wait_time = self._wait_time(tokens, deadline)
+            if wait_time is None:
+                return False
+            if wait_time == 0:
+                return True
+            await asyncio.sleep(wait_time)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_limiters: Dict[str, TokenBucketRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, capacity: int = 1) -> TokenBucketRateLimiter:
+    """
+    Get the process-wide limiter registered under `name`, creating it on first use.
+
+    The first caller's rate/capacity win; later callers share the same bucket so
+    every agent and connector using a name draws from one budget.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucketRateLimiter(rate, capacity)
+            _limiters[name] = limiter
+        return limiter
+
+
+def configure_rate_limiter(name: str, rate: float, capacity: int = 1) -> TokenBucketRateLimiter:
+    """
+    Set the rate/capacity of the process-wide limiter registered under `name`.
+
+    An existing limiter is reconfigured in place, so clients already holding it
+    pick up the new budget.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucketRateLimiter(rate, capacity)
+            _limiters[name] = limiter
+        else:
+            limiter.reconfigure(rate, capacity)
+        return limiter
+
+
+class ChatModelRateLimiter(BaseRateLimiter):
+    """Adapter so LangChain chat models draw from a shared TokenBucketRateLimiter"""
+
+    def __init__(self, limiter: TokenBucketRateLimiter):
+        self.limiter = limiter
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.limiter.try_acquire()
+        return self.limiter.acquire()
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.limiter.try_acquire()
+        return await self.limiter.aacquire()
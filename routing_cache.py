@@ -0,0 +1,242 @@
+"""
+Persistent cache for DataManager router decisions.
+
+Lookups first try the normalized query text, then fall back to cosine similarity
+over stored query embeddings so near-duplicate queries also skip the router LLM.
+A near-duplicate hit reuses only the stored tool names: their args are rebound
+from the current query, since they carry the other query's text, dates and indices.
+Entries live in SQLite with a TTL and least-recently-used eviction.
+"""
+
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / "cache" / "routing_cache.sqlite3"
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop surrounding punctuation and collapse whitespace"""
+    normalized = re.sub(r"\s+", " ", query.lower()).strip()
+    return normalized.strip(" .,;:!?\"'")
+
+
+class RoutingCache:
+    def __init__(
+        self,
+        db_path=DEFAULT_CACHE_PATH,
+        embedder: Optional[Callable[[str], List[float]]] = None,
+        ttl_seconds: int = 24 * 60 * 60,
+        max_entries: int = 2000,
+        similarity_threshold: float = 0.95,
+        arg_binder: Optional[Callable[[str, str], Optional[Dict]]] = None,
+    ):
+        """
+        Args:
+            db_path: SQLite file holding the cache
+            embedder: callable mapping query text to an embedding vector; None disables
+                the similarity fallback
+            ttl_seconds: entries older than this are ignored and purged
+            max_entries: least recently used entries beyond this are evicted
+            similarity_threshold: minimum cosine similarity for a near-duplicate hit
+            arg_binder: callable (tool_name, query) -> tool_args or None, used to rebind
+                the args of a near-duplicate hit; tools whose args are only the query
+                text are rebound without it, any other tool makes the hit a miss
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.embedder = embedder
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.arg_binder = arg_binder
+
+        self.hits_exact = 0
+        self.hits_semantic = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=20.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS routing_cache (
+                query_key TEXT PRIMARY KEY,
+                tool_selection TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_routing_cache_accessed ON routing_cache(last_accessed)")
+        self._conn.commit()
+
+        # In-memory copy of the stored embeddings, rebuilt lazily after writes
+        self._matrix_keys: Optional[List[str]] = None
+        self._matrix: Optional[np.ndarray] = None
+        # Embeddings computed during a missed lookup, reused by the following put()
+        self._pending_embeddings: Dict[str, np.ndarray] = {}
+
+    def get(self, query: str) -> Optional[str]:
+        """Return the cached tool-selection JSON for the query, or None on a miss"""
+        query_key = normalize_query(query)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tool_selection, created_at FROM routing_cache WHERE query_key = ?",
+                (query_key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl_seconds:
+                self._touch(query_key, now)
+                self.hits_exact += 1
+                return row[0]
+
+        if self.embedder is not None:
+            match = self._find_similar(query_key, now)
+            if match is not None:
+                similar_key, similarity, stored_selection = match
+                rebound = self._rebind(stored_selection, query)
+                if rebound is not None:
+                    with self._lock:
+                        self._touch(similar_key, now)
+                        self.hits_semantic += 1
+                    logger.info(f"Routing cache near-duplicate hit ({similarity:.3f}): '{similar_key[:60]}'")
+                    return rebound
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, query: str, tool_selection: str):
+        """Store a router decision; invalid JSON is never cached"""
+        try:
+            json.loads(tool_selection)
+        except (TypeError, ValueError):
+            return
+
+        query_key = normalize_query(query)
+        embedding = self._pending_embeddings.pop(query_key, None)
+        if embedding is None and self.embedder is not None:
+            embedding = self._embed(query_key)
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO routing_cache (query_key, tool_selection, embedding, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                (query_key, tool_selection, embedding.tobytes() if embedding is not None else None, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+            self._matrix_keys = None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM routing_cache").fetchone()[0]
+        lookups = self.hits_exact + self.hits_semantic + self.misses
+        return {
+            "hits_exact": self.hits_exact,
+            "hits_semantic": self.hits_semantic,
+            "misses": self.misses,
+            "hit_rate": round((self.hits_exact + self.hits_semantic) / lookups, 3) if lookups else 0.0,
+            "entries": size,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM routing_cache")
+            self._conn.commit()
+            self._matrix_keys = None
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(self.embedder(text), dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Routing cache embedding failed, skipping similarity lookup: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _rebind(self, tool_selection: str, query: str) -> Optional[str]:
+        """Stored selection with every tool's args rebuilt from query, or None if one can't be"""
+        try:
+            selection = json.loads(tool_selection)
+            rebound = {}
+            for tool_name, tool_info in selection.items():
+                tool_args = tool_info.get("tool_args", {})
+                if set(tool_args) <= {"query"}:
+                    args = {"query": query} if tool_args else {}
+                elif self.arg_binder is not None:
+                    args = self.arg_binder(tool_name, query)
+                else:
+                    args = None
+                if args is None:
+                    logger.info(f"Routing cache near-duplicate skipped: can't rebind '{tool_name}' args for this query")
+                    return None
+                rebound[tool_name] = {**tool_info, "tool_args": args}
+        except Exception as e:
+            logger.warning(f"Routing cache could not rebind near-duplicate selection: {e}")
+            return None
+        return json.dumps(rebound)
+
+    def _find_similar(self, query_key: str, now: float):
+        """(stored query_key, similarity, tool-selection JSON) of the closest live entry, or None"""
+        embedding = self._embed(query_key)
+        if embedding is None:
+            return None
+
+        with self._lock:
+            self._pending_embeddings[query_key] = embedding
+            if len(self._pending_embeddings) > 64:
+                self._pending_embeddings.pop(next(iter(self._pending_embeddings)))
+
+            keys, matrix = self._load_matrix(now)
+            if matrix is None or matrix.shape[1] != embedding.shape[0]:
+                return None
+
+            similarities = matrix @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                return None
+
+            row = self._conn.execute(
+                "SELECT tool_selection, created_at FROM routing_cache WHERE query_key = ?",
+                (keys[best],)
+            ).fetchone()
+            if not row or now - row[1] > self.ttl_seconds:
+                return None
+
+            return keys[best], float(similarities[best]), row[0]
+
+    def _load_matrix(self, now: float):
+        """Load non-expired embeddings into a normalized matrix (caller holds the lock)"""
+        if self._matrix_keys is None:
+            rows = self._conn.execute(
+                "SELECT query_key, embedding FROM routing_cache WHERE embedding IS NOT NULL AND created_at >= ?",
+                (now - self.ttl_seconds,)
+            ).fetchall()
+            self._matrix_keys = [key for key, _ in rows]
+            vectors = [np.frombuffer(blob, dtype=np.float32) for _, blob in rows]
+            dims = {vector.shape[0] for vector in vectors}
+            self._matrix = np.vstack(vectors) if vectors and len(dims) == 1 else None
+        return self._matrix_keys, self._matrix
+
+    def _touch(self, query_key: str, now: float):
+        self._conn.execute("UPDATE routing_cache SET last_accessed = ? WHERE query_key = ?", (now, query_key))
+        self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM routing_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute("""
+            DELETE FROM routing_cache WHERE query_key IN (
+                SELECT query_key FROM routing_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
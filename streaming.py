@@ -0,0 +1,107 @@
+"""
+Incremental markdown writers for streamed debate transcripts and reports
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Listener signature: (stream_name, section_heading, chunk_text)
+StreamListener = Callable[[str, str, str], None]
+
+
+def content_text(content) -> str:
+    """
+    Text of a message's content. Some providers send a list of parts instead of a string;
+    the text parts (plain strings or {"type": "text", "text": ...}) are joined and the rest dropped.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            part if isinstance(part, str) else part.get("text", "")
+            for part in content
+            if isinstance(part, str) or (isinstance(part, dict) and part.get("type") == "text")
+        )
+    return ""
+
+
+def run_chain(chain, inputs: dict, on_chunk: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Invoke a prompt | llm chain and return the completion text.
+    With on_chunk, the chain is streamed and each content chunk is passed on as it arrives.
+    """
+    if on_chunk is None:
+        return content_text(chain.invoke(inputs).content)
+
+    parts: List[str] = []
+    for chunk in chain.stream(inputs):
+        text = content_text(chunk.content)
+        if text:
+            parts.append(text)
+            on_chunk(text)
+    return "".join(parts)
+
+
+async def arun_chain(chain, inputs: dict, on_chunk: Optional[Callable[[str], None]] = None) -> str:
+    """Async variant of run_chain using ainvoke/astream"""
+    if on_chunk is None:
+        return content_text((await chain.ainvoke(inputs)).content)
+
+    parts: List[str] = []
+    async for chunk in chain.astream(inputs):
+        text = content_text(chunk.content)
+        if text:
+            parts.append(text)
+            on_chunk(text)
+    return "".join(parts)
+
+
+class MarkdownStreamWriter:
+    """
+    Appends streamed text to a markdown file as it arrives, flushing after every chunk,
+    and forwards each chunk to listeners so downstream consumers can start early.
+    """
+
+    def __init__(self, path, name: str, header_lines: Iterable[str] = (), listeners: Optional[List[StreamListener]] = None):
+        self.path = Path(path)
+        self.name = name
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.listeners: List[StreamListener] = list(listeners or [])
+        self.current_section = ""
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        for line in header_lines:
+            self._file.write(f"{line}\n")
+        self._file.flush()
+
+    def begin_section(self, heading: str):
+        with self._lock:
+            self.current_section = heading
+            if heading:
+                self._file.write(f"{heading}\n\n")
+            self._file.flush()
+
+    def write(self, chunk: str):
+        with self._lock:
+            self._file.write(chunk)
+            self._file.flush()
+            section = self.current_section
+        for listener in self.listeners:
+            try:
+                listener(self.name, section, chunk)
+            except Exception as e:
+                logger.warning(f"Stream listener failed: {e}")
+
+    def end_section(self, separator: str = "\n\n---\n\n"):
+        with self._lock:
+            self._file.write(separator)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
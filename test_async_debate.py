@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test the async debate path: DebateAgent.arespond, aprefetch_intelligence and the
+async token-bucket acquire, using stub LLMs and data loaders
+"""
+
+import sys
+import os
+import time
+import asyncio
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from agents import DebateAgent, DebateMessage, MultiAgentDebateSystem
+from config import AgentConfig, ModelConfig
+from rate_limiter import TokenBucketRateLimiter, configure_rate_limiter
+
+class AsyncDataLoader:
+    """Stands in for IntelligentFinancialDataLoader with a fixed async per-query latency"""
+    in_flight = 0
+    peak = 0
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+
+    async def aget_intelligent_context(self, query_context=None):
+        # Counted across every loader: all agents share one event loop
+        AsyncDataLoader.in_flight += 1
+        AsyncDataLoader.peak = max(AsyncDataLoader.peak, AsyncDataLoader.in_flight)
+        await asyncio.sleep(self.delay)
+        AsyncDataLoader.in_flight -= 1
+        return f"Context for {query_context}: " + "x" * 100
+
+class AsyncLLM:
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(content="1. sector query a\n2. sector query b\n3. sector query c")
+
+class StreamingChain:
+    async def astream(self, inputs):
+        for chunk in ["Deal ", "wins ", "are up."]:
+            await asyncio.sleep(0.01)
+            yield SimpleNamespace(content=chunk)
+
+def _make_agent(name):
+    agent_config = AgentConfig(
+        name=name,
+        role="Test Analyst",
+        perspective="bullish",
+        model=ModelConfig(model_name="x-ai/grok-4-fast:free", api_key_env="OPENROUTER_API_KEY"),
+        system_prompt="You are a test analyst focused on Indian IT sector.",
+        max_turns=2
+    )
+    agent = DebateAgent(agent_config, AsyncDataLoader())
+    agent.llm = AsyncLLM()
+    agent.chain = StreamingChain()
+    return agent
+
+def test_async_acquire_spaces_tokens():
+    """aacquire follows the same bucket as acquire without blocking the loop"""
+    print("=== Testing Async Token Bucket ===")
+    limiter = TokenBucketRateLimiter(rate=20, capacity=2)
+    events = []
+
+    async def ticker():
+        for _ in range(5):
+            events.append("tick")
+            await asyncio.sleep(0.02)
+
+    async def acquire():
+        await limiter.aacquire()
+        events.append("acquired")
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(ticker(), *(acquire() for _ in range(4)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+    # 2 burst tokens + 2 refilled at 20/s => at least ~0.1s
+    assert elapsed >= 0.08, elapsed
+    # A blocking wait would hold the loop until every token was granted
+    last_acquired = len(events) - 1 - events[::-1].index("acquired")
+    assert events[1:last_acquired].count("tick") >= 1, events
+    print(f"✓ 4 async acquisitions took {elapsed:.3f}s while the loop kept running")
+
+def test_concurrent_arespond_on_one_loop():
+    """Several agents respond concurrently; queries fan out and the reply is streamed"""
+    print("\n=== Testing Concurrent arespond ===")
+    configure_rate_limiter("data_queries", rate=100, capacity=20)
+    AsyncDataLoader.peak = 0
+    agents = [_make_agent(f"Agent {n}") for n in range(3)]
+    chunks = []
+
+    async def run():
+        start = time.monotonic()
+        prefetched = agents[0].aprefetch_intelligence()
+        messages = await asyncio.gather(*(
+            agent.arespond("IT sector", turn_number=1, prefetched=prefetched if agent is agents[0] else None, on_chunk=chunks.append)
+            for agent in agents
+        ))
+        return messages, time.monotonic() - start
+
+    messages, elapsed = asyncio.run(run())
+
+    # More queries in flight than one agent runs means the agents overlapped
+    assert AsyncDataLoader.peak > 3, AsyncDataLoader.peak
+    assert [message.content for message in messages] == ["Deal wins are up."] * 3
+    assert all(agent.turn_count == 1 for agent in agents)
+    assert len(chunks) == 9
+    print(f"✓ 3 agents answered in {elapsed:.3f}s on one event loop ({AsyncDataLoader.peak} queries in flight)")
+
+class ScriptedAgent:
+    """Records the debate schedule's calls; fail_turn raises instead of answering"""
+    def __init__(self, name, log, fail_turn=None):
+        self.config = SimpleNamespace(name=name, perspective="bullish" if name == "Growth Believer" else "bearish")
+        self.turn_count = 0
+        self.max_turns_per_agent = 2
+        self.log = log
+        self.fail_turn = fail_turn
+
+    def _answer(self, turn_number, prefetched):
+        self.log.append(("respond", self.config.name, turn_number, prefetched))
+        self.turn_count += 1
+        if turn_number == self.fail_turn:
+            raise RuntimeError("model unavailable")
+        return DebateMessage(agent_name=self.config.name, perspective=self.config.perspective, content=f"turn {turn_number}", turn_number=turn_number)
+
+    def respond(self, debate_context, opponent_messages=None, turn_number=1, prefetched=None):
+        return self._answer(turn_number, prefetched)
+
+    async def arespond(self, debate_context, opponent_messages=None, turn_number=1, prefetched=None):
+        return self._answer(turn_number, prefetched)
+
+    def prefetch_intelligence(self):
+        self.log.append(("prefetch", self.config.name))
+        return f"{self.config.name} prefetch {len(self.log)}"
+
+    aprefetch_intelligence = prefetch_intelligence
+
+def _scripted_system(log, fail_turn=None):
+    system = MultiAgentDebateSystem.__new__(MultiAgentDebateSystem)
+    system.pipelined = True
+    system.agents = {"Growth Believer": ScriptedAgent("Growth Believer", log, fail_turn), "Cynic": ScriptedAgent("Cynic", log)}
+    return system
+
+def test_sync_and_async_rounds_share_schedule():
+    """run_debate_round and arun_debate_round drive the same turns, prefetches and error handling"""
+    print("\n=== Testing Shared Debate Schedule ===")
+    for fail_turn in (None, 3):
+        sync_log, async_log = [], []
+        sync_messages = _scripted_system(sync_log, fail_turn).run_debate_round("IT sector")
+        async_messages = asyncio.run(_scripted_system(async_log, fail_turn).arun_debate_round("IT sector"))
+
+        assert sync_log == async_log, (sync_log, async_log)
+        assert [m.content for m in sync_messages] == [m.content for m in async_messages]
+        assert [entry[:3] for entry in sync_log] == [
+            ("prefetch", "Cynic"),
+            ("respond", "Growth Believer", 1),
+            ("prefetch", "Growth Believer"),
+            ("respond", "Cynic", 2),
+            ("prefetch", "Cynic"),
+            ("respond", "Growth Believer", 3),
+            ("respond", "Cynic", 3 if fail_turn else 4),
+        ]
+        # Each turn gets the prefetch started for it a turn earlier
+        assert sync_log[3][3] == "Cynic prefetch 1" and sync_log[5][3] == "Growth Believer prefetch 3"
+        assert len(sync_messages) == (3 if fail_turn else 4)
+    print("✓ Sync and async rounds ran the same 7 steps, with and without a failed turn")
+
+if __name__ == "__main__":
+    test_async_acquire_spaces_tokens()
+    test_concurrent_arespond_on_one_loop()
+    test_sync_and_async_rounds_share_schedule()
+    print("\nAll async debate tests passed")
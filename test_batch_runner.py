@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the multi-topic batch runner with a stub orchestrator
+"""
+
+import sys
+import os
+import time
+import threading
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+import batch_runner
+from batch_runner import BatchDebateRunner, topic_slug
+from config import SystemConfig, DebateConfig, RateLimitConfig, get_service_rate_limiter
+
+class StubOrchestrator:
+    """Records the shared loader and sleeps instead of debating"""
+    loaders = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, config, data_loader=None):
+        self.config = config
+        StubOrchestrator.loaders.append(data_loader)
+
+    def run_advanced_debate(self, thread_id):
+        with StubOrchestrator.lock:
+            StubOrchestrator.active += 1
+            StubOrchestrator.peak = max(StubOrchestrator.peak, StubOrchestrator.active)
+        time.sleep(0.2)
+        with StubOrchestrator.lock:
+            StubOrchestrator.active -= 1
+        if "fail" in self.config.debate.topic:
+            raise RuntimeError("OpenRouter unavailable")
+        return {"status": "completed", "topic": self.config.debate.topic, "debate_messages": []}
+
+def test_topic_slug():
+    print("=== Testing Topic Slugs ===")
+    assert topic_slug("Indian IT Sector - Q2 FY26 Outlook!") == "indian_it_sector_q2_fy26_outlook"
+    assert topic_slug("???") == "topic"
+    print("✓ Slugs are filesystem safe")
+
+def test_batch_runs_on_bounded_pool():
+    """Topics run concurrently up to max_workers, share one loader and get their own directories"""
+    print("\n=== Testing Batch Runner ===")
+    original = batch_runner.AdvancedDebateOrchestrator
+    batch_runner.AdvancedDebateOrchestrator = StubOrchestrator
+    shared_loader = object()
+    saved = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            runner = BatchDebateRunner(
+                base_config=SystemConfig.create_default(),
+                max_workers=2,
+                output_root=tmp,
+                data_loader=shared_loader,
+                save_fn=lambda result, output_dir: saved.append((result["topic"], output_dir)),
+            )
+            topics = ["Nifty IT outlook", "Nifty IT outlook", DebateConfig(topic="Banking margins", max_rounds=1), "fail topic"]
+
+            start = time.perf_counter()
+            summaries = runner.run(topics)
+            elapsed = time.perf_counter() - start
+
+            assert os.path.exists(os.path.join(tmp, "batch_summary.json"))
+    finally:
+        batch_runner.AdvancedDebateOrchestrator = original
+
+    # Two topics ran at once and never more than max_workers
+    assert StubOrchestrator.peak == 2, StubOrchestrator.peak
+    assert all(loader is shared_loader for loader in StubOrchestrator.loaders)
+    assert [summary["status"] for summary in summaries] == ["completed", "completed", "completed", "error"]
+    assert [os.path.basename(summary["output_directory"]) for summary in summaries] == [
+        "nifty_it_outlook", "nifty_it_outlook_2", "banking_margins", "fail_topic"
+    ]
+    assert len(saved) == 3
+    print(f"✓ 4 topics on 2 workers in {elapsed:.3f}s: {summaries}")
+
+def test_rate_limits_reconfigured_in_place():
+    """Clients holding the shared limiter see the batch's budget"""
+    print("\n=== Testing Global Rate Limits ===")
+    limiter = get_service_rate_limiter("gemini")
+    BatchDebateRunner(
+        base_config=SystemConfig.create_default().model_copy(update={"rate_limits": RateLimitConfig(gemini_per_second=9.0, gemini_burst=4)}),
+        data_loader=object(),
+    )
+    assert get_service_rate_limiter("gemini") is limiter
+    assert (limiter.rate, limiter.capacity) == (9.0, 4)
+    print("✓ Existing limiter picked up the new budget")
+
+if __name__ == "__main__":
+    test_topic_slug()
+    test_batch_runs_on_bounded_pool()
+    test_rate_limits_reconfigured_in_place()
+    print("\nAll batch runner tests passed")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test durable debate checkpoints: a run that fails during meta-analysis resumes from
+SQLite without repeating agent turns, using stub agents and meta-agent
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from agents import MultiAgentDebateSystem, DebateMessage
+from advanced_orchestrator import AdvancedDebateOrchestrator
+from debate_orchestrator import DialecticalDebateOrchestrator
+from checkpointing import create_checkpointer
+from config import DebateConfig
+
+AGENT_NAMES = ["Growth Believer", "Cynic"]
+
+class StubAgent:
+    def __init__(self, name):
+        self.config = SimpleNamespace(name=name, perspective="bullish")
+        self.conversation_history = []
+        self.turn_count = 0
+        self.max_turns_per_agent = 2
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class StubDebateSystem(MultiAgentDebateSystem):
+    """Real history/stat bookkeeping, canned turns"""
+    def __init__(self):
+        self.agents = {name: StubAgent(name) for name in AGENT_NAMES}
+        self.rounds_run = 0
+
+    def _turns(self):
+        self.rounds_run += 1
+        messages = []
+        for name, agent in self.agents.items():
+            agent.turn_count += 1
+            message = DebateMessage(agent_name=name, perspective="bullish", content=f"{name} turn {agent.turn_count}", turn_number=agent.turn_count)
+            agent.conversation_history.append(message)
+            messages.append(message)
+        return messages
+
+    def run_debate_round(self, topic, max_rounds=1, stream=None):
+        return self._turns()
+
+    async def arun_debate_round(self, topic, max_rounds=1, stream=None):
+        return self._turns()
+
+class FlakyMetaAgent:
+    """Fails the first synthesis, as a dropped connection would"""
+    def __init__(self):
+        self.calls = 0
+
+    def synthesize(self, debate_messages, on_chunk=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("connection reset by peer")
+        return f"Report over {len(debate_messages)} messages"
+
+    async def asynthesize(self, debate_messages, on_chunk=None):
+        return self.synthesize(debate_messages, on_chunk)
+
+class RespondingAgent(StubAgent):
+    def respond(self, debate_context, opponent_message=None, turn_number=1):
+        self.turn_count += 1
+        message = DebateMessage(agent_name=self.config.name, perspective=self.config.perspective, content=f"turn {self.turn_count}", turn_number=turn_number)
+        self.conversation_history.append(message)
+        return message
+
+def _make_orchestrator(checkpoint_path):
+    orchestrator = AdvancedDebateOrchestrator.__new__(AdvancedDebateOrchestrator)
+    orchestrator.config = SimpleNamespace(debate=DebateConfig(topic="IT sector", stream_output=False, checkpoint_path=checkpoint_path))
+    orchestrator.stream_listeners = []
+    orchestrator.transcript_stream = None
+    orchestrator.report_stream = None
+    orchestrator.debate_system = StubDebateSystem()
+    orchestrator.meta_agent = FlakyMetaAgent()
+    orchestrator.checkpointer = create_checkpointer(checkpoint_path)
+    orchestrator.graph = orchestrator._build_advanced_graph()
+    return orchestrator
+
+def test_resume_after_crash_skips_completed_rounds():
+    """A fresh orchestrator resumes the failed thread from the SQLite file"""
+    print("=== Testing Resume From Checkpoint ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.sqlite")
+
+        failed = _make_orchestrator(path).run_advanced_debate(thread_id="debate_1")
+        assert failed["status"] == "error" and failed["thread_id"] == "debate_1"
+
+        # New process: nothing in memory, only the checkpoint file
+        orchestrator = _make_orchestrator(path)
+        orchestrator.meta_agent.calls = 1
+        result = orchestrator.resume_advanced_debate("debate_1")
+
+        assert result["status"] == "completed", result
+        assert orchestrator.debate_system.rounds_run == 0
+        assert result["synthesis_report"] == "Report over 4 messages"
+        assert all(isinstance(message, DebateMessage) for message in result["debate_messages"])
+        assert [agent.turn_count for agent in orchestrator.debate_system.agents.values()] == [2, 2]
+        assert all(agent.closed for agent in orchestrator.debate_system.agents.values())
+
+        # Completed threads return the saved result without running anything
+        again = _make_orchestrator(path).resume_advanced_debate("debate_1")
+        assert again["synthesis_report"] == result["synthesis_report"]
+        assert _make_orchestrator(path).resume_advanced_debate("missing")["status"] == "error"
+    print("✓ Resumed at meta-analysis with 4 restored messages and no repeated turns")
+
+def test_async_resume_uses_same_file():
+    """arun/aresume share the SQLite checkpoints with the sync path"""
+    print("\n=== Testing Async Resume ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.sqlite")
+
+        failed = asyncio.run(_make_orchestrator(path).arun_advanced_debate(thread_id="debate_2"))
+        assert failed["status"] == "error"
+
+        orchestrator = _make_orchestrator(path)
+        orchestrator.meta_agent.calls = 1
+        result = orchestrator.resume_advanced_debate("debate_2")
+
+        assert result["status"] == "completed", result
+        assert orchestrator.debate_system.rounds_run == 0
+        assert result["total_messages"] == 4
+    print("✓ Async run checkpoint resumed by the sync orchestrator")
+
+def test_default_runs_get_their_own_thread():
+    """Two runs on one checkpoint file never share state unless a thread id is reused"""
+    print("\n=== Testing Per-Run Thread Ids ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.sqlite")
+
+        first = _make_orchestrator(path)
+        first.meta_agent.calls = 1
+        second = _make_orchestrator(path)
+        second.meta_agent.calls = 1
+        results = [first.run_advanced_debate(), second.run_advanced_debate()]
+
+        assert results[0]["thread_id"] != results[1]["thread_id"]
+        assert [result["total_messages"] for result in results] == [4, 4], results
+        assert second.debate_system.rounds_run == 2
+    print(f"✓ Separate threads {results[0]['thread_id']} and {results[1]['thread_id']}")
+
+def test_bull_bear_resume_restores_turn_counts():
+    """The two-agent orchestrator restores turn counts along with history on resume"""
+    print("\n=== Testing Bull/Bear Resume ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.sqlite")
+
+        def make():
+            orchestrator = DialecticalDebateOrchestrator.__new__(DialecticalDebateOrchestrator)
+            orchestrator.config = SimpleNamespace(debate=DebateConfig(topic="IT sector", checkpoint_path=path))
+            orchestrator.bull_agent = RespondingAgent("Bull")
+            orchestrator.bear_agent = RespondingAgent("Bear")
+            orchestrator.bull_agent.config.perspective, orchestrator.bear_agent.config.perspective = "bull", "bear"
+            orchestrator.synthesis_agent = FlakyMetaAgent()
+            orchestrator.checkpointer = create_checkpointer(path)
+            orchestrator.graph = orchestrator._build_graph()
+            return orchestrator
+
+        assert make().run_debate(thread_id="debate_3")["status"] == "error"
+
+        orchestrator = make()
+        orchestrator.synthesis_agent.calls = 1
+        result = orchestrator.resume_debate("debate_3")
+        assert result["status"] == "completed" and result["total_turns"] == 4, result
+        for agent in (orchestrator.bull_agent, orchestrator.bear_agent):
+            assert agent.turn_count == 2 and len(agent.conversation_history) == 2
+    print("✓ Bull and bear resumed with 2 turns each")
+
+if __name__ == "__main__":
+    test_resume_after_crash_skips_completed_rounds()
+    test_async_resume_uses_same_file()
+    test_default_runs_get_their_own_thread()
+    test_bull_bear_resume_restores_turn_counts()
+    print("\nAll checkpointing tests passed")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test the prebuilt company search index: exact names, symbols, slugs and aliases,
+fuzzy matching over Trendlyne's glued-figure names, and the saved JSON index that
+follows the source
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import utils.company_search as company_search
+from utils.company_search import CompanySearchIndex, get_company_index, index_path_for, normalize_company_name
+from utils.trendlyne_company_token_extractor import TrendlyneCompanyTokenExtractor
+from utils.trendlyne_token_store import SEED_DB_PATH, TrendlyneTokenStore
+
+def _record(name, symbol, exchange="NSE", url=None):
+    return {"company_name": name, "symbol": symbol, "exchange": exchange, "trendlyne_equity_url": url}
+
+COMPANIES = {
+    "1372": _record("TCS11,38,05123.1", "TCS", url="https://trendlyne.com/equity/1372/TCS/tata-consultancy-services-ltd/"),
+    "630": _record("Infosys6,27,87423.03", "INFY", url="https://trendlyne.com/equity/630/INFY/infosys-ltd/"),
+    "964": _record("Oracle Finl. Service85,11236.4", "OFSS", url="https://trendlyne.com/equity/964/OFSS/oracle-financial-services-software-ltd/"),
+    "1526": _record("Wipro2,66,17819.77", "WIPRO"),
+    "604": _record("Impex Ferro Tech12.5", "IMPEXFERRO", exchange="BSE"),
+    # Scraped name and symbol belong to another listing; the URL identifies the stock
+    "560": _record("Le Lavoir8462.88", "LELAVOIR", exchange="BSE", url="https://trendlyne.com/equity/560/HINDUNILVR/hindustan-unilever-ltd/"),
+    "807": _record("Mahindra & Mahindra3,92,11029.1", "M&M"),
+}
+
+def test_exact_and_fuzzy_matches():
+    """Names, symbols, slugs and aliases are exact; misspellings and partial names are fuzzy"""
+    print("=== Testing Company Matching ===")
+    index = CompanySearchIndex.build(COMPANIES)
+
+    assert normalize_company_name("Oracle Finl. Service85,11236.4") == "oracle financial service"
+    assert index.best_match("Tata Consultancy Services Ltd") == ("TCS", 1372)
+    assert index.best_match("infy") == ("Infosys", 630)
+    assert index.best_match("Infosys") == ("Infosys", 630)
+    assert index.best_match("M&M") == ("Mahindra & Mahindra", 807)
+    assert index.best_match("Hindustan Unilever") == ("Hindustan Unilever Ltd", 560)
+    assert index.best_match("Le Lavoir") is None
+
+    assert index.best_match("Infosis") == ("Infosys", 630)
+    assert index.best_match("Oracle Financial") == ("Oracle Finl. Service", 964)
+    assert index.best_match("Wipro Technologies") == ("Wipro", 1526)
+    assert index.best_match("Completely Unknown Corp") is None
+    print("✓ Exact, alias and fuzzy lookups resolve to the right stock ids")
+
+def test_real_database_lookups():
+    """The extractor resolves names from utils/trendlyne.db; token writes keep the index"""
+    print("\n=== Testing Lookups Against trendlyne.db ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "trendlyne.db")
+        shutil.copy(SEED_DB_PATH, db_path)
+        store = TrendlyneTokenStore(db_path)
+        extractor = TrendlyneCompanyTokenExtractor(store=store)
+        assert extractor.get_company_id("TCS") == ("TCS", 1372)
+        assert extractor.get_company_id("Reliance Industries")[1] == 1127
+
+        start = time.perf_counter()
+        for _ in range(50):
+            extractor._find_best_match("Happiest Minds")
+        per_lookup = (time.perf_counter() - start) / 50
+
+        index = get_company_index(store.db_path, store.companies, version=store.catalog_version())
+        assert extractor._update_company_token(1372, "NEWTOKEN======")
+        assert get_company_index(store.db_path, store.companies, version=store.catalog_version()) is index
+        store.close()
+    print(f"✓ Fuzzy lookup over {len(index.stock_ids)} companies takes {per_lookup * 1e6:.0f}us")
+
+def test_saved_index_follows_source():
+    """The saved index is reused, in this process and the next, until the JSON changes"""
+    print("\n=== Testing Company Index Cache ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "companies.json")
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(COMPANIES, f)
+
+        loads = []
+        def load():
+            loads.append(1)
+            with open(source, encoding="utf-8") as f:
+                return json.load(f)
+
+        index = get_company_index(source, load)
+        assert get_company_index(source, load) is index and len(loads) == 1
+
+        # A new process loads the saved index instead of rebuilding it
+        with open(index_path_for(source), encoding="utf-8") as f:
+            saved = CompanySearchIndex.from_json(json.load(f)["index"])
+        assert saved.to_json() == index.to_json() and saved.keys == index.keys
+        company_search._indexes.clear()
+        reloaded = get_company_index(source, load)
+        assert reloaded is not index and len(loads) == 1
+        assert reloaded.best_match("Wipro Technologies") == ("Wipro", 1526)
+
+        companies = dict(COMPANIES, **{"1362": _record("Tata Motors3,41,0158.2", "TATAMOTORS")})
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(companies, f)
+        os.utime(source, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+        rebuilt = get_company_index(source, load)
+        assert rebuilt is not index and len(loads) == 2
+        assert rebuilt.best_match("Tata Motors Ltd.") == ("Tata Motors", 1362)
+    print("✓ Index rebuilt only after the source changed")
+
+if __name__ == "__main__":
+    test_exact_and_fuzzy_matches()
+    test_real_database_lookups()
+    test_saved_index_follows_source()
+    print("\nAll company search tests passed")
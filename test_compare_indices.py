@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized index comparison: one fetch per index across all timeframes,
+N-index support and agreement with a straightforward per-timeframe computation
+"""
+
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from connectors.indices_tracker import NiftyIndicesTracker
+
+SERIES = {
+    "Nifty 50": lambda n: 24000 + 10 * n + 200 * np.sin(n / 5),
+    "Nifty IT": lambda n: 35000 - 15 * n + 400 * np.cos(n / 7),
+    "Nifty Bank": lambda n: 51000 + 25 * n,
+}
+
+class StubTracker(NiftyIndicesTracker):
+    """Deterministic close series; counts fetches per index"""
+    def __init__(self):
+        super().__init__(use_store=False)
+        self.fetches = []
+
+    def fetch_historical_data(self, index_name, start_date, end_date):
+        self.fetches.append((index_name, start_date, end_date))
+        if index_name not in SERIES:
+            return None
+        days = pd.bdate_range(pd.to_datetime(start_date, format='%d-%b-%Y'), pd.to_datetime(end_date, format='%d-%b-%Y'))
+        closes = SERIES[index_name](np.array([day.toordinal() - 739000 for day in days]))
+        return pd.DataFrame({"Date": days, "Close": closes, "Index": index_name})
+
+def _reference(values):
+    """The pre-vectorization metric formulas on a list of closes"""
+    daily = [(values[i] - values[i - 1]) / values[i - 1] * 100 for i in range(1, len(values))]
+    return ((values[-1] - values[0]) / values[0]) * 100, pd.Series(daily).std()
+
+def test_two_index_comparison_matches_reference():
+    """Same keys and numbers as before, from a single fetch per index"""
+    print("=== Testing Two-Index Comparison ===")
+    tracker = StubTracker()
+    timeframes = ["1w", "1m", "3m", "6m", "1y"]
+
+    result = tracker.compare_indices("Nifty 50", "Nifty IT", timeframes)
+
+    assert sorted(name for name, _, _ in tracker.fetches) == ["Nifty 50", "Nifty IT"]
+    assert list(result) == timeframes
+    for timeframe in timeframes:
+        row = result[timeframe]
+        start, end = tracker.get_timeframe_dates(timeframe)
+        closes = {name: tracker.fetch_historical_data(name, start, end)["Close"].tolist() for name in ("Nifty 50", "Nifty IT")}
+        for name, values in closes.items():
+            expected_return, expected_vol = _reference(values)
+            assert row[f"{name}_return"] == round(expected_return, 2), (timeframe, name)
+            assert row[f"{name}_volatility"] == round(expected_vol, 2), (timeframe, name)
+            assert row[f"{name}_start"] == values[0] and row[f"{name}_end"] == values[-1]
+        assert abs(row["outperformance"] - (row["Nifty IT_return"] - row["Nifty 50_return"])) < 0.02
+        assert row["data_points"] == len(closes["Nifty 50"])
+        assert row["Nifty IT_max_drawdown"] <= 0 and "Nifty IT_relative_strength" in row
+    print("✓ 5 timeframes from 2 fetches, metrics match the loop-based formulas")
+
+def test_many_indices_and_errors():
+    """Sector-wide comparison against a benchmark; unknown indices and timeframes are reported"""
+    print("\n=== Testing N-Index Comparison ===")
+    tracker = StubTracker()
+
+    result = tracker.compare_many(["Nifty IT", "Nifty Bank"], ["1m", "2d"], benchmark="Nifty 50")
+    row = result["1m"]
+    assert len(tracker.fetches) == 3
+    assert {"Nifty 50_return", "Nifty IT_return", "Nifty Bank_return"} <= set(row)
+    assert "Nifty 50_relative_strength" not in row and "outperformance" not in row
+    expected = ((1 + row["Nifty Bank_return"] / 100) / (1 + row["Nifty 50_return"] / 100) - 1) * 100
+    assert abs(row["Nifty Bank_relative_strength"] - expected) < 0.02
+    assert row["Nifty Bank_max_drawdown"] == 0.0
+    assert "Invalid timeframe" in result["2d"]["error"]
+
+    # A malformed custom range only fails its own timeframe
+    result = tracker.compare_many(["Nifty IT", "Nifty 50"], ["2024-01-01,2024-03-31", "1m"])
+    assert "error" in result["2024-01-01,2024-03-31"] and "Nifty IT_return" in result["1m"]
+
+    missing = tracker.compare_indices("Nifty 50", "Nifty Unknown", ["1m"])
+    assert missing["1m"]["error"] == "Data unavailable for Nifty Unknown"
+    print("✓ 3 indices compared against Nifty 50, errors kept per timeframe")
+
+def test_empty_and_duplicate_indices():
+    """An empty list is rejected; repeated spellings of one index are fetched once and keep outperformance"""
+    print("\n=== Testing Empty and Duplicate Indices ===")
+    tracker = StubTracker()
+    try:
+        tracker.compare_many([], ["1m"])
+        raise AssertionError("compare_many([]) should raise ValueError")
+    except ValueError:
+        pass
+
+    same = tracker.compare_indices("Nifty IT", "nifty it", ["1m"])["1m"]
+    assert len(tracker.fetches) == 1
+    assert same["outperformance"] == 0.0 and "nifty it_return" not in same
+
+    row = tracker.compare_many(["Nifty IT", "Nifty 50", "NIFTY IT"], ["1m"], benchmark="nifty 50")["1m"]
+    assert {key for key in row if key.endswith("_return")} == {"Nifty IT_return", "Nifty 50_return"}
+    assert "Nifty 50_relative_strength" not in row and "Nifty IT_relative_strength" in row
+    print("✓ Empty list raises ValueError; duplicate spellings collapse to one column")
+
+if __name__ == "__main__":
+    test_two_index_comparison_matches_reference()
+    test_many_indices_and_errors()
+    test_empty_and_duplicate_indices()
+    print("\nAll index comparison tests passed")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test embedding reuse: process-wide query cache, on-disk embedding store,
+request coalescing and single-embed RAG retrieval
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.gemini_embedding import GeminiEmbedding, EmbeddingStore, EmbeddingBatcher, query_embedding_cache
+from connectors.local_docs_connector import DataRetriever
+
+class StubModels:
+    """Counts embed_content calls, and how many run at once; returns a deterministic vector per text"""
+    def __init__(self, latency=0.0):
+        self.calls = 0
+        self.latency = latency
+        self.threads = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def embed_content(self, model, contents, config):
+        with self.lock:
+            self.calls += 1
+            self.threads.append(threading.get_ident())
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+        texts = [contents] if isinstance(contents, str) else contents
+        return SimpleNamespace(embeddings=[
+            SimpleNamespace(values=[float(len(text)), float(sum(map(ord, text)) % 97)]) for text in texts
+        ])
+
+def make_stub_embedding(store=None, coalesce=False, latency=0.0):
+    embedding = GeminiEmbedding.__new__(GeminiEmbedding)
+    embedding.embedding_dimensions = 2
+    embedding.embedding_model = "gemini-embedding-001"
+    embedding.client = SimpleNamespace(models=StubModels(latency))
+    embedding.store = store
+    embedding.rate_limiter = None
+    embedding.batcher = EmbeddingBatcher(embedding._embed_batch, window=0.05) if coalesce else None
+    return embedding
+
+class StubCollection:
+    def __init__(self, result):
+        self.result = result
+        self.queries = []
+
+    def search_by_embedding(self, query, n_results=3, filter_param=None):
+        self.queries.append(query)
+        return self.result
+
+def test_query_embedding_cached():
+    print("=== Testing Process-wide Query Embedding Cache ===")
+    embedding = make_stub_embedding()
+    first = embedding.embed("Indian IT outlook FY26", task_type="RETRIEVAL_QUERY")
+    second = embedding.embed("Indian IT outlook FY26", task_type="retrieval_query")
+    other_task = embedding.embed("Indian IT outlook FY26", task_type="RETRIEVAL_DOCUMENT")
+
+    assert first == second == other_task
+    assert embedding.client.models.calls == 2
+    assert query_embedding_cache.hits >= 1
+    print("✓ Repeated query served from cache; task type is part of the key")
+
+def test_retrieve_embeds_once():
+    print("\n=== Testing Single Embedding per RAG Lookup ===")
+    retriever = DataRetriever.__new__(DataRetriever)
+    retriever.gemini_embedding = make_stub_embedding()
+    retriever.summary_collection = StubCollection({"metadatas": [[{"source": "report_a"}]]})
+    retriever.chunk_collection = StubCollection({"documents": [["chunk 1", "chunk 2"]]})
+
+    chunks = retriever.retrieve("AI deflation impact on IT services pricing")
+
+    assert chunks == ["chunk 1", "chunk 2"]
+    assert retriever.gemini_embedding.client.models.calls == 1
+    assert retriever.summary_collection.queries[0] == retriever.chunk_collection.queries[0]
+    print("✓ Both retrieval stages share one embedding")
+
+def test_disk_store_serves_hits_and_only_embeds_misses():
+    print("\n=== Testing On-disk Embedding Store ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        embedding = make_stub_embedding(EmbeddingStore(2, tmp, min_capacity=2))
+        chunks = ["chunk one", "chunk two", "chunk one"]
+        first = embedding.embed(chunks)
+        assert embedding.client.models.calls == 1
+        assert first[0] == first[2]
+
+        # Fresh process: new store instance over the same files, one new chunk
+        reopened = make_stub_embedding(EmbeddingStore(2, tmp, min_capacity=2))
+        second = reopened.embed(["chunk two", "chunk three", "chunk one", "chunk four"])
+        assert reopened.client.models.calls == 1
+        assert second[0] == first[1] and second[2] == first[0]
+        assert len(reopened.store) == 4
+
+        # Fully cached batch and single string: no API calls at all
+        reopened.embed(["chunk four", "chunk three"])
+        reopened.embed("chunk one")
+        assert reopened.client.models.calls == 1
+        print("✓ Store persisted 4 embeddings across instances and embedded only misses")
+
+def test_concurrent_calls_coalesce_into_one_request():
+    print("\n=== Testing Embedding Request Coalescing ===")
+    embedding = make_stub_embedding(coalesce=True, latency=0.05)
+    texts = [f"coalesced query {i % 6}" for i in range(12)]
+    barrier = threading.Barrier(len(texts))
+
+    def call(text):
+        barrier.wait()
+        return embedding.embed(text, task_type="RETRIEVAL_QUERY")
+
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        results = list(executor.map(call, texts))
+
+    assert embedding.client.models.calls == 1, embedding.client.models.calls
+    assert results[0] == results[6] and results[0] != results[1]
+    print(f"✓ {len(texts)} concurrent calls served by {embedding.client.models.calls} batch request")
+
+def test_short_batch_response_fails_every_caller():
+    """A response with fewer embeddings than texts raises for every waiting caller instead of hanging"""
+    print("\n=== Testing Short Batch Responses ===")
+    batcher = EmbeddingBatcher(lambda texts, task_type: [[1.0]] * (len(texts) - 1), window=0.05)
+    futures = [batcher.submit(f"text {i}", "RETRIEVAL_QUERY") for i in range(3)]
+    for future in futures:
+        assert isinstance(future.exception(timeout=5), ValueError)
+    assert batcher.requests_sent == 1
+    print("✓ All 3 futures failed with ValueError")
+
+def test_aembed_without_batcher_stays_off_the_loop():
+    """With coalescing off, aembed makes the API call on a worker thread"""
+    print("\n=== Testing aembed Without a Batcher ===")
+    embedding = make_stub_embedding(latency=0.05)
+
+    async def run():
+        loop_thread = threading.get_ident()
+        vector = await embedding.aembed("aembed off-loop query", task_type="RETRIEVAL_QUERY")
+        return loop_thread, vector
+
+    loop_thread, vector = asyncio.run(run())
+    assert vector == embedding.embed("aembed off-loop query", task_type="RETRIEVAL_QUERY")
+    assert embedding.client.models.calls == 1
+    assert embedding.client.models.threads[0] != loop_thread
+    print("✓ API call ran on a worker thread and the result was cached")
+
+def test_batch_path_pipelines_batches():
+    print("\n=== Testing Pipelined Batch Embedding ===")
+    embedding = make_stub_embedding(coalesce=True, latency=0.2)
+    chunks = [f"document chunk {i}" for i in range(350)]
+
+    start = time.perf_counter()
+    embeddings = embedding.embed(chunks)
+    elapsed = time.perf_counter() - start
+
+    assert len(embeddings) == 350 and embedding.client.models.calls == 4
+    assert embedding.client.models.peak > 1, embedding.client.models.peak
+    print(f"✓ 4 batches embedded in {elapsed:.3f}s, {embedding.client.models.peak} requests in flight")
+
+if __name__ == "__main__":
+    test_query_embedding_cached()
+    test_disk_store_serves_hits_and_only_embeds_misses()
+    test_concurrent_calls_coalesce_into_one_request()
+    test_short_batch_response_fails_every_caller()
+    test_aembed_without_batcher_stays_off_the_loop()
+    test_batch_path_pipelines_batches()
+    test_retrieve_embeds_once()
+    print("\nAll embedding cache tests passed")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test the shared connector HTTP transport against a local server: keep-alive
+connection reuse and retry with backoff, for both the sync session and the
+async client
+"""
+
+import sys
+import os
+import json
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import connectors.http_transport as http_transport
+from connectors.http_transport import HttpTransportConfig, configure_http_transport, get_session, get_async_client, arequest, allow_post_retries
+from connectors.jina_web_connector import JinaSearchTool
+
+class LocalServer:
+    """Counts TCP connections and fails the first `failures` requests with 503"""
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.connections = set()
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.connections.add(self.client_address)
+                server.requests += 1
+                if server.failures > 0:
+                    server.failures -= 1
+                    self._reply(503, {"error": "busy"})
+                else:
+                    self._reply(200, {"data": [{"title": "IT sector news", "url": self.path}]})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.do_GET()
+
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def _fast_retries():
+    configure_http_transport(HttpTransportConfig(retries=2, backoff_factor=0.01, read_timeout=5.0))
+
+def test_session_reuses_connection_and_retries():
+    """Sequential calls share one keep-alive connection; 503s are retried"""
+    print("=== Testing Shared Session ===")
+    _fast_retries()
+    server = LocalServer(failures=2)
+    try:
+        responses = [get_session().get(f"{server.url}/q{n}") for n in range(5)]
+        assert [response.status_code for response in responses] == [200] * 5
+        assert server.requests == 7
+        assert len(server.connections) == 1, server.connections
+    finally:
+        server.close()
+    print("✓ 5 calls (+2 retries) over 1 connection")
+
+def test_async_client_reuses_connection_and_retries():
+    """arequest retries 503s and the Jina async path reuses the loop's pooled client"""
+    print("\n=== Testing Shared Async Client ===")
+    _fast_retries()
+    server = LocalServer(failures=1)
+    tool = JinaSearchTool(api_key="test-key")
+    tool.base_url = server.url + "/?q={query}"
+
+    async def run():
+        first = await arequest("GET", f"{server.url}/first")
+        results = [await tool.asearch(f"infosys {n}") for n in range(3)]
+        return first, results
+
+    try:
+        first, results = asyncio.run(run())
+        assert first.status_code == 200
+        assert all(result[0]["title"] == "IT sector news" for result in results)
+        assert server.requests == 5
+        assert len(server.connections) == 1, server.connections
+    finally:
+        server.close()
+    print("✓ 4 async calls (+1 retry) over 1 connection")
+
+def test_post_retries_only_for_registered_prefixes():
+    """POSTs are sent once unless their endpoint was registered as a read-only query"""
+    print("\n=== Testing POST Retry Scope ===")
+    _fast_retries()
+    server = LocalServer(failures=1)
+    try:
+        assert get_session().post(f"{server.url}/orders", json={}).status_code == 503
+        server.failures = 1
+        assert asyncio.run(arequest("POST", f"{server.url}/orders", json={})).status_code == 503
+        assert server.requests == 2
+
+        server.failures = 1
+        allow_post_retries(f"{server.url}/history")
+        assert get_session().post(f"{server.url}/history", json={}).status_code == 200
+        assert server.requests == 4
+        server.failures = 1
+        assert asyncio.run(arequest("POST", f"{server.url}/history", json={})).status_code == 200
+        assert server.requests == 6
+    finally:
+        http_transport._post_retry_prefixes.discard(f"{server.url}/history")
+        server.close()
+    print("✓ Unregistered POST sent once; registered POST retried on sync and async paths")
+
+def test_configure_closes_async_clients():
+    """Reconfiguring closes the previous async clients instead of dropping them open"""
+    print("\n=== Testing Async Client Close On Reconfigure ===")
+    _fast_retries()
+    loop = asyncio.new_event_loop()
+    try:
+        async def client():
+            return get_async_client()
+
+        old_client = loop.run_until_complete(client())
+        _fast_retries()
+        assert old_client.is_closed
+        new_client = loop.run_until_complete(client())
+        assert new_client is not old_client and not new_client.is_closed
+    finally:
+        loop.close()
+    print("✓ Old async client closed on its own loop")
+
+if __name__ == "__main__":
+    test_session_reuses_connection_and_retries()
+    test_async_client_reuses_connection_and_retries()
+    test_post_retries_only_for_registered_prefixes()
+    test_configure_closes_async_clients()
+    print("\nAll HTTP transport tests passed")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed index-name lookup: aliases, ranked fuzzy matches, lookup
+latency and the on-disk cache keyed by the indices CSV
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from connectors.index_names import get_index_name_index
+from connectors.indices_tracker import NiftyIndicesTracker
+from query_router import FastPathRouter
+
+def test_aliases_and_ranked_matches():
+    """Names, ids, compact spellings and CNX-era names resolve; fuzzy terms are ranked"""
+    print("=== Testing Index Name Resolution ===")
+    tracker = NiftyIndicesTracker(use_store=False)
+
+    for term in ["Nifty IT", "nifty it", "niftyit", "cnx it", "CNX IT", "15", "nifty information technology"]:
+        assert tracker.find_index_name(term) == "Nifty IT", term
+    assert tracker.find_index_name("bank nifty") == "Nifty Bank"
+    assert tracker.find_index_name("nifty private banks") == "Nifty Private Bank"
+    assert tracker.find_index_name("Nifty Unknown") is None
+
+    matches = tracker.match_index_names("nifty midcap", limit=3)
+    assert [name for name, _ in matches] == ["Nifty Midcap 50", "NIFTY Midcap 100", "Nifty Midcap 150"]
+    assert tracker.match_index_names("IT")[0][0] == "Nifty IT"
+    assert tracker.match_index_names("IT")[0][1] > tracker.match_index_names("IT")[1][1]
+    assert "Nifty IT" in tracker.list_indices() and tracker.indices_map["nifty it"] == "Nifty IT"
+
+    start = time.perf_counter()
+    for _ in range(200):
+        tracker.find_index_name("nifty it index")
+    per_lookup = (time.perf_counter() - start) / 200
+    # Lookups go through one index per process instead of rebuilding it per tracker
+    assert NiftyIndicesTracker(use_store=False).name_index is tracker.name_index
+
+    assert FastPathRouter().find_indices("How did CNX IT do vs Nifty Next 50?") == ["Nifty IT", "Nifty Next 50"]
+    print(f"✓ Aliases resolve from the shared index, fuzzy lookup takes {per_lookup * 1e6:.0f}us")
+
+def test_disk_cache_follows_csv():
+    """The cached index is reused until the CSV changes"""
+    print("\n=== Testing Index Name Cache ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "indices.csv")
+        cache_dir = os.path.join(tmp, "cache")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("index_id,index_name\n1,Nifty 50\n2,Nifty IT\n")
+
+        index = get_index_name_index(csv_path, cache_dir)
+        assert index.lookup("niftyit") == "Nifty IT"
+        with open(os.path.join(cache_dir, "index_names.json"), encoding="utf-8") as f:
+            assert json.load(f)["index"]["names"] == ["Nifty 50", "Nifty IT"]
+        assert get_index_name_index(csv_path, cache_dir) is index
+
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write("3,Nifty Pharma\n")
+        os.utime(csv_path, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+
+        rebuilt = get_index_name_index(csv_path, cache_dir)
+        assert rebuilt is not index
+        assert rebuilt.best_match("pharma") == "Nifty Pharma"
+    print("✓ Index rebuilt only after the CSV changed")
+
+if __name__ == "__main__":
+    test_aliases_and_ranked_matches()
+    test_disk_cache_follows_csv()
+    print("\nAll index name tests passed")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test the local index bar store: gap-only fetching, coverage merging, serving
+every timeframe/frequency from SQLite and concurrent multi-index fetches, with a
+stubbed niftyindices.com
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from types import SimpleNamespace
+from datetime import date, datetime, timedelta
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from connectors.indices_store import IndicesStore
+from connectors.indices_tracker import NiftyIndicesTracker
+from intelligent_data_loader import IntelligentFinancialDataLoader
+
+class RecordingTracker(NiftyIndicesTracker):
+    """Serves a synthetic close series and records which ranges hit the network, and how many at once"""
+    def __init__(self, store, delay=0.0):
+        super().__init__(store=store)
+        self.requests = []
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def _fetch_remote(self, exact_name, start_date, end_date):
+        with self.lock:
+            self.requests.append((start_date, end_date))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        days = pd.bdate_range(datetime.strptime(start_date, '%d-%b-%Y'), datetime.strptime(end_date, '%d-%b-%Y'))
+        closes = [30000.0 + (day - pd.Timestamp("2025-01-01")).days for day in days]
+        return pd.DataFrame({"Date": days, "Open": closes, "High": closes, "Low": closes, "Close": closes, "Index": exact_name})
+
+def test_missing_ranges_and_merge():
+    """Coverage is merged and only uncovered days come back as gaps"""
+    print("=== Testing Coverage Ranges ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = IndicesStore(os.path.join(tmp, "indices.sqlite3"))
+        store.save("NIFTY IT", None, date(2025, 1, 1), date(2025, 1, 10))
+        store.save("NIFTY IT", None, date(2025, 1, 20), date(2025, 1, 31))
+        assert store.missing_ranges("NIFTY IT", date(2025, 1, 5), date(2025, 2, 3)) == [
+            (date(2025, 1, 11), date(2025, 1, 19)),
+            (date(2025, 2, 1), date(2025, 2, 3)),
+        ]
+
+        store.save("NIFTY IT", None, date(2025, 1, 11), date(2025, 1, 19))
+        assert store.missing_ranges("NIFTY IT", date(2025, 1, 1), date(2025, 1, 31)) == []
+        assert store.missing_ranges("NIFTY 50", date(2025, 1, 1), date(2025, 1, 2)) == [(date(2025, 1, 1), date(2025, 1, 2))]
+
+        # Today's bar may still change, so it is never marked as fetched
+        today = date.today()
+        store.save("NIFTY IT", None, today - timedelta(days=3), today)
+        assert store.missing_ranges("NIFTY IT", today - timedelta(days=3), today) == [(today, today)]
+        store.close()
+    print("✓ Gaps computed against merged coverage; today stays open")
+
+def test_tracker_fetches_only_gaps():
+    """Overlapping requests hit the network once per unseen range"""
+    print("\n=== Testing Gap-Only Fetching ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = RecordingTracker(IndicesStore(os.path.join(tmp, "indices.sqlite3")))
+
+        wide = tracker.fetch_historical_data("Nifty IT", "01-Jan-2025", "31-Mar-2025")
+        narrow = tracker.get_data("Nifty IT", "01-Feb-2025", "28-Feb-2025")
+        weekly = tracker.get_data("Nifty IT", "01-Jan-2025", "31-Mar-2025", frequency="weekly")
+        extended = tracker.fetch_historical_data("Nifty IT", "01-Jan-2025", "30-Apr-2025")
+
+        assert tracker.requests == [("01-Jan-2025", "31-Mar-2025"), ("01-Apr-2025", "30-Apr-2025")]
+        assert len(wide) == len(pd.bdate_range("2025-01-01", "2025-03-31"))
+        assert len(narrow) == 20 and narrow["04-Feb-2025"] == 30034.0
+        assert len(weekly) == 13
+        assert extended["Date"].is_monotonic_increasing and len(extended) == len(wide) + 22
+        assert list(extended.columns) == ["Date", "Open", "High", "Low", "Close", "Index"]
+    print("✓ 4 requests served with 2 network fetches")
+
+def test_fetch_many_concurrent_and_aligned():
+    """Indices are fetched in parallel into one wide frame; the market context shows all of them"""
+    print("\n=== Testing Bulk Fetch ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        tracker = RecordingTracker(IndicesStore(os.path.join(tmp, "indices.sqlite3")), delay=0.3)
+        indices = ["Nifty IT", "Nifty 50", "Nifty Next 50", "Nifty Unknown"]
+
+        start = time.monotonic()
+        wide = tracker.fetch_many(indices, "01-Jan-2025", "31-Mar-2025")
+        elapsed = time.monotonic() - start
+
+        # The 3 known indices were fetched at the same time
+        assert tracker.peak == 3, tracker.peak
+        assert list(wide.columns) == ["Nifty IT", "Nifty 50", "Nifty Next 50"]
+        assert len(wide) == len(pd.bdate_range("2025-01-01", "2025-03-31")) and not wide.isna().any().any()
+
+        weekly = tracker.fetch_many(indices[:3], "01-Jan-2025", "31-Mar-2025", "weekly")
+        assert len(tracker.requests) == 3 and len(weekly) == 13
+
+        loader = IntelligentFinancialDataLoader.__new__(IntelligentFinancialDataLoader)
+        loader.data_manager = SimpleNamespace(indices_connector=tracker)
+        context = loader.get_market_data_context(indices[:3], "3m")
+        assert all(f"{name} (3m performance):" in context for name in indices[:3])
+    print(f"✓ 3 indices fetched in {elapsed:.2f}s ({tracker.peak} at once) into one aligned frame")
+
+if __name__ == "__main__":
+    test_missing_ranges_and_merge()
+    test_tracker_fetches_only_gaps()
+    test_fetch_many_concurrent_and_aligned()
+    print("\nAll indices store tests passed")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test parallel dynamic query execution, the shared token-bucket rate limiter
+and pipelined prefetching of opponent-independent queries
+"""
+
+import sys
+import os
+import time
+import threading
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from agents import DebateAgent
+from config import AgentConfig, ModelConfig, QueryExecutionConfig
+from rate_limiter import TokenBucketRateLimiter, configure_rate_limiter
+
+class SlowDataLoader:
+    """Stands in for IntelligentFinancialDataLoader with a fixed per-query latency; tracks queries in flight"""
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.queries = []
+        self.in_flight = 0
+        self.peak = 0
+
+    def get_intelligent_context(self, query_context=None):
+        with self.lock:
+            self.queries.append(query_context)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+        if "fail" in query_context:
+            raise RuntimeError("connector down")
+        return f"Context for {query_context}: " + "x" * 100
+
+def _make_agent(parallel=True):
+    configure_rate_limiter("data_queries", rate=100, capacity=10)
+    agent_config = AgentConfig(
+        name="Test Growth Believer",
+        role="Test Analyst",
+        perspective="bullish",
+        model=ModelConfig(model_name="x-ai/grok-4-fast:free", api_key_env="OPENROUTER_API_KEY"),
+        system_prompt="You are a test analyst focused on Indian IT sector.",
+        max_turns=2,
+        query_execution=QueryExecutionConfig(parallel=parallel, max_concurrent_queries=3)
+    )
+    return DebateAgent(agent_config, SlowDataLoader())
+
+def test_token_bucket_limits_rate():
+    """Burst passes immediately, then acquisitions are spaced by the refill rate"""
+    print("=== Testing Token Bucket Rate Limiter ===")
+    limiter = TokenBucketRateLimiter(rate=20, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    # 2 burst tokens + 2 refilled at 20/s => at least ~0.1s
+    assert elapsed >= 0.08, elapsed
+    assert limiter.try_acquire() is False
+    assert limiter.acquire(timeout=0.001) is False
+    print(f"✓ 4 acquisitions took {elapsed:.3f}s")
+
+def test_parallel_queries_keep_order():
+    """Queries run concurrently (up to max_concurrent_queries) and keep their ordering"""
+    print("\n=== Testing Parallel Query Fan-out ===")
+    agent = _make_agent(parallel=True)
+    queries = ["first query", "second fail query", "third query"]
+
+    start = time.monotonic()
+    results = agent._run_queries(queries)
+    elapsed = time.monotonic() - start
+
+    assert 1 < agent.data_loader.peak <= 3, agent.data_loader.peak
+    assert [succeeded for _, succeeded in results] == [True, False, True]
+    assert "DYNAMIC QUERY 1: first query" in results[0][0][0]
+    assert "QUERY 2 - DATA UNAVAILABLE" in results[1][0][0]
+    assert "DYNAMIC QUERY 3: third query" in results[2][0][0]
+    print(f"✓ 3 queries completed in {elapsed:.3f}s ({agent.data_loader.peak} in flight) with ordering preserved")
+
+def test_sequential_mode():
+    """Sequential mode still runs queries one after another"""
+    print("\n=== Testing Sequential Query Mode ===")
+    agent = _make_agent(parallel=False)
+
+    start = time.monotonic()
+    results = agent._run_queries(["a query", "b query"])
+    elapsed = time.monotonic() - start
+
+    assert agent.data_loader.peak == 1
+    assert all(succeeded for _, succeeded in results)
+    print(f"✓ Sequential mode took {elapsed:.3f}s")
+
+def test_prefetched_queries_merge_first():
+    """Prefetched sector queries run in the background and lead the intelligence block"""
+    print("\n=== Testing Pipelined Prefetch ===")
+    agent = _make_agent(parallel=True)
+    prompts = []
+    agent.llm = SimpleNamespace(invoke=lambda prompt: prompts.append(prompt) or SimpleNamespace(content="1. opponent query a\n2. opponent query b"))
+
+    prefetched = agent.prefetch_intelligence()
+    prefetched.result(timeout=5)  # Opponent is speaking meanwhile
+    prefetched_queries = list(agent.data_loader.queries)
+
+    start = time.monotonic()
+    intelligence = agent._formulate_and_execute_queries("IT sector", ["Margins are collapsing"], 3, prefetched=prefetched)
+    elapsed = time.monotonic() - start
+
+    assert "EXACTLY 2 queries" in prompts[0]
+    assert "DYNAMIC QUERY 1: Nifty IT sector outperformance" in intelligence
+    assert intelligence.index("DYNAMIC QUERY 2: opponent query a") < intelligence.index("DYNAMIC QUERY 3: opponent query b")
+    # The prefetched query is not run again; only the 2 opponent queries are left
+    assert len(prefetched_queries) == 1
+    assert agent.data_loader.queries[0] == prefetched_queries[0] and len(agent.data_loader.queries) == 3
+    print(f"✓ Remaining queries took {elapsed:.3f}s after the opponent's message")
+
+def test_cancel_stops_running_prefetch():
+    """cancel() on a running prefetch skips its remaining queries; close() releases the prefetch thread"""
+    print("\n=== Testing Prefetch Cancellation ===")
+    agent = _make_agent(parallel=False)
+    prefetched = agent.prefetch_intelligence(num_queries=3)
+
+    deadline = time.monotonic() + 5
+    while not agent.data_loader.queries and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert prefetched.cancel() is False  # Already running: the flag stops it instead
+    queries, results = prefetched.result(timeout=5)
+
+    assert len(queries) == 3 and len(agent.data_loader.queries) == 1
+    assert [succeeded for _, succeeded in results] == [True, False, False]
+
+    executor = agent._prefetch_executor
+    queued = [agent.prefetch_intelligence(), agent.prefetch_intelligence()]
+    agent.close()
+    assert agent._prefetch_executor is None and executor._shutdown
+    assert queued[1].cancelled()
+    assert agent.prefetch_intelligence().result(timeout=5)[1][0][1] is True
+    print("✓ Cancelled prefetch ran 1 of 3 queries; close() shut down the prefetch thread")
+
+if __name__ == "__main__":
+    test_token_bucket_limits_rate()
+    test_parallel_queries_keep_order()
+    test_sequential_mode()
+    test_prefetched_queries_merge_first()
+    test_cancel_stops_running_prefetch()
+    print("\nAll parallel query tests passed")
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test local routing: the persistent routing cache and the rule-based fast path
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from routing_cache import RoutingCache, normalize_query
+from query_router import FastPathRouter
+
+def _toy_embedder(text):
+    """Bag-of-letters embedding: near-identical strings map to near-identical vectors"""
+    vector = [0.0] * 26
+    for ch in text.lower():
+        if "a" <= ch <= "z":
+            vector[ord(ch) - ord("a")] += 1.0
+    return vector
+
+def test_routing_cache_exact_and_semantic_hits():
+    print("=== Testing Routing Cache ===")
+    selection = json.dumps({"RAG": {"tool_args": {"query": "Nifty IT outlook"}}})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = RoutingCache(os.path.join(tmp, "routing.sqlite3"), embedder=_toy_embedder, similarity_threshold=0.98)
+        assert cache.get("Nifty IT outlook") is None
+
+        cache.put("Nifty IT outlook", selection)
+        cache.put("ignored", "not json")
+
+        assert normalize_query("  NIFTY   IT outlook? ") == "nifty it outlook"
+        assert cache.get("  NIFTY   IT outlook? ") == selection
+        # Near-duplicate hit keeps the tool names but takes the args from this query
+        assert json.loads(cache.get("Nifty IT outlooks")) == {"RAG": {"tool_args": {"query": "Nifty IT outlooks"}}}
+        assert cache.get("YouTube interviews on H1B visa rules") is None
+
+        stats = cache.stats()
+        assert stats["hits_exact"] == 1 and stats["hits_semantic"] == 1 and stats["misses"] == 2, stats
+        assert stats["entries"] == 1, stats
+
+        # Persisted across instances
+        reopened = RoutingCache(os.path.join(tmp, "routing.sqlite3"))
+        assert reopened.get("nifty it outlook") == selection
+        print(f"✓ Routing cache stats: {stats}")
+
+def test_routing_cache_rebinds_near_duplicate_args():
+    print("\n=== Testing Routing Cache Arg Rebinding ===")
+    router = FastPathRouter()
+    stored_query = "nifty 500 from 2024-01-01 to 2024-01-05"
+    selection = json.dumps({
+        "RAG": {"tool_args": {"query": stored_query}},
+        "Indices Tracker": {"tool_args": router.bind_tool_args("Indices Tracker", stored_query)},
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = RoutingCache(os.path.join(tmp, "routing.sqlite3"), embedder=_toy_embedder,
+                             similarity_threshold=0.95, arg_binder=router.bind_tool_args)
+        cache.put(stored_query, selection)
+
+        # Same letters, different dates: must not reuse the stored window
+        query = "nifty 500 from 2024-02-01 to 2024-02-05"
+        rebound = json.loads(cache.get(query))
+        assert rebound["RAG"]["tool_args"] == {"query": query}
+        assert rebound["Indices Tracker"]["tool_args"] == {
+            "index_name": "Nifty 500", "start_date": "01-Feb-2024", "end_date": "05-Feb-2024", "frequency": "daily"
+        }, rebound
+
+        # Different index: args come from the index this query names
+        query = "nifty 100 from 2024-01-01 to 2024-01-05"
+        rebound = json.loads(cache.get(query))
+        assert rebound["Indices Tracker"]["tool_args"]["index_name"] == "Nifty 100", rebound
+
+        # Without a binder, query-specific args can only be served on an exact hit
+        unbound = RoutingCache(os.path.join(tmp, "routing.sqlite3"), embedder=_toy_embedder, similarity_threshold=0.95)
+        assert unbound.get("nifty 500 from 2024-02-01 to 2024-02-05") is None
+        assert unbound.get(stored_query) == selection
+        assert unbound.stats()["hits_semantic"] == 0
+        print("✓ Near-duplicate hits rebind index and date args from the current query")
+
+def test_routing_cache_ttl_and_lru():
+    print("\n=== Testing Routing Cache TTL and LRU Eviction ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = RoutingCache(os.path.join(tmp, "routing.sqlite3"), max_entries=2)
+        for query in ("query one", "query two"):
+            cache.put(query, json.dumps({"RAG": {}}))
+        cache.get("query one")
+        cache.put("query three", json.dumps({"RAG": {}}))
+
+        assert cache.get("query two") is None
+        assert cache.get("query one") is not None
+        assert cache.get("query three") is not None
+
+        cache.ttl_seconds = -1
+        assert cache.get("query one") is None
+        print("✓ LRU eviction and TTL expiry working")
+
+def test_fast_path_routes_obvious_queries():
+    print("\n=== Testing Fast-Path Router ===")
+    router = FastPathRouter()
+
+    selection = router.try_route("Nifty IT vs Nifty 50 performance comparison Q3 FY26 sector relative strength")
+    assert selection["Index Comparison"]["tool_args"]["index1"] == "Nifty IT"
+    assert selection["Index Comparison"]["tool_args"]["index2"] == "Nifty 50"
+    assert "Jina Web Connector" in selection and "RAG" in selection
+
+    selection = router.try_route("what is the value of nifty 500 from 2024-01-01 to 2024-01-05")
+    assert selection["Indices Tracker"]["tool_args"] == {
+        "index_name": "Nifty 500", "start_date": "01-Jan-2024", "end_date": "05-Jan-2024", "frequency": "daily"
+    }
+
+    selection = router.try_route("what did analysts say in interviews about H1B rules for indian IT")
+    assert "YouTube Connector" in selection
+
+    selection = router.try_route("Latest news on Infosys large deal wins")
+    assert "Jina Web Connector" in selection
+
+    # Nothing beyond generic sector wording: defer to the LLM
+    assert router.try_route("Indian IT services client concentration") is None
+    # A single generic web word is not enough to skip the LLM
+    for query in ["How did Infosys deal pipeline evolve?", "Is TCS a good buy given current valuations?",
+                  "What is the impact of AI on IT services margins?", "Outlook for mid-tier IT companies"]:
+        assert router.try_route(query) is None, query
+    print("✓ Fast path routes comparison, tracker, interview and news queries; defers vague ones")
+
+if __name__ == "__main__":
+    test_routing_cache_exact_and_semantic_hits()
+    test_routing_cache_rebinds_near_duplicate_args()
+    test_routing_cache_ttl_and_lru()
+    test_fast_path_routes_obvious_queries()
+    print("\nAll routing tests passed")
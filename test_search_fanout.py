@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test concurrent tool dispatch in DataManager.search using stub connectors
+"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_manager import DataManager
+
+class InFlight:
+    """Counts stub tool calls running at once across every stub of one manager"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+class StubIndices:
+    def __init__(self, flight):
+        self.flight = flight
+
+    def get_data(self, index_name, start_date, end_date, frequency="daily"):
+        with self.flight:
+            time.sleep(0.3)
+        return {"01-Sep-2025": 35000.0}
+
+    def compare_indices(self, index1, index2, timeframes):
+        raise RuntimeError("niftyindices.com unavailable")
+
+class StubJina:
+    def __init__(self, flight):
+        self.flight = flight
+
+    def search(self, query):
+        with self.flight:
+            time.sleep(0.3)
+        return [{"title": "IT sector news", "content": "..."}]
+
+    async def asearch(self, query):
+        with self.flight:
+            await asyncio.sleep(0.3)
+        return [{"title": "IT sector news", "content": "..."}]
+
+class StubRetriever:
+    def __init__(self, flight):
+        self.flight = flight
+
+    def retrieve(self, query, chunk_count=5, doc_count=3):
+        with self.flight:
+            time.sleep(0.3)
+        return ["chunk about IT services demand"]
+
+    async def aretrieve(self, query, chunk_count=5, doc_count=3):
+        with self.flight:
+            await asyncio.sleep(0.3)
+        return ["chunk about IT services demand"]
+
+class StubYouTube:
+    def video_search(self, query, max_results=15):
+        time.sleep(2)
+        return []
+
+def make_stub_manager(tool_timeouts=None, speculative=True):
+    """Build a DataManager around stub connectors without touching any external API"""
+    manager = DataManager.__new__(DataManager)
+    manager.flight = InFlight()
+    manager.indices_connector = StubIndices(manager.flight)
+    manager.jina_connector = StubJina(manager.flight)
+    manager.local_docs_connector = StubRetriever(manager.flight)
+    manager.youtube_connector = StubYouTube()
+    manager.tool_timeouts = {**DataManager.DEFAULT_TOOL_TIMEOUTS, **(tool_timeouts or {})}
+    manager.default_tool_timeout = 60
+    manager.executor = ThreadPoolExecutor(max_workers=8)
+    manager.last_search_timings = {}
+    manager.speculative = speculative
+    return manager
+
+def test_tools_run_concurrently():
+    """Every selected tool and RAG are in flight at the same time"""
+    print("=== Testing Concurrent Tool Dispatch ===")
+    manager = make_stub_manager()
+    tools = json.dumps({
+        "Indices Tracker": {"tool_args": {"index_name": "Nifty IT", "start_date": "01-Sep-2025", "end_date": "30-Sep-2025"}},
+        "Jina Web Connector": {"tool_args": {"query": "Indian IT sector"}},
+    })
+
+    start = time.perf_counter()
+    result, timings = manager.search("Indian IT sector", tools=tools, return_timings=True)
+    elapsed = time.perf_counter() - start
+
+    assert manager.flight.peak == 3, manager.flight.peak
+    assert set(result) == {"Indices Tracker", "Jina Web Connector", "RAG"}
+    assert all(timings[name]["status"] == "ok" for name in result)
+    print(f"✓ 3 tools finished in {elapsed:.3f}s, timings: {timings}")
+
+def test_partial_results_on_failure_and_timeout():
+    """A failing tool and a slow tool are reported but do not sink the search"""
+    print("\n=== Testing Partial Results ===")
+    manager = make_stub_manager(tool_timeouts={"YouTube Connector": 0.5})
+    tools = json.dumps({
+        "Index Comparison": {"tool_args": {"index1": "Nifty 50", "index2": "Nifty IT", "timeframes": ["1m"]}},
+        "YouTube Connector": {"tool_args": {"query": "IT sector interviews"}},
+    })
+
+    start = time.perf_counter()
+    result, timings = manager.search("IT sector interviews", tools=tools, return_timings=True)
+    elapsed = time.perf_counter() - start
+
+    assert list(result) == ["RAG"]
+    assert timings["Index Comparison"]["status"] == "error"
+    assert timings["YouTube Connector"]["status"] == "timeout"
+    print(f"✓ Partial results returned in {elapsed:.3f}s: {timings}")
+
+def test_speculative_rag_overlaps_router():
+    """RAG starts with the router call, so routing and retrieval latencies overlap"""
+    print("\n=== Testing Speculative RAG ===")
+    for speculative in (True, False):
+        manager = make_stub_manager(speculative=speculative)
+        rag_started = threading.Event()
+        retrieve = manager.local_docs_connector.retrieve
+        manager.local_docs_connector.retrieve = lambda query, **kwargs: rag_started.set() or retrieve(query, **kwargs)
+        overlapped = []
+
+        def slow_router(query):
+            # Speculative RAG must already be running while the router is still deciding
+            overlapped.append(rag_started.wait(timeout=5 if speculative else 0.3))
+            return json.dumps({"RAG": {"tool_args": {"query": query}}})
+        manager._route_query = slow_router
+
+        start = time.perf_counter()
+        result = manager.search("Indian IT sector outlook")
+        elapsed = time.perf_counter() - start
+
+        assert list(result) == ["RAG"]
+        assert overlapped == [speculative], overlapped
+        print(f"✓ speculative={speculative}: {elapsed:.3f}s")
+
+def test_router_failure_cancels_speculative_rag():
+    """A routing error propagates and the speculative retrieval queued for it never runs"""
+    print("\n=== Testing Router Failure ===")
+    manager = make_stub_manager()
+    manager.executor = ThreadPoolExecutor(max_workers=1)
+    retrieved = []
+    manager.local_docs_connector.retrieve = lambda query, chunk_count=5, doc_count=3: retrieved.append(query)
+
+    def broken_router(query):
+        raise RuntimeError("router unavailable")
+    manager._route_query = broken_router
+
+    # Occupy the only worker so the speculative RAG call is still queued when routing fails
+    release = threading.Event()
+    manager.executor.submit(release.wait)
+    try:
+        manager.search("Indian IT sector outlook")
+        raise AssertionError("search should re-raise the routing error")
+    except RuntimeError as e:
+        assert str(e) == "router unavailable"
+    release.set()
+    manager.executor.shutdown(wait=True)
+
+    assert retrieved == []
+    print("✓ Routing error re-raised; queued RAG retrieval was cancelled")
+
+def test_async_search_many_on_one_loop():
+    """asearch runs tools as tasks; several searches share one event loop concurrently"""
+    print("\n=== Testing Async Search ===")
+    manager = make_stub_manager(tool_timeouts={"YouTube Connector": 0.5})
+    tools = json.dumps({
+        "Indices Tracker": {"tool_args": {"index_name": "Nifty IT", "start_date": "01-Sep-2025", "end_date": "30-Sep-2025"}},
+        "Jina Web Connector": {"tool_args": {"query": "Indian IT sector"}},
+        "YouTube Connector": {"tool_args": {"query": "IT sector interviews"}},
+    })
+
+    async def run_searches():
+        # Timed inside the loop: asyncio.run() also waits for the timed-out YouTube thread
+        start = time.perf_counter()
+        searches = await asyncio.gather(*(
+            manager.asearch(f"Indian IT sector {n}", tools=tools, return_timings=True) for n in range(5)
+        ))
+        return searches, time.perf_counter() - start
+
+    searches, elapsed = asyncio.run(run_searches())
+
+    # More tools in flight than one search launches means the searches overlapped
+    assert manager.flight.peak > 3, manager.flight.peak
+    for result, timings in searches:
+        assert list(result) == ["Indices Tracker", "Jina Web Connector", "RAG"]
+        assert timings["YouTube Connector"]["status"] == "timeout"
+    print(f"✓ 5 concurrent async searches finished in {elapsed:.3f}s with {manager.flight.peak} tool calls in flight")
+
+if __name__ == "__main__":
+    test_tools_run_concurrently()
+    test_partial_results_on_failure_and_timeout()
+    test_speculative_rag_overlaps_router()
+    test_router_failure_cancels_speculative_rag()
+    test_async_search_many_on_one_loop()
+    print("\nAll search fan-out tests passed")
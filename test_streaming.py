@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test streamed agent/meta-agent output and the incremental transcript/report writers
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import tempfile
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test-key")
+
+from agents import MetaAgent, MultiAgentDebateSystem, DebateMessage
+from streaming import MarkdownStreamWriter, arun_chain, run_chain
+
+class FakeChain:
+    """Stands in for prompt | llm, yielding the completion in chunks"""
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.invoked = False
+
+    def invoke(self, inputs):
+        self.invoked = True
+        return SimpleNamespace(content="".join(self.chunks))
+
+    def stream(self, inputs):
+        for chunk in self.chunks:
+            yield SimpleNamespace(content=chunk)
+
+def test_run_chain_streams_chunks():
+    """Chunks reach the callback in order and join to the full completion"""
+    print("=== Testing Chain Streaming ===")
+    chain = FakeChain(["Margins ", "", "expand ", "in Q2."])
+    received = []
+
+    content = run_chain(chain, {}, received.append)
+
+    assert content == "Margins expand in Q2."
+    assert received == ["Margins ", "expand ", "in Q2."]
+    assert not chain.invoked
+    assert run_chain(chain, {}) == content and chain.invoked
+    print("✓ Streamed 3 chunks, blocking invoke still available")
+
+class PartsChain:
+    """A provider that sends content as a list of typed parts"""
+    PARTS = [[{"type": "text", "text": "Deal "}, {"type": "tool_use", "id": "x"}], ["wins ", {"type": "text", "text": "grew."}]]
+
+    def invoke(self, inputs):
+        return SimpleNamespace(content=[part for chunk in self.PARTS for part in chunk])
+
+    def stream(self, inputs):
+        for chunk in self.PARTS:
+            yield SimpleNamespace(content=chunk)
+
+    async def ainvoke(self, inputs):
+        return self.invoke(inputs)
+
+    async def astream(self, inputs):
+        for chunk in self.stream(inputs):
+            yield chunk
+
+def test_list_content_keeps_text_parts():
+    """List-of-parts content is joined from its text parts, streamed or not"""
+    print("\n=== Testing List Content ===")
+    chain = PartsChain()
+    received = []
+
+    assert run_chain(chain, {}, received.append) == "Deal wins grew."
+    assert received == ["Deal ", "wins grew."]
+    assert run_chain(chain, {}) == "Deal wins grew."
+    assert asyncio.run(arun_chain(chain, {}, lambda text: None)) == "Deal wins grew."
+    assert asyncio.run(arun_chain(chain, {})) == "Deal wins grew."
+    print("✓ Text parts kept, other parts dropped, in all four paths")
+
+def test_turn_streams_to_transcript_file():
+    """A debate turn is written to the live transcript while the agent is still speaking"""
+    print("\n=== Testing Live Transcript Writer ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        events = []
+        stream = MarkdownStreamWriter(
+            os.path.join(tmp, "live_transcript.md"), name="transcript",
+            header_lines=["# Transcript", ""], listeners=[lambda *event: events.append(event)]
+        )
+        seen_mid_turn = []
+
+        def respond(on_chunk=None, **kwargs):
+            on_chunk("Opening ")
+            seen_mid_turn.append(stream.path.read_text(encoding="utf-8"))
+            on_chunk("argument.")
+            return DebateMessage(agent_name="Cynic", perspective="bearish", content="Opening argument.", turn_number=kwargs["turn_number"])
+
+        agent = SimpleNamespace(config=SimpleNamespace(name="Cynic", perspective="bearish"), respond=respond)
+        system = MultiAgentDebateSystem.__new__(MultiAgentDebateSystem)
+        message = system._respond(agent, stream, debate_context="IT sector", turn_number=2)
+        stream.close()
+
+        text = stream.path.read_text(encoding="utf-8")
+        assert message.content == "Opening argument."
+        assert seen_mid_turn[0].endswith("## Turn 2 - Cynic (BEARISH)\n\nOpening ")
+        assert text == "# Transcript\n\n## Turn 2 - Cynic (BEARISH)\n\nOpening argument.\n\n---\n\n"
+        assert events == [
+            ("transcript", "## Turn 2 - Cynic (BEARISH)", "Opening "),
+            ("transcript", "## Turn 2 - Cynic (BEARISH)", "argument."),
+        ]
+    print("✓ Partial turn visible on disk and forwarded to listeners")
+
+def test_meta_agent_streams_report():
+    """synthesize() passes report chunks through and returns the full report"""
+    print("\n=== Testing Streamed Synthesis ===")
+    meta_agent = MetaAgent.__new__(MetaAgent)
+    meta_agent._chain = FakeChain(["# Report\n", "Verdict: neutral"])
+    meta_agent._chain_lock = threading.Lock()
+    messages = [DebateMessage(agent_name="Growth Believer", perspective="bullish", content="Deals are strong", turn_number=1)]
+    received = []
+
+    report = meta_agent.synthesize(messages, on_chunk=received.append)
+
+    assert report == "# Report\nVerdict: neutral"
+    assert received == ["# Report\n", "Verdict: neutral"]
+    print("✓ Report streamed in 2 chunks")
+
+if __name__ == "__main__":
+    test_run_chain_streams_chunks()
+    test_list_content_keeps_text_parts()
+    test_turn_streams_to_transcript_file()
+    test_meta_agent_streams_report()
+    print("\nAll streaming tests passed")
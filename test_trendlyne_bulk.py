@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test the bulk Trendlyne fundamentals fetch: name resolution, parallel token
+refresh, the per-host concurrency cap and peer expansion, against a stubbed
+trendlyne.com and a copy of utils/trendlyne.db
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import connectors.trendlyne_connector as trendlyne_connector
+from connectors.trendlyne_connector import TrendlyneConnector
+from utils.trendlyne_token_store import SEED_DB_PATH, TrendlyneTokenStore
+from utils.trendlyne_company_token_extractor import TrendlyneCompanyTokenExtractor
+
+PEERS = {1372: [630, 1526, 999999999]}
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+class FakeTrendlyne:
+    """Fundamentals endpoint that rejects stale tokens and tracks requests in flight"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = []
+
+    def get(self, url, headers=None):
+        stock_id, token = url.rstrip("/").split("/")[-2:]
+        with self.lock:
+            self.requests.append(int(stock_id))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        if not token.startswith("FRESH") and not token.startswith("GOOD"):
+            return FakeResponse(403)
+        peers = [{"Stock": {"name": f"Peer {peer}", "url": f"/equity/{peer}/X/x/", "order_by": str(peer)}} for peer in PEERS.get(int(stock_id), [])]
+        return FakeResponse(200, {"body": {"pr": {"table_data": peers}, "quarterlyDataDump": {"consolidated": {"Q1": {"revenue": int(stock_id)}}}}})
+
+class StubExtractor(TrendlyneCompanyTokenExtractor):
+    def __init__(self, store):
+        super().__init__(store=store)
+        self.scraped = []
+
+    def _extract_token_from_equity_page(self, equity_url, stock_id):
+        self.scraped.append(int(stock_id))
+        time.sleep(0.05)
+        return f"FRESH{stock_id}"
+
+def test_bulk_fetch_refreshes_tokens_and_expands_peers():
+    """Missing and rejected tokens are refreshed in batches; peers are fetched in a second wave"""
+    print("=== Testing Bulk Fundamentals Fetch ===")
+    fake = FakeTrendlyne()
+    original_get_session = trendlyne_connector.get_session
+    trendlyne_connector.get_session = lambda: fake
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "trendlyne.db")
+        shutil.copy(SEED_DB_PATH, db_path)
+        store = TrendlyneTokenStore(db_path)
+        companies = [1372, 1374, 1023, 1544, 1267, 288827]
+        store.update_tokens({stock_id: f"GOOD{stock_id}" for stock_id in companies + [630, 1526]})
+        store.update_tokens({1374: "EXPIRED"})
+        store._conn.execute("UPDATE companies SET trendlyne_auth_token = NULL WHERE trendlyne_stock_id = '1544'")
+
+        connector = TrendlyneConnector.__new__(TrendlyneConnector)
+        connector.company_token_extractor = StubExtractor(store)
+        connector.base_url = "https://trendlyne.com/fundamentals/get-fundamental_results-v2/"
+        connector.cache = None
+        try:
+            assert connector.resolve_stock_ids([1372], ["TCS", "Zensar", "Nonexistent Widgets Corp"]) == [1372, 1544]
+
+            start = time.monotonic()
+            result = connector.get_info_bulk(stock_ids=companies, args=["quarterly_financials_consolidated"], include_peers=True)
+            elapsed = time.monotonic() - start
+        finally:
+            trendlyne_connector.get_session = original_get_session
+
+        assert list(result) == companies + [630, 1526, 999999999]
+        assert result[1374]["quarterly_financials_consolidated"] == {"Q1": {"revenue": 1374}}
+        assert result[999999999] is None and result[630]["peer_companies"] is None
+        assert sorted(connector.company_token_extractor.scraped) == [1374, 1544]
+        assert store.get_token(1374) == "FRESH1374" and store.get_token(1544) == "FRESH1544"
+        # Fetches overlapped but never exceeded the per-host cap of 4
+        assert 1 < fake.peak <= 4, fake.peak
+        store.close()
+    print(f"✓ 8 companies fetched in {elapsed:.2f}s with at most {fake.peak} requests in flight")
+
+if __name__ == "__main__":
+    test_bulk_fetch_refreshes_tokens_and_expands_peers()
+    print("\nAll Trendlyne bulk tests passed")
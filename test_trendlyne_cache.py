@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the Trendlyne fundamentals cache: quarter and results-season aware freshness,
+gzip round trips and get_info calls served without touching trendlyne.com
+"""
+
+import sys
+import os
+import gzip
+import time
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import connectors.trendlyne_connector as trendlyne_connector
+from connectors.trendlyne_cache import FundamentalsCache
+from connectors.trendlyne_connector import TrendlyneConnector
+from date_utils import get_current_financial_context, is_results_season
+
+PAYLOAD = {"body": {"quarterlyDataDump": {"standalone": {f"Q{i}": {"revenue": i * 1000.5, "notes": "x" * 200} for i in range(40)}}}}
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return PAYLOAD
+
+class FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, headers=None):
+        self.urls.append(url)
+        return FakeResponse()
+
+class FakeExtractor:
+    def get_company_token(self, stock_id, fetch_new=False):
+        return "TOKEN"
+
+def test_freshness_rules():
+    """Short TTL in results season, long TTL otherwise, and nothing survives a quarter change"""
+    print("=== Testing Cache Freshness ===")
+    assert is_results_season(get_current_financial_context(datetime(2026, 7, 10)))
+    assert not is_results_season(get_current_financial_context(datetime(2026, 8, 20)))
+    assert is_results_season(get_current_financial_context(datetime(2026, 5, 20)))  # Q4 results run to 60 days
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FundamentalsCache(tmp)
+        quiet = datetime(2026, 8, 20, 12)
+        assert cache.is_fresh(quiet - timedelta(days=3), now=quiet)
+        assert not cache.is_fresh(quiet - timedelta(days=8), now=quiet)
+
+        season = datetime(2026, 7, 10, 12)
+        assert cache.is_fresh(season - timedelta(hours=6), now=season)
+        assert not cache.is_fresh(season - timedelta(hours=13), now=season)
+
+        assert not cache.is_fresh(datetime(2026, 6, 30, 23), now=datetime(2026, 7, 1, 1))
+    print("✓ TTL follows results season; quarter change invalidates")
+
+def test_round_trip_and_connector():
+    """Entries are gzip-compressed; get_info and bulk fetches reuse them"""
+    print("\n=== Testing Cached get_info ===")
+    session = FakeSession()
+    original_get_session = trendlyne_connector.get_session
+    trendlyne_connector.get_session = lambda: session
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FundamentalsCache(tmp)
+        connector = TrendlyneConnector.__new__(TrendlyneConnector)
+        connector.company_token_extractor = FakeExtractor()
+        connector.base_url = "https://trendlyne.com/fundamentals/get-fundamental_results-v2/"
+        connector.cache = cache
+        try:
+            first = connector.get_info(stock_id=1372, args=["quarterly_financials_standalone"])
+            second = connector.get_info(stock_id=1372, args=["quarterly_financials_standalone"])
+            bulk = connector.fetch_fundamentals_many([1372, 630])
+        finally:
+            trendlyne_connector.get_session = original_get_session
+
+        assert first == second and bulk[1372] == PAYLOAD and bulk[630] == PAYLOAD
+        assert [url.split("/")[-3] for url in session.urls] == ["1372", "630"]
+
+        path = os.path.join(tmp, "1372.json.gz")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            raw_size = len(f.read())
+        compressed = os.path.getsize(path)
+        assert compressed < raw_size / 5
+
+        # An entry older than any TTL is refetched
+        old = time.time() - timedelta(days=30).total_seconds()
+        os.utime(path, (old, old))
+        assert cache.get(1372) is None and cache.get(630) == PAYLOAD
+    print(f"✓ 3 lookups, 2 requests; entry compressed from {raw_size} to {compressed} bytes")
+
+if __name__ == "__main__":
+    test_freshness_rules()
+    test_round_trip_and_connector()
+    print("\nAll Trendlyne cache tests passed")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the tabular Trendlyne export: long company x period x metric frame, vectorized
+growth and margins checked against hand-computed values, and a one-pass sector
+aggregate
+"""
+
+import sys
+import os
+import importlib.util
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from connectors.trendlyne_connector import TrendlyneConnector
+from connectors.trendlyne_frames import FRAME_COLUMNS, add_growth, add_margins, financials_frame, to_arrow
+
+QUARTERS = ["Jun 2024", "Sep 2024", "Dec 2024", "Mar 2025", "Jun 2025", "Sep 2025"]
+
+def _payload(base):
+    # Newest first, as Trendlyne lists them; mixed cell shapes
+    quarterly = {
+        label: {
+            "Revenue": {"value": base * (1 + 0.05 * i)},
+            "Net Profit": f"{base * (0.2 + 0.01 * i):,.2f}",
+            "EPS": None,
+            "results_pdf": "https://example.com/r.pdf",
+        }
+        for i, label in reversed(list(enumerate(QUARTERS)))
+    }
+    annual = {f"Mar {year}": {"Revenue": base * 4 * (1.1 ** n), "Net Profit": base * 0.8 * (1.1 ** n), "Annual_Reports": {}} for n, year in enumerate([2023, 2024, 2025])}
+    return {"body": {"quarterlyDataDump": {"consolidated": quarterly, "standalone": quarterly}, "annualDataDump": {"consolidated": annual}}}
+
+FUNDAMENTALS = {1372: _payload(60000.0), 630: _payload(40000.0), 999: None}
+
+def test_long_frame_and_derived_metrics():
+    """Numeric cells become typed rows; growth and margins match hand-computed values"""
+    print("=== Testing Financials Frame ===")
+    df = financials_frame(FUNDAMENTALS)
+    assert list(df.columns) == FRAME_COLUMNS
+    assert df["value"].dtype == np.float64 and df["stock_id"].dtype == np.int64
+    assert set(df["metric"].astype(str)) == {"Revenue", "Net Profit"}
+    assert len(df) == 2 * (2 * 6 * 2 + 3 * 2)
+
+    df = add_margins(add_growth(df))
+    tcs = df[(df["stock_id"] == 1372) & (df["statement"] == "consolidated") & (df["periodicity"] == "quarterly")]
+    revenue = tcs[tcs["metric"] == "Revenue"].set_index("period")
+    assert list(revenue.index) == QUARTERS
+    assert np.isnan(revenue.loc["Jun 2024", "qoq_growth"])
+    assert abs(revenue.loc["Sep 2024", "qoq_growth"] - (63000 / 60000 - 1) * 100) < 1e-9
+    assert abs(revenue.loc["Jun 2025", "yoy_growth"] - (72000 / 60000 - 1) * 100) < 1e-9
+    assert np.isnan(revenue.loc["Mar 2025", "yoy_growth"]) and revenue["margin"].isna().all()
+
+    profit = tcs[tcs["metric"] == "Net Profit"].set_index("period")
+    assert abs(profit.loc["Dec 2024", "margin"] - 13200 / 66000 * 100) < 1e-9
+
+    annual = df[(df["stock_id"] == 630) & (df["periodicity"] == "annual") & (df["metric"] == "Revenue")].set_index("period")
+    assert abs(annual.loc["Mar 2025", "yoy_growth"] - 10.0) < 1e-9 and annual["qoq_growth"].isna().all()
+
+    # pyarrow is optional
+    if importlib.util.find_spec("pyarrow") is not None:
+        assert to_arrow(df).num_rows == len(df)
+    print(f"✓ {len(df)} rows from 2 companies with growth and margins")
+
+def test_growth_aligns_on_calendar_periods():
+    """A missing quarter leaves NaN rather than comparing with the wrong period"""
+    print("\n=== Testing Growth With a Missing Quarter ===")
+    closes = {"Jun 2023": 100.0, "Sep 2023": 110.0, "Dec 2023": 120.0, "Jun 2024": 140.0, "Sep 2024": 150.0}
+    payload = {"body": {"quarterlyDataDump": {"consolidated": {label: {"Revenue": value} for label, value in closes.items()}}}}
+    df = add_growth(financials_frame({1: payload}, ["quarterly"], ["consolidated"])).set_index("period")
+
+    assert abs(df.loc["Sep 2024", "yoy_growth"] - (150 / 110 - 1) * 100) < 1e-9
+    assert abs(df.loc["Jun 2024", "yoy_growth"] - 40.0) < 1e-9
+    assert np.isnan(df.loc["Jun 2024", "qoq_growth"])
+    assert abs(df.loc["Sep 2024", "qoq_growth"] - (150 / 140 - 1) * 100) < 1e-9
+    assert np.isnan(df.loc["Dec 2023", "yoy_growth"])
+    print("✓ Sep 2024 YoY is against Sep 2023; Jun 2024 has no QoQ")
+
+def test_margins_ignore_growth_and_ratio_lines():
+    """Revenue is chosen per company; % and growth lines are neither revenue nor profit"""
+    print("\n=== Testing Margins With Realistic Metric Names ===")
+    first = {"Revenue QoQ Growth %": 12.5, "Total Revenue": 1000.0, "Net Profit": 200.0, "Net Profit Growth %": 8.0,
+             "Operating Profit Margin %": 25.0, "Operating Profit": 250.0, "EPS": 12.0}
+    second = {"Net Sales": 500.0, "Net Profit": 50.0, "Profit Growth %": 3.0}
+    payloads = {
+        1: {"body": {"quarterlyDataDump": {"consolidated": {"Jun 2025": first}}}},
+        2: {"body": {"quarterlyDataDump": {"consolidated": {"Jun 2025": second}}}},
+    }
+    df = add_margins(financials_frame(payloads, ["quarterly"], ["consolidated"]))
+    margins = df.dropna(subset=["margin"]).set_index(["stock_id", "metric"])["margin"]
+
+    assert dict(margins) == {(1, "Net Profit"): 20.0, (1, "Operating Profit"): 25.0, (2, "Net Profit"): 10.0}
+    explicit = add_margins(financials_frame(payloads, ["quarterly"], ["consolidated"]), revenue_metric="Net Sales")
+    assert explicit.dropna(subset=["margin"])["stock_id"].tolist() == [2]
+    print("✓ Margins use Total Revenue and Net Sales, never the growth columns")
+
+def test_connector_frame_and_sector_aggregate():
+    """get_financials_frame feeds a sector-wide groupby in one pass"""
+    print("\n=== Testing Sector Aggregate ===")
+    connector = TrendlyneConnector.__new__(TrendlyneConnector)
+    connector.resolve_stock_ids = lambda stock_ids=None, company_names=None: list(stock_ids)
+    connector.fetch_fundamentals_many = lambda stock_ids, max_workers=8: {stock_id: FUNDAMENTALS[stock_id] for stock_id in stock_ids}
+
+    df = connector.get_financials_frame(stock_ids=[1372, 630, 999], periodicities=["quarterly"], statements=["consolidated"])
+    latest = df[df["period"] == "Sep 2025"]
+    sector = latest.groupby("metric", observed=True)["value"].sum()
+    assert sector["Revenue"] == (60000.0 + 40000.0) * 1.25
+    median_margin = latest[latest["metric"] == "Net Profit"]["margin"].median()
+    assert abs(median_margin - 25 / 125 * 100) < 1e-9
+    print("✓ Sector revenue and median margin from one groupby")
+
+if __name__ == "__main__":
+    test_long_frame_and_derived_metrics()
+    test_growth_aligns_on_calendar_periods()
+    test_margins_ignore_growth_and_ratio_lines()
+    test_connector_frame_and_sector_aggregate()
+    print("\nAll Trendlyne frame tests passed")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the Trendlyne token store: point reads, batched token writes, the one-time
+merge of tokens saved in trendlyne_db.json and on-demand JSON export, on a copy of
+utils/trendlyne.db
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.trendlyne_token_store import SEED_DB_PATH, TrendlyneTokenStore
+from utils.trendlyne_company_token_extractor import TrendlyneCompanyTokenExtractor
+
+def _copy_db(tmp):
+    db_path = os.path.join(tmp, "trendlyne.db")
+    shutil.copy(SEED_DB_PATH, db_path)
+    return db_path
+
+def test_point_reads_and_batched_writes():
+    """Reads hit one row; token writes are batched and leave the catalog version alone"""
+    print("=== Testing Token Store Reads and Writes ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TrendlyneTokenStore(_copy_db(tmp))
+        record = store.get(1372)
+        assert record["symbol"] == "TCS" and "trendlyne_stock_id" not in record
+        assert store.get("does-not-exist") is None
+        version = store.catalog_version()
+
+        assert store.update_tokens({1372: "AAAA======", "630": "BBBB======", "missing": "CCCC======"}) == 2
+        assert store.get_token(1372) == "AAAA======" and store.get("630")["token_status"] == "working"
+        assert store.catalog_version() == version
+
+        store._conn.execute("UPDATE companies SET company_name = 'Renamed' WHERE trendlyne_stock_id = '630'")
+        assert store.catalog_version() == version + 1
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            store.get_token(1372)
+        per_read = (time.perf_counter() - start) / 1000
+        # Point reads are an index lookup, not a table scan
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM companies WHERE trendlyne_stock_id = ? ORDER BY id DESC LIMIT 1", ("1372",)
+        ).fetchall()
+        assert any("idx_companies_trendlyne_id" in row[-1] for row in plan), plan
+        store.close()
+    print(f"✓ Point read takes {per_read * 1e6:.0f}us; 2 of 3 tokens written in one transaction")
+
+def test_json_merge_and_export():
+    """Tokens only in the JSON are merged once; export reproduces the JSON on demand"""
+    print("\n=== Testing JSON Merge and Export ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "trendlyne_db.json")
+        store = TrendlyneTokenStore(_copy_db(tmp))
+        companies = store.companies()
+        saved = {stock_id: dict(record) for stock_id, record in companies.items()}
+        saved["1372"]["trendlyne_auth_token"] = "FROMJSON======"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(saved, f, indent=2, ensure_ascii=False)
+
+        assert store.import_json_tokens(json_path) == 1
+        assert store.get_token(1372) == "FROMJSON======"
+        assert store.import_json_tokens(json_path) == 0
+
+        extractor = TrendlyneCompanyTokenExtractor(store=store)
+        mtime = os.stat(json_path).st_mtime_ns
+        assert extractor._update_company_token(630, "NEWTOKEN======")
+        assert os.stat(json_path).st_mtime_ns == mtime
+
+        extractor.export_json(json_path)
+        with open(json_path, encoding="utf-8") as f:
+            exported = json.load(f)
+        assert list(exported) == list(companies) and exported["630"]["trendlyne_auth_token"] == "NEWTOKEN======"
+        assert exported["1577"] == {**companies["1577"]}
+        assert store.import_json_tokens(json_path) == 0
+        store.close()
+    print(f"✓ JSON merged once, untouched by token writes, exported with {len(exported)} companies")
+
+def test_store_works_on_a_seeded_copy():
+    """The store copies the seed database on first use and never writes to the seed"""
+    print("\n=== Testing Seeded Working Copy ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_path = _copy_db(tmp)
+        with open(seed_path, "rb") as f:
+            seed_bytes = f.read()
+        db_path = os.path.join(tmp, "cache", "trendlyne.db")
+
+        store = TrendlyneTokenStore(db_path, seed_path=seed_path)
+        assert store.update_tokens({1372: "SEEDED======"}) == 1
+        store.close()
+
+        # Reopening keeps the working copy instead of seeding again
+        reopened = TrendlyneTokenStore(db_path, seed_path=seed_path)
+        assert reopened.get_token(1372) == "SEEDED======"
+        reopened.close()
+
+        with open(seed_path, "rb") as f:
+            assert f.read() == seed_bytes
+        assert sorted(os.listdir(tmp)) == ["cache", "trendlyne.db"]
+    print("✓ Token writes went to the working copy; the seed file is byte-for-byte unchanged")
+
+if __name__ == "__main__":
+    test_point_reads_and_batched_writes()
+    test_json_merge_and_export()
+    test_store_works_on_a_seeded_copy()
+    print("\nAll token store tests passed")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the Trendlyne payload projections: same sections as the deepcopy-based
+implementation, nested values shared with the payload, and sections built only
+when read
+"""
+
+import sys
+import os
+import copy
+import json
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from connectors.trendlyne_connector import TrendlyneConnector
+from connectors.trendlyne_views import FundamentalsView, SECTIONS
+
+def _payload(periods=40):
+    quarter = lambda i: {
+        "revenue": {"value": 1000.0 + i, "history": list(range(50))},
+        "net_profit": {"value": 100.0 + i},
+        "earnings_transcripts": {"values": [{"url": f"https://example.com/t{i}.pdf"}]},
+        "results_pdf": "x" * 2000, "ai_summary": "y" * 2000, "result_notes": ["n"] * 50,
+    }
+    year = lambda i: {"revenue": {"value": 4000.0 + i}, "result_notes": ["n"] * 50, "Annual_Reports": {"document_url": f"https://example.com/ar{i}.pdf"}}
+    peers = [{"Stock": {"name": f"Peer {i}", "order_by": f"p{i}", "leader_flag": i == 0}, "Stock Compare": {}, "PE": 20 + i} for i in range(15)]
+    return {"body": {
+        "quarterlyDataDump": {kind: {f"Q{i}": quarter(i) for i in range(periods)} for kind in ("consolidated", "standalone")},
+        "annualDataDump": {kind: {f"FY{i}": year(i) for i in range(periods // 4)} for kind in ("consolidated", "standalone")},
+        "pr": {"table_data": peers},
+    }}
+
+def _reference_quarterly(data, kind):
+    """The previous implementation: deep-copy each row, then pop the bulky keys"""
+    result = {}
+    for period, row in data["body"]["quarterlyDataDump"][kind].items():
+        row_copy = copy.deepcopy(row)
+        for key in ("earnings_transcripts", "results_pdf", "ai_summary", "result_notes"):
+            row_copy.pop(key, None)
+        result[period] = row_copy
+    return result
+
+def _reference_peers(data):
+    result = {}
+    for company in data["body"]["pr"]["table_data"]:
+        company_data = copy.deepcopy(company)
+        company_data["leader_flag"] = company["Stock"].get("leader_flag")
+        company_data.pop("Stock")
+        company_data.pop("Stock Compare")
+        result[company["Stock"]["order_by"]] = company_data
+    return result
+
+def test_projection_matches_and_shares():
+    """get_info returns the same dicts as before without copying nested values"""
+    print("=== Testing Payload Projection ===")
+    data = _payload()
+    connector = TrendlyneConnector.__new__(TrendlyneConnector)
+    connector._get_company_fundamentals = lambda stock_id=None, company_name=None: data
+
+    info = connector.get_info(stock_id=1, args=list(SECTIONS))
+    assert info["quarterly_financials_consolidated"] == _reference_quarterly(data, "consolidated")
+    assert info["peer_companies"] == _reference_peers(data)
+    assert info["annual_financials_standalone"]["FY2"] == {"revenue": {"value": 4002.0}}
+    assert info["earnings_transcripts"]["Q3"] == "https://example.com/t3.pdf"
+    assert info["annual_reports"]["FY1"] == "https://example.com/ar1.pdf"
+    assert info["quarterly_financials_standalone"]["Q0"]["revenue"] is data["body"]["quarterlyDataDump"]["standalone"]["Q0"]["revenue"]
+    json.dumps(info)
+
+    start = time.perf_counter()
+    for _ in range(20):
+        _reference_quarterly(data, "consolidated")
+    deepcopy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(20):
+        connector._get_quarterly_financials(data, type="consolidated")
+    projection_time = time.perf_counter() - start
+
+    # No deepcopy: every kept value is the payload's own object and the payload keeps its dropped keys
+    source = data["body"]["quarterlyDataDump"]["consolidated"]
+    projected = connector._get_quarterly_financials(data, type="consolidated")
+    assert all(projected[period][key] is source[period][key] for period in projected for key in projected[period])
+    assert all("earnings_transcripts" in row for row in source.values())
+    print(f"✓ Same sections, {deepcopy_time / projection_time:.0f}x faster than deepcopy")
+
+def test_view_builds_sections_lazily():
+    """Only read sections are built; unrequested ones are None"""
+    print("\n=== Testing Lazy Sections ===")
+    view = FundamentalsView(_payload(), ["quarterly_financials_standalone", "peer_companies"])
+    assert list(view) == list(SECTIONS) and view["annual_reports"] is None
+    assert view._sections == {}
+
+    first = view["quarterly_financials_standalone"]
+    assert view["quarterly_financials_standalone"] is first
+    assert set(view._sections) == {"quarterly_financials_standalone"}
+    assert view.to_dict()["peer_companies"]["p0"]["leader_flag"] is True
+    try:
+        view["unknown"]
+        raise AssertionError("unknown section should raise KeyError")
+    except KeyError:
+        pass
+    print("✓ Sections built on first read and reused")
+
+if __name__ == "__main__":
+    test_projection_matches_and_shares()
+    test_view_builds_sections_lazily()
+    print("\nAll Trendlyne projection tests passed")
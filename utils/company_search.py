@@ -0,0 +1,265 @@
+"""
+Prebuilt company search index for TrendlyneCompanyTokenExtractor.get_company_id.
+
+Company names, Trendlyne URL slugs, symbols and a few common aliases are
+normalized into one exact-match table. Other queries are pruned with a trigram
+inverted index before the SequenceMatcher scoring that get_company_id has always
+used. The index is saved as JSON next to the source and rebuilt only when the
+source's signature changes: the file's size and mtime, or a version supplied by
+the caller.
+"""
+
+import re
+import json
+import logging
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Minimum similarity for a fuzzy match (same threshold as the original linear scan)
+MIN_MATCH_SCORE = 0.6
+# Candidates kept by shared trigram count, and how many of those get a SequenceMatcher score
+MAX_CANDIDATES = 30
+MAX_SCORED = 8
+
+CORPORATE_SUFFIXES = {"ltd", "limited", "pvt", "private", "co", "corp", "corporation", "inc", "plc"}
+
+# Everyday names that neither the listed name nor the slug spell out
+COMPANY_ALIASES = {
+    "tata consultancy services": "TCS",
+    "tata consultancy": "TCS",
+    "infosys": "INFY",
+    "hcl technologies": "HCLTECH",
+    "hcl": "HCLTECH",
+    "l and t": "LT",
+    "larsen and toubro": "LT",
+    "lti mindtree": "LTIM",
+    "ltimindtree": "LTIM",
+    "tech mahindra": "TECHM",
+    "m and m": "M&M",
+    "ril": "RELIANCE",
+    "kotak bank": "KOTAKBANK",
+    "hul": "HINDUNILVR",
+    "sbi": "SBIN",
+}
+
+# Abbreviations used in the listed names, expanded on both sides of a comparison
+ABBREVIATIONS = {
+    "finl": "financial",
+    "fin": "financial",
+    "serv": "services",
+    "svcs": "services",
+    "indl": "industrial",
+    "inds": "industries",
+    "tech": "technologies",
+    "techno": "technologies",
+    "intl": "international",
+    "engg": "engineering",
+    "mfg": "manufacturing",
+}
+
+# Words too common in listed names to tell two companies apart
+GENERIC_TOKENS = {"india", "industries", "industrial", "technologies", "services", "software", "financial", "and", "the", "of", "global", "international"}
+
+CompanyMatch = Tuple[str, int]
+
+
+def clean_company_name(name: str) -> str:
+    """Drop the market-cap/P-E figures glued to the end of names in the Trendlyne dump"""
+    return re.sub(r"(?<=[A-Za-z)\].])[\d,.\-]+$", "", name.strip()).strip()
+
+
+def normalize_company_name(name: str) -> str:
+    """Lowercase, '(I)' -> 'india', '&' -> 'and', expanded abbreviations, no punctuation or corporate suffixes"""
+    name = clean_company_name(name).lower().replace("(i)", " india ").replace("&", " and ")
+    tokens = re.sub(r"[^a-z0-9]+", " ", name).split()
+    return " ".join(ABBREVIATIONS.get(token, token) for token in tokens if token not in CORPORATE_SUFFIXES)
+
+
+def _distinctive(key: str) -> str:
+    return " ".join(token for token in key.split() if token not in GENERIC_TOKENS)
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _url_parts(equity_url: Optional[str]) -> Tuple[str, str]:
+    """'https://trendlyne.com/equity/1372/TCS/tata-consultancy-services-ltd/' -> ('TCS', 'tata-consultancy-services-ltd')"""
+    parts = (equity_url or "").rstrip("/").split("/")
+    if len(parts) < 3 or "equity" not in parts:
+        return "", ""
+    return parts[-2], parts[-1]
+
+
+class CompanySearchIndex:
+    def __init__(self, stock_ids: List[int], names: List[str], keys: List[Tuple[str, int]], exact: Dict[str, int], trigrams: Dict[str, List[int]]):
+        self.stock_ids = stock_ids  # position -> Trendlyne stock id
+        self.names = names  # position -> display name
+        self.keys = keys  # (normalized name or slug, position); a company can have several
+        self.exact = exact  # normalized name/symbol/alias/slug -> position
+        self.trigrams = trigrams  # trigram -> indexes into keys
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "CompanySearchIndex":
+        return cls(data["stock_ids"], data["names"], [tuple(key) for key in data["keys"]], data["exact"], data["trigrams"])
+
+    def to_json(self) -> Dict:
+        return {"stock_ids": self.stock_ids, "names": self.names, "keys": self.keys, "exact": self.exact, "trigrams": self.trigrams}
+
+    @classmethod
+    def build(cls, companies: Dict[str, dict]) -> "CompanySearchIndex":
+        """companies: {stock_id: record} as stored in trendlyne_db.json"""
+        stock_ids, names, keys = [], [], []
+        name_keys: Dict[str, int] = {}
+        symbols: Dict[str, int] = {}
+        slugs: Dict[str, int] = {}
+        # NSE listings first so a name listed on both exchanges resolves to NSE
+        ordered = sorted(companies.items(), key=lambda item: item[1].get('exchange') != 'NSE')
+        for stock_id, record in ordered:
+            if not record.get('company_name'):
+                continue
+            position = len(stock_ids)
+            url_symbol, slug = _url_parts(record.get('trendlyne_equity_url'))
+            # The stock id comes from the Trendlyne URL; some scraped names and symbols belong to a
+            # different listing, so those records are only known by the URL's symbol and slug
+            consistent = not url_symbol or url_symbol == record.get('symbol')
+            slug_key = normalize_company_name(slug.replace("-", " "))
+            name_key = normalize_company_name(record['company_name']) if consistent else ""
+
+            stock_ids.append(int(stock_id))
+            names.append(clean_company_name(record['company_name']) if consistent or not slug else slug.replace("-", " ").title())
+            for key in dict.fromkeys((name_key, slug_key)):
+                if key:
+                    keys.append((key, position))
+            if name_key:
+                name_keys.setdefault(name_key, position)
+            if slug_key:
+                slugs.setdefault(slug_key, position)
+            symbol = url_symbol or record.get('symbol')
+            if symbol:
+                symbols.setdefault(symbol.lower(), position)
+
+        # Listed names win over symbols, symbols over URL slugs
+        exact = {**slugs, **symbols, **name_keys}
+        for alias, symbol in COMPANY_ALIASES.items():
+            if symbol.lower() in symbols:
+                exact[alias] = symbols[symbol.lower()]
+
+        trigrams: Dict[str, List[int]] = {}
+        for key_id, (key, _) in enumerate(keys):
+            for trigram in _trigrams(key):
+                trigrams.setdefault(trigram, []).append(key_id)
+        return cls(stock_ids, names, keys, exact, trigrams)
+
+    def _candidates(self, query: str) -> List[int]:
+        """Keys most similar to the query by trigram overlap, best first"""
+        query_trigrams = _trigrams(query)
+        # Trigrams shared by many companies ("ind", "fin") barely narrow the search
+        common_limit = max(MAX_CANDIDATES, len(self.keys) // 50)
+        selective = [t for t in query_trigrams if len(self.trigrams.get(t, ())) <= common_limit] or list(query_trigrams)
+
+        shared = Counter()
+        for trigram in selective:
+            shared.update(self.trigrams.get(trigram, ()))
+
+        def dice(key_id):
+            key_trigrams = _trigrams(self.keys[key_id][0])
+            return 2 * len(query_trigrams & key_trigrams) / (len(query_trigrams) + len(key_trigrams))
+
+        candidates = [key_id for key_id, _ in shared.most_common(MAX_CANDIDATES)]
+        return sorted(candidates, key=dice, reverse=True)[:MAX_SCORED]
+
+    def search(self, company_name: str, limit: int = 5) -> List[Tuple[str, int, float]]:
+        """(name, stock id, score) best first; exact name/symbol/alias hits score 1.0"""
+        query = normalize_company_name(company_name or "")
+        if not query:
+            return []
+
+        # Symbols such as "M&M" or "BAJAJ-AUTO" are stored as typed, not normalized
+        position = self.exact.get(query, self.exact.get(company_name.strip().lower()))
+        if position is not None:
+            return [(self.names[position], self.stock_ids[position], 1.0)]
+
+        # Compare the distinctive words so "Wipro Technologies" doesn't match "Impex Ferro Technologies"
+        distinctive_query = _distinctive(query)
+        matcher = SequenceMatcher(None)
+        matcher.set_seq2(distinctive_query or query)
+        best: Dict[int, float] = {}
+        for key_id in self._candidates(query):
+            key, position = self.keys[key_id]
+            distinctive_key = _distinctive(key)
+            matcher.set_seq1(distinctive_key if distinctive_query and distinctive_key else key)
+            ratio = matcher.ratio()
+            if query in key or key in query:
+                ratio = max(ratio, 0.8)
+            best[position] = max(best.get(position, 0.0), ratio)
+
+        ranked = sorted(best.items(), key=lambda item: -item[1])[:limit]
+        return [(self.names[position], self.stock_ids[position], round(score, 4)) for position, score in ranked]
+
+    def best_match(self, company_name: str, min_score: float = MIN_MATCH_SCORE) -> Optional[CompanyMatch]:
+        """(name, stock id) of the best match above min_score"""
+        matches = self.search(company_name, limit=1)
+        if matches and matches[0][2] >= min_score:
+            return matches[0][0], matches[0][1]
+        return None
+
+
+def _signature(source_path: Path) -> str:
+    stat = source_path.stat()
+    return f"{INDEX_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def index_path_for(source_path) -> Path:
+    source_path = Path(source_path)
+    return source_path.with_name(source_path.stem + ".index.json")
+
+
+_indexes: Dict[str, Tuple[str, CompanySearchIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_company_index(source_path, load_companies: Callable[[], Dict[str, dict]], version=None) -> CompanySearchIndex:
+    """
+    Process-wide search index for the companies in source_path. load_companies is
+    only called when neither memory nor the saved index next to the source is current.
+    Pass version when the source also changes for reasons that don't affect the index.
+    """
+    source_path = Path(source_path)
+    if not source_path.exists():
+        return CompanySearchIndex.build(load_companies())
+
+    signature = f"{INDEX_VERSION}:version:{version}" if version is not None else _signature(source_path)
+    with _indexes_lock:
+        cached = _indexes.get(str(source_path))
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        index_path = index_path_for(source_path)
+        index = None
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("signature") == signature:
+                index = CompanySearchIndex.from_json(cached["index"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        if index is None:
+            index = CompanySearchIndex.build(load_companies())
+            try:
+                with open(index_path, 'w', encoding='utf-8') as f:
+                    json.dump({"signature": signature, "index": index.to_json()}, f)
+            except OSError as e:
+                logger.warning(f"Could not write company index {index_path}: {e}")
+
+        _indexes[str(source_path)] = (signature, index)
+        return index
@@ -1,51 +1,310 @@
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
+import threading
+import asyncio
+import queue
+import time
+import hashlib
+import pathlib
+import sqlite3
 import os
 import json
 
+DEFAULT_STORE_DIR = pathlib.Path(__file__).parent.parent / "cache" / "embeddings"
+
+class EmbeddingLRUCache:
+    """Thread-safe in-memory LRU of embeddings keyed by (text, task_type, model, dimensionality)"""
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(self._entries[key])
+            self.misses += 1
+            return None
+
+    def put(self, key, embedding):
+        with self._lock:
+            self._entries[key] = list(embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+# Shared by every GeminiEmbedding in the process so repeated queries never re-embed
+query_embedding_cache = EmbeddingLRUCache()
+
+class EmbeddingStore:
+    """
+    Persistent embedding cache: a memory-mapped float32 matrix (one row per embedding)
+    plus a SQLite index from SHA-256(model, task type, dimensionality, text) to row.
+    Row allocation happens inside a SQLite write transaction so several processes can
+    share one store.
+    """
+    def __init__(self, dimensions, store_dir=DEFAULT_STORE_DIR, min_capacity=1024):
+        self.dimensions = dimensions
+        self.min_capacity = min_capacity
+        store_dir = pathlib.Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        self.matrix_path = store_dir / f"embeddings_{dimensions}.f32"
+        self.matrix_path.touch(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(store_dir / f"embeddings_{dimensions}.sqlite3", check_same_thread=False, timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embedding_index (key TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+        self._matrix = None
+        self._capacity = 0
+        self._remap()
+
+    @staticmethod
+    def make_key(text, model, task_type, dimensions):
+        payload = "\0".join([model, task_type.upper(), str(dimensions), text])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _remap(self, required_rows=0):
+        """Map the matrix file, growing it first if it cannot hold required_rows"""
+        row_bytes = self.dimensions * 4
+        capacity = self.matrix_path.stat().st_size // row_bytes
+        if required_rows > capacity:
+            capacity = max(self.min_capacity, required_rows * 2)
+            with open(self.matrix_path, "r+b") as f:
+                f.truncate(capacity * row_bytes)
+        if capacity != self._capacity or self._matrix is None:
+            self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions)) if capacity else None
+            self._capacity = capacity
+
+    def get_many(self, keys):
+        """Return {key: embedding list} for the keys present in the store"""
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            for i in range(0, len(unique_keys), 500):
+                chunk = unique_keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, row FROM embedding_index WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                if rows and max(row for _, row in rows) >= self._capacity:
+                    # Another process grew the matrix since we mapped it
+                    self._remap()
+                for key, row in rows:
+                    found[key] = self._matrix[row].tolist()
+        return found
+
+    def put_many(self, items):
+        """Store (key, embedding) pairs; keys already present are left untouched"""
+        if not items:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                next_row = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM embedding_index").fetchone()[0]
+                new_items = []
+                for key, embedding in dict(items).items():
+                    if not self._conn.execute("SELECT 1 FROM embedding_index WHERE key = ?", (key,)).fetchone():
+                        new_items.append((key, embedding, next_row))
+                        next_row += 1
+                if new_items:
+                    self._remap(required_rows=next_row)
+                    for _, embedding, row in new_items:
+                        self._matrix[row] = np.asarray(embedding, dtype=np.float32)
+                    self._matrix.flush()
+                    # Index rows become visible only after their vectors are on disk
+                    self._conn.executemany(
+                        "INSERT INTO embedding_index (key, row) VALUES (?, ?)",
+                        [(key, row) for key, _, row in new_items]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embedding_index").fetchone()[0]
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embed requests into batchEmbedContents calls.
+    Requests arriving within `window` seconds of each other (up to max_batch_size) are
+    sent as one request per task type, with at most max_concurrent_batches requests in
+    flight. Each caller gets a Future for its own embedding.
+    """
+    def __init__(self, embed_batch_fn, window=0.02, max_batch_size=100, max_concurrent_batches=4):
+        self.embed_batch_fn = embed_batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix="embed-batch")
+        self.requests_sent = 0
+        self._stats_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, text, task_type):
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, task_type, future))
+        return future
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._collect, name="embed-coalescer", daemon=True)
+                self._worker.start()
+
+    def _collect(self):
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(pending) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            by_task_type = {}
+            for text, task_type, future in pending:
+                by_task_type.setdefault(task_type, []).append((text, future))
+            for task_type, items in by_task_type.items():
+                self.executor.submit(self._dispatch, task_type, items)
+
+    def _dispatch(self, task_type, items):
+        texts = list(dict.fromkeys(text for text, _ in items))
+        with self._stats_lock:
+            self.requests_sent += 1
+        try:
+            result = list(self.embed_batch_fn(texts, task_type))
+            if len(result) != len(texts):
+                raise ValueError(f"Embedding API returned {len(result)} embeddings for {len(texts)} texts")
+            embeddings = dict(zip(texts, result))
+            for text, future in items:
+                future.set_result(embeddings[text])
+        except Exception as e:
+            # Every caller blocks on its future, so none may be left unresolved
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+
 class GeminiEmbedding:
-    def __init__(self, api_key, embedding_dimensions=768, embedding_model="gemini-embedding-001"):
+    def __init__(self, api_key, embedding_dimensions=768, embedding_model="gemini-embedding-001", use_disk_cache=True, store_dir=DEFAULT_STORE_DIR, coalesce=True, max_concurrent_batches=4, rate_limiter=None):
         self.api_key = api_key
+        # Optional shared limiter (anything with acquire()) applied to every API request
+        self.rate_limiter = rate_limiter
         self.client = genai.Client(api_key=api_key)
         self.embedding_dimensions = embedding_dimensions
         self.embedding_model = embedding_model
+        # Persistent store so re-ingestion and repeated queries cost no API calls
+        self.store = EmbeddingStore(embedding_dimensions, store_dir) if use_disk_cache else None
+        # Concurrent single-text calls (e.g. several agents' RAG lookups) share API requests
+        self.batcher = EmbeddingBatcher(self._embed_batch, max_concurrent_batches=max_concurrent_batches) if coalesce else None
+
+    def _cache_key(self, text, task_type):
+        return (text, task_type.upper(), self.embedding_model, self.embedding_dimensions)
+
+    def _store_key(self, text, task_type):
+        return EmbeddingStore.make_key(text, self.embedding_model, task_type, self.embedding_dimensions)
+
+    def _embed_batch(self, batch, task_type):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        response = self.client.models.embed_content(
+            model=self.embedding_model,
+            contents=batch,
+            config=types.EmbedContentConfig(
+                task_type=task_type,
+                output_dimensionality=self.embedding_dimensions
+            )
+        )
+        return [emb.values for emb in response.embeddings]
+
+    def embed_async(self, text, task_type="retrieval_document"):
+        """Embed a single string, returning a Future; cache hits come back already resolved"""
+        cache_key = self._cache_key(text, task_type)
+        cached = query_embedding_cache.get(cache_key)
+        if cached is None and self.store is not None:
+            store_key = self._store_key(text, task_type)
+            cached = self.store.get_many([store_key]).get(store_key)
+            if cached is not None:
+                query_embedding_cache.put(cache_key, cached)
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        if self.batcher is not None:
+            api_future = self.batcher.submit(text, task_type)
+        else:
+            api_future = Future()
+            try:
+                api_future.set_result(self._embed_batch(text, task_type)[0])
+            except Exception as e:
+                api_future.set_exception(e)
+
+        def _remember(done):
+            if done.exception() is None:
+                if self.store is not None:
+                    self.store.put_many([(self._store_key(text, task_type), done.result())])
+                query_embedding_cache.put(cache_key, done.result())
+        api_future.add_done_callback(_remember)
+        return api_future
+
+    async def aembed(self, text, task_type="retrieval_document"):
+        """Awaitable single-string embedding for event-loop callers"""
+        if self.batcher is None:
+            # Without a batcher embed_async calls the API inline, so keep it off the event loop
+            return await asyncio.to_thread(self.embed, text, task_type)
+        return await asyncio.wrap_future(self.embed_async(text, task_type))
 
     def embed(self, text, task_type="retrieval_document"):
         if isinstance(text, str):
-            # Single text input
-            response = self.client.models.embed_content(
-                model=self.embedding_model,
-                contents=text,
-                config=types.EmbedContentConfig(
-                    task_type=task_type,
-                    output_dimensionality=768
-                )
-            )
-            return response.embeddings[0].values
+            # Single text input, served from cache or coalesced with concurrent callers
+            return self.embed_async(text, task_type).result()
         elif isinstance(text, list):
-            # Batch processing for multiple texts with 100-item limit
-            all_embeddings = []
+            # Serve stored embeddings locally and only send misses to the API
+            store_keys = [self._store_key(t, task_type) for t in text] if self.store is not None else []
+            stored = self.store.get_many(store_keys) if self.store is not None else {}
+            if self.store is not None:
+                missing = list(dict.fromkeys(t for t, key in zip(text, store_keys) if key not in stored))
+            else:
+                missing = list(text)
+            if stored:
+                print(f"Embedding store hits: {len(text) - len(missing)}/{len(text)}")
+
+            # Batch processing for the misses with 100-item limit, pipelined over the
+            # batcher's bounded pool when coalescing is enabled
+            fresh = {}
             batch_size = 100
-            
-            for i in range(0, len(text), batch_size):
-                batch = text[i:i + batch_size]
-                print(f"Processing batch {i//batch_size + 1}/{(len(text) + batch_size - 1)//batch_size} ({len(batch)} items)")
-                
-                response = self.client.models.embed_content(
-                    model=self.embedding_model,
-                    contents=batch,
-                    config=types.EmbedContentConfig(
-                        task_type=task_type,
-                        output_dimensionality=768
-                    )
-                )
-                
-                # Extract embeddings from batch response
-                batch_embeddings = [emb.values for emb in response.embeddings]
-                all_embeddings.extend(batch_embeddings)
-            
-            return all_embeddings
+            batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+            if self.batcher is not None:
+                batch_futures = [self.batcher.executor.submit(self._embed_batch, batch, task_type) for batch in batches]
+            else:
+                batch_futures = None
+            for n, batch in enumerate(batches):
+                print(f"Processing batch {n + 1}/{len(batches)} ({len(batch)} items)")
+                batch_embeddings = batch_futures[n].result() if batch_futures else self._embed_batch(batch, task_type)
+                fresh.update(zip(batch, batch_embeddings))
+                if self.store is not None:
+                    self.store.put_many([(self._store_key(t, task_type), emb) for t, emb in zip(batch, batch_embeddings)])
+
+            if self.store is None:
+                return [fresh[t] for t in text]
+            return [stored[key] if key in stored else fresh[t] for t, key in zip(text, store_keys)]
         else:
             raise ValueError("Input must be a string or list of strings")
 
@@ -58,4 +317,3 @@ if __name__ == "__main__":
     # chunks_embeddings = gemini_embedding.embed(chunks)
     chunks_embeddings = gemini_embedding.embed("Hello, world!")
     print(chunks_embeddings)
-    
\ No newline at end of file
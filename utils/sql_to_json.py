@@ -1,62 +1,31 @@
 import sqlite3
 import json
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.trendlyne_token_store import DEFAULT_DB_PATH, TrendlyneTokenStore
 
 def convert_sql_to_json():
     """
     Convert SQLite database to JSON format with company ID as keys
     and all other fields as dictionary values
     """
-    # Path to the database
-    db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trendlyne.db")
+    # Working copy of the database (seeded from utils/trendlyne.db on first use)
+    db_path = DEFAULT_DB_PATH
     
     # Path for output JSON file
     config_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
     output_path = os.path.join(config_dir, "trendlyne_db.json")
     
-    # Ensure config directory exists
-    os.makedirs(config_dir, exist_ok=True)
-    
     try:
-        # Connect to the database
-        sql_conn = sqlite3.connect(db_path, timeout=20.0)
-        cursor = sql_conn.cursor()
-        
-        # Get table schema first
-        cursor.execute("PRAGMA table_info(companies)")
-        columns = cursor.fetchall()
-        column_names = [col[1] for col in columns]
-        print(f"Found columns: {column_names}")
-        
-        # Get all data from companies table
-        cursor.execute("SELECT * FROM companies")
-        rows = cursor.fetchall()
-        sql_conn.close()
-        
-        # Convert to JSON format
-        json_data = {}
-        
-        for row in rows:
-            # Create a dictionary for each row
-            row_dict = {}
-            company_id = None
-            
-            for i, value in enumerate(row):
-                column_name = column_names[i]
-                
-                # Use trendlyne_stock_id as the key
-                if column_name == 'trendlyne_stock_id':
-                    company_id = str(value) if value is not None else str(i)
-                else:
-                    row_dict[column_name] = value
-            
-            # Add to JSON data with company ID as key
-            if company_id:
-                json_data[company_id] = row_dict
-        
-        # Write to JSON file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
+        # The token store owns the export format so on-demand exports from the extractor match.
+        # Tokens only present in the current JSON are merged first so the export doesn't drop them.
+        store = TrendlyneTokenStore(db_path)
+        store.import_json_tokens(output_path)
+        json_data = store.companies()
+        store.export_json(output_path)
+        store.close()
         
         print(f"Successfully converted {len(json_data)} records to JSON")
         print(f"Output file: {output_path}")
@@ -1,13 +1,19 @@
-import json 
 import requests
 import re
 import os
-from difflib import SequenceMatcher 
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from connectors.http_transport import get_session, host_slot
+from utils.company_search import get_company_index
+from utils.trendlyne_token_store import DEFAULT_JSON_PATH, get_token_store
 
 class TrendlyneCompanyTokenExtractor:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, store=None):
+        # Shared keep-alive session; page headers are sent per request
+        self.session = get_session()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
@@ -15,34 +21,19 @@ class TrendlyneCompanyTokenExtractor:
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
-        })
+        }
         
-        self.json_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "trendlyne_db.json")
-        self.companies_data = self._load_json_data()
+        # Records and tokens live in utils/trendlyne.db; trendlyne_db.json is only written by export_json
+        self.store = store or get_token_store()
+        self.json_path = DEFAULT_JSON_PATH
 
-    def _load_json_data(self):
-        try:
-            with open(self.json_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            print(f"JSON file not found: {self.json_path}")
-            return {}
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON file: {e}")
-            return {}
-
-    def _save_json_data(self):
-        try:
-            with open(self.json_path, 'w', encoding='utf-8') as f:
-                json.dump(self.companies_data, f, indent=2, ensure_ascii=False)
-            print(f"Updated data saved to {self.json_path}")
-        except Exception as e:
-            print(f"Error saving JSON file: {e}")
+    def export_json(self, json_path=None):
+        return self.store.export_json(json_path or self.json_path)
 
     def _extract_token_from_equity_page(self, equity_url, stock_id):
         try:
             print("Extracting token from equity page: ", equity_url)
-            response = self.session.get(equity_url)
+            response = self.session.get(equity_url, headers=self.headers)
             if response.status_code != 200:
                 return None
 
@@ -98,78 +89,67 @@ class TrendlyneCompanyTokenExtractor:
             return False
     
     def get_company_token(self, stock_id, fetch_new=False):
-        stock_id_str = str(stock_id)
-        
+        record = self.store.get(stock_id)
+        if record is None:
+            return None
         if not fetch_new:
-            # Get cached token from JSON data
-            if stock_id_str in self.companies_data:
-                return self.companies_data[stock_id_str].get('trendlyne_auth_token')
-            else:
-                return None
-        else:
-            # Fetch new token
-            if stock_id_str in self.companies_data:
-                equity_url = self.companies_data[stock_id_str].get('trendlyne_equity_url')
-                if equity_url:
-                    token = self._extract_token_from_equity_page(equity_url, stock_id)
-                    print(f"Extracted token: {token}")
-                    if token:
-                        self._update_company_token(stock_id, token)
-                        return token
-                    else:
-                        return None
-                else:
-                    return None
-            else:
-                return None
+            return record.get('trendlyne_auth_token')
+
+        # Fetch new token
+        equity_url = record.get('trendlyne_equity_url')
+        if not equity_url:
+            return None
+        token = self._extract_token_from_equity_page(equity_url, stock_id)
+        print(f"Extracted token: {token}")
+        if token:
+            self._update_company_token(stock_id, token)
+            return token
+        return None
     
+    def refresh_tokens(self, stock_ids, max_workers=4):
+        """
+        Re-scrape the tokens of several stocks in parallel and save them in one batch.
+        Returns {stock_id: token} for the stocks whose equity page yielded a token.
+        """
+        equity_urls = {}
+        for stock_id in dict.fromkeys(int(stock_id) for stock_id in stock_ids):
+            equity_url = self.get_company_equity_url(stock_id)
+            if equity_url:
+                equity_urls[stock_id] = equity_url
+        if not equity_urls:
+            return {}
+
+        def extract(item):
+            stock_id, equity_url = item
+            with host_slot(equity_url):
+                return stock_id, self._extract_token_from_equity_page(equity_url, stock_id)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(equity_urls))), thread_name_prefix="trendlyne-token") as executor:
+            tokens = {stock_id: token for stock_id, token in executor.map(extract, equity_urls.items()) if token}
+        self.store.update_tokens(tokens)
+        return tokens
+
     def get_company_equity_url(self, stock_id):
-        stock_id_str = str(stock_id)
-        if stock_id_str in self.companies_data:
-            return self.companies_data[stock_id_str].get('trendlyne_equity_url')
-        else:
-            return None
+        record = self.store.get(stock_id)
+        return record.get('trendlyne_equity_url') if record else None
     
     def _get_company_name_id_from_db(self):
         result = []
-        for stock_id, company_data in self.companies_data.items():
+        for stock_id, company_data in self.store.companies().items():
             company_name = company_data.get('company_name')
             if company_name:
                 result.append((company_name, int(stock_id)))
         return result
 
-    def _find_best_match(self, company_name_id_list, company_name):
-        if not company_name_id_list or not company_name:
+    def _find_best_match(self, company_name):
+        if not company_name:
             return None
-            
-        best_match = None
-        best_ratio = 0.0
-        min_threshold = 0.6  
-        normalized_input = company_name.lower().strip()
-        
-        for db_company_name, company_id in company_name_id_list:
-            if not db_company_name:
-                continue
-                
-            normalized_db_name = db_company_name.lower().strip()
-            ratio = SequenceMatcher(None, normalized_input, normalized_db_name).ratio()
-            
-            if normalized_input in normalized_db_name or normalized_db_name in normalized_input:
-                ratio = max(ratio, 0.8)  
-            
-            if ratio > best_ratio and ratio >= min_threshold:
-                best_ratio = ratio
-                best_match = (db_company_name, company_id)
-        
-        return best_match
+        # Built once per process and saved as JSON next to the store database; token writes don't invalidate it
+        search_index = get_company_index(self.store.db_path, self.store.companies, version=self.store.catalog_version())
+        return search_index.best_match(company_name)
         
     def get_company_id(self, company_name):
-        company_name_id_list = self._get_company_name_id_from_db()
-        if not company_name_id_list:
-            print("No companies found in database")
-            return None
-        
-        best_match = self._find_best_match(company_name_id_list, company_name)
+        best_match = self._find_best_match(company_name)
         
         if best_match:
             matched_name, company_id = best_match
@@ -183,10 +163,7 @@ class TrendlyneCompanyTokenExtractor:
         if token is None:
             return False
         
-        stock_id_str = str(stock_id)
-        if stock_id_str in self.companies_data:
-            self.companies_data[stock_id_str]['trendlyne_auth_token'] = token
-            self._save_json_data()  
+        if self.store.update_tokens({stock_id: token}):
             return True
         else:
             print(f"Company ID {stock_id} not found in data")
@@ -1,7 +1,10 @@
-import requests
 import os
+import sys
 import json
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from connectors.http_transport import get_session
+
 URL = "https://trendlyne.com/"
 
 HEADERS = {
@@ -24,7 +27,7 @@ class TrendlyneCSRFExtractor:
     def extract_csrf_token(self, fetch_new=False):
         if fetch_new:
             print(f"Sending GET request to: {self.url} with custom headers...")
-            response = requests.get(self.url, headers=self.headers, timeout=10)
+            response = get_session().get(self.url, headers=self.headers, timeout=10)
             response.raise_for_status()
             cookies = response.cookies
             csrf_token_value = cookies.get('csrftoken')
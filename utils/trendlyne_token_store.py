@@ -0,0 +1,195 @@
+"""
+Keyed store for Trendlyne company records and auth tokens.
+
+Wraps the companies table of the Trendlyne database with WAL journaling, point
+reads by Trendlyne stock id and batched token writes. The tracked utils/trendlyne.db
+is only a seed: the store works on a copy under cache/trendlyne/, made on first use,
+so token writes and the store's own tables never touch the committed file.
+config/trendlyne_db.json is no longer rewritten on every token change: tokens
+already saved there are merged in once, and the JSON is only regenerated on demand
+by export_json.
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SEED_DB_PATH = Path(__file__).parent / "trendlyne.db"
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "cache" / "trendlyne" / "trendlyne.db"
+DEFAULT_JSON_PATH = Path(__file__).parent.parent / "config" / "trendlyne_db.json"
+
+# Columns that identify a company; changing any of them bumps catalog_version
+CATALOG_COLUMNS = ("company_name", "symbol", "exchange", "trendlyne_stock_id", "trendlyne_equity_url")
+
+
+class TrendlyneTokenStore:
+    def __init__(self, db_path=DEFAULT_DB_PATH, seed_path=SEED_DB_PATH):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists() and seed_path is not None:
+            self._seed(Path(seed_path), self.db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value)")
+        self._conn.execute("INSERT OR IGNORE INTO store_meta VALUES ('catalog_version', 0)")
+        # Token writes leave the version alone, so indexes built from the catalog stay valid
+        bump = "BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'catalog_version'; END"
+        self._conn.execute(f"CREATE TRIGGER IF NOT EXISTS companies_catalog_insert AFTER INSERT ON companies {bump}")
+        self._conn.execute(f"CREATE TRIGGER IF NOT EXISTS companies_catalog_delete AFTER DELETE ON companies {bump}")
+        self._conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS companies_catalog_update AFTER UPDATE OF {', '.join(CATALOG_COLUMNS)} ON companies {bump}"
+        )
+
+    @staticmethod
+    def _seed(seed_path: Path, db_path: Path):
+        """Copy the tracked database to db_path; the copy is renamed into place so a crash leaves no partial file"""
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+        shutil.copyfile(seed_path, tmp_path)
+        os.replace(tmp_path, db_path)
+        logger.info(f"Seeded Trendlyne store {db_path} from {seed_path}")
+
+    @staticmethod
+    def _record(row) -> dict:
+        """A companies row in the trendlyne_db.json shape: every column except the stock id"""
+        return {key: row[key] for key in row.keys() if key != 'trendlyne_stock_id'}
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO store_meta VALUES (?, ?)", (key, value))
+
+    def catalog_version(self) -> int:
+        """Changes whenever a company is added, removed or renamed, but not on token writes"""
+        with self._lock:
+            return int(self._get_meta('catalog_version') or 0)
+
+    def get(self, stock_id) -> Optional[dict]:
+        """The company record for a Trendlyne stock id (the latest row when the id is listed twice)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM companies WHERE trendlyne_stock_id = ? ORDER BY id DESC LIMIT 1", (str(stock_id),)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    def get_token(self, stock_id) -> Optional[str]:
+        record = self.get(stock_id)
+        return record.get('trendlyne_auth_token') if record else None
+
+    def companies(self) -> Dict[str, dict]:
+        """{stock_id: record} for every company with a Trendlyne id, as in trendlyne_db.json"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM companies WHERE trendlyne_stock_id IS NOT NULL ORDER BY id"
+            ).fetchall()
+        return {str(row['trendlyne_stock_id']): self._record(row) for row in rows}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT trendlyne_stock_id) FROM companies").fetchone()[0]
+
+    def update_tokens(self, tokens: Dict, status: str = 'working') -> int:
+        """
+        Write {stock_id: token} in one transaction; returns how many stock ids were found.
+        Every row listed under a stock id gets the token.
+        """
+        tokens = {str(stock_id): token for stock_id, token in tokens.items() if token}
+        if not tokens:
+            return 0
+        now = str(datetime.now())
+        updated = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for stock_id, token in tokens.items():
+                    cursor = self._conn.execute(
+                        "UPDATE companies SET trendlyne_auth_token = ?, token_status = ?, token_discovered_date = ?, last_updated = ? "
+                        "WHERE trendlyne_stock_id = ?",
+                        (token, status, now, now, stock_id),
+                    )
+                    updated += cursor.rowcount > 0
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return updated
+
+    def import_json_tokens(self, json_path=DEFAULT_JSON_PATH) -> int:
+        """
+        Merge tokens saved to trendlyne_db.json by the old extractor. Runs once per
+        version of the file; returns the number of tokens that differed from the store.
+        """
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return 0
+        stat = json_path.stat()
+        signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        with self._lock:
+            if self._get_meta('json_tokens_imported') == signature:
+                return 0
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read {json_path}: {e}")
+            return 0
+
+        current = {stock_id: record.get('trendlyne_auth_token') for stock_id, record in self.companies().items()}
+        changed = {
+            stock_id: record['trendlyne_auth_token']
+            for stock_id, record in saved.items()
+            if stock_id in current and record.get('trendlyne_auth_token') and record['trendlyne_auth_token'] != current[stock_id]
+        }
+        merged = self.update_tokens(changed)
+        with self._lock:
+            self._set_meta('json_tokens_imported', signature)
+        if merged:
+            logger.info(f"Merged {merged} tokens from {json_path}")
+        return merged
+
+    def export_json(self, json_path=DEFAULT_JSON_PATH) -> Path:
+        """Write every company to json_path in the sql_to_json.py format"""
+        json_path = Path(json_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = json_path.with_name(json_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.companies(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, json_path)
+
+        # The export already holds every token in the store, so there is nothing to merge back
+        stat = json_path.stat()
+        with self._lock:
+            self._set_meta('json_tokens_imported', f"{stat.st_size}:{stat.st_mtime_ns}")
+        return json_path
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[str, TrendlyneTokenStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_token_store(db_path=DEFAULT_DB_PATH, json_path=DEFAULT_JSON_PATH) -> TrendlyneTokenStore:
+    """Process-wide store for db_path (seeded from utils/trendlyne.db); tokens saved in json_path are merged on first use"""
+    key = str(Path(db_path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = TrendlyneTokenStore(db_path)
+            store.import_json_tokens(json_path)
+            _stores[key] = store
+        return store